@@ -1,5 +1,6 @@
 __version__ = "0.0.6"
 
 from seda.app import Seda, schedule, task
+from seda.context import current_task
 
-__all__ = ("Seda", "task", "schedule")
+__all__ = ("Seda", "task", "schedule", "current_task")
@@ -0,0 +1,93 @@
+import collections
+import hashlib
+import re
+import typing as t
+from datetime import datetime, timedelta
+
+from seda import types
+from seda.expressions import CronExpression, as_utc, iter_fire_times
+from seda.tasks import Schedule
+
+_step_re = re.compile(r"^(\d+)/(\d+)$")
+
+
+def project_load(
+    schedules: t.Iterable[Schedule],
+    after: datetime,
+    until: datetime,
+    bucket: timedelta = timedelta(minutes=1),
+) -> t.Dict[datetime, t.List[Schedule]]:
+    after = as_utc(after)
+    load: t.Dict[datetime, t.List[Schedule]] = collections.defaultdict(list)
+
+    for fire_time, schedule in iter_fire_times(schedules, after, until):
+        load[after + (fire_time - after) // bucket * bucket].append(schedule)
+    return dict(load)
+
+
+def find_peaks(
+    load: t.Dict[datetime, t.List[Schedule]],
+    threshold: t.Optional[int] = None,
+) -> t.List[t.Tuple[datetime, int]]:
+    if not load:
+        return []
+    if threshold is None:
+        mean = sum(len(v) for v in load.values()) / len(load)
+        threshold = max(int(mean * 2), 2)
+
+    peaks = [(bucket, len(v)) for bucket, v in load.items() if len(v) >= threshold]
+    return sorted(peaks, key=lambda peak: (-peak[1], peak[0]))
+
+
+def get_offset(schedule: Schedule, max_minutes: int) -> int:
+    key = f"{schedule.path}:{schedule.expression}".encode()
+    return int(hashlib.sha1(key).hexdigest(), 16) % max_minutes
+
+
+def jitter(
+    schedule: Schedule, mode: types.JitterMode, max_minutes: int = 15
+) -> Schedule:
+    if mode == "off" or schedule.time_window is not None:
+        return schedule
+
+    if mode == "offset" and isinstance(schedule.parsed_expression, CronExpression):
+        minutes, rest = schedule.parsed_expression.value.split(None, 1)
+        offset = get_offset(schedule, max_minutes)
+        step = _step_re.match(minutes)
+
+        if minutes.isdigit() and int(minutes) + offset < 60:
+            minutes = str(int(minutes) + offset)
+        elif step is not None and int(step.group(1)) + offset < int(step.group(2)):
+            minutes = f"{int(step.group(1)) + offset}/{step.group(2)}"
+        else:
+            return jitter(schedule, "window", max_minutes)
+        return schedule.replace(expression=f"cron({minutes} {rest})")
+
+    if schedule.parsed_expression.kind == "at":
+        return schedule
+    return schedule.replace(
+        time_window=types.ScheduleTimeWindow(
+            Mode="FLEXIBLE",
+            MaximumWindowInMinutes=max_minutes,
+        ),
+    )
+
+
+def flatten_peaks(
+    schedules: t.Sequence[Schedule],
+    mode: types.JitterMode,
+    *,
+    max_minutes: int = 15,
+    after: datetime,
+    until: datetime,
+    bucket: timedelta = timedelta(minutes=1),
+    threshold: t.Optional[int] = None,
+) -> t.List[Schedule]:
+    load = project_load(schedules, after, until, bucket)
+    crowded = {
+        schedule for peak, _ in find_peaks(load, threshold) for schedule in load[peak]
+    }
+    return [
+        jitter(schedule, mode, max_minutes) if schedule in crowded else schedule
+        for schedule in schedules
+    ]
@@ -1,27 +1,53 @@
-import asyncio
+import atexit
 import functools
+import gc
+import importlib
 import json
 import logging
+import math
 import shlex
 import subprocess
 import threading
 import time
 import typing as t
-from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
 
-from seda import exceptions, policies, types
+import anyio
+from botocore.exceptions import BotoCoreError, ClientError, ReadTimeoutError
+
+from seda import analysis, exceptions, policies, types, workflows
+from seda.batching import DEBOUNCE_TTL, MAX_MESSAGE_BYTES, Batcher, Debouncer, pack
+from seda.breaker import BreakerPolicy
+from seda.cache import Cache, LRUCache, TaskCache
 from seda.client import DEFAULT_RETRY_DELAY, Client
+from seda.codecs import JSONCodec, default_codec
 from seda.config import (
     LAMBDA_FUNCTION_POLICY_NAME,
     SCHEDULE_GROUP_NAME,
     SCHEDULE_NAME,
     SCHEDULE_ROLE_NAME,
     SNS_TOPIC_NAME,
+    STORE_TABLE_NAME,
     Config,
+    Lane,
 )
 from seda.decorators import aws_retry
-from seda.run import run_task, sync_to_async
-from seda.tasks import Schedule, Task
+from seda.executors import EXECUTORS, Executor, ThreadExecutor
+from seda.idempotency import Idempotency
+from seda.limits import TokenBucket
+from seda.metrics import Metrics
+from seda.outbox import Outbox, is_transient, on_commit
+from seda.results import (
+    RESULT_LIFECYCLE_RULE_ID,
+    RESULT_PREFIX,
+    AsyncResult,
+    ResultBackend,
+)
+from seda.run import arun_task, get_task, run_task, sync_to_async
+from seda.stores import DynamoDBStore, MemoryStore, Store
+from seda.tasks import PRIORITIES, HedgePolicy, Schedule, Task
+from seda.workflows import Signature
 
 AWS_GLOBAL = {"iam", "cloudfront", "route53"}
 
@@ -41,6 +67,18 @@ class Seda:
         schedule_name: str = SCHEDULE_NAME,
         schedule_role_name: str = SCHEDULE_ROLE_NAME,
         sns_topic_name: str = SNS_TOPIC_NAME,
+        store_table_name: str = STORE_TABLE_NAME,
+        result_ttl: float = 24 * 3600,
+        result_bucket: t.Optional[str] = None,
+        max_attempts: int = 3,
+        idempotency_ttl: float = 24 * 3600,
+        deadline_margin: float = 2.0,
+        schedule_jitter: types.JitterMode = "off",
+        schedule_jitter_minutes: int = 15,
+        lanes: t.Optional[t.Dict[types.TaskPriority, Lane]] = None,
+        fifo_lane: t.Optional[Lane] = None,
+        outbox: t.Optional[types.OutboxMode] = None,
+        breaker: t.Optional[BreakerPolicy] = None,
         region: t.Optional[str] = None,
         profile: t.Optional[str] = None,
         access_key_id: t.Optional[str] = None,
@@ -48,6 +86,10 @@ class Seda:
         session_token: t.Optional[str] = None,
         account_id: t.Optional[str] = None,
         schedules: t.Optional[t.Sequence[Schedule]] = None,
+        executors: t.Optional[t.Dict[str, Executor]] = None,
+        store: t.Optional[Store] = None,
+        rate_limit: t.Optional[TokenBucket] = None,
+        cache: t.Optional[Cache] = None,
         **options: t.Any,
     ) -> None:
         self.config = config_class(
@@ -61,6 +103,18 @@ class Seda:
             schedule_name=schedule_name,
             schedule_role_name=schedule_role_name,
             sns_topic_name=sns_topic_name,
+            store_table_name=store_table_name,
+            result_ttl=result_ttl,
+            result_bucket=result_bucket,
+            max_attempts=max_attempts,
+            idempotency_ttl=idempotency_ttl,
+            deadline_margin=deadline_margin,
+            schedule_jitter=schedule_jitter,
+            schedule_jitter_minutes=schedule_jitter_minutes,
+            lanes=lanes,
+            fifo_lane=fifo_lane,
+            outbox=outbox,
+            breaker=breaker,
             region=region,
             profile=profile,
             access_key_id=access_key_id,
@@ -70,9 +124,28 @@ class Seda:
         )
         self.tasks: t.List[Task] = []
         self.schedules = [] if schedules is None else list(schedules)
-        self.client = Client(self.config.session)
+        self.metrics = Metrics()
+        self.client = Client(
+            self.config.session,
+            breaker=self.config.breaker,
+            metrics=self.metrics,
+        )
+        self.executors: t.Dict[str, Executor] = dict(executors or {})
+        self.batchers: t.Dict[str, Batcher] = {}
+        self.debouncers: t.Dict[str, Debouncer] = {}
+        self._throttled = LRUCache(4096)
+        self.executor = ThreadPoolExecutor(thread_name_prefix="seda")
         self.log = logging.getLogger("seda")
         self._account_id = account_id
+        self._store = store
+        self.rate_limit = rate_limit
+        self.cache = cache or Cache()
+        self.warmup_hooks: t.List[t.Callable[[], t.Any]] = []
+        self.cache.metrics = self.metrics
+        self._results: t.Optional[ResultBackend] = None
+        self._idempotency: t.Optional[Idempotency] = None
+        self._task_cache: t.Optional[TaskCache] = None
+        self._outbox: t.Optional[Outbox] = None
 
     _instance = None
     _lock = threading.Lock()
@@ -85,68 +158,828 @@ class Seda:
         return cls._instance
 
     def __call__(self, event: types.LambdaEvent, context: types.LambdaContext) -> t.Any:
+        try:
+            return self.handle(event, context)
+        finally:
+            # Pending messages must leave before the execution environment freezes
+            self.flush()
+
+    def handle(self, event: types.LambdaEvent, context: types.LambdaContext) -> t.Any:
         if "python" in event:
             return exec(event["python"])
         elif "shell" in event:
             subprocess.run(shlex.split(event["shell"]))
             return
         elif "task" in event:
-            return run_task(event["task"])
+            return run_task(self.decode_task(event["task"]), app=self, context=context)
         elif "Records" in event:
-            record: types.EventRecord = event["Records"][0]
-            if "Sns" in record:
-                message = json.loads(record["Sns"]["Message"])
-                if "task" in message:
-                    return run_task(message["task"])
+            tasks = self.get_record_tasks(event["Records"])
+            if tasks:
+                return self.run_records(tasks, context)
 
         if self.config.default_handler is not None:
             return self.config.default_handler(event, context)
         return
 
+    def get_record_tasks(
+        self,
+        records: t.Sequence[t.Dict[str, t.Any]],
+    ) -> t.List[t.Tuple[t.Dict[str, t.Any], types.EventTask]]:
+        tasks = []
+        for record in records:
+            if "Sns" in record:
+                body = record["Sns"]["Message"]
+            elif record.get("eventSource") == "aws:sqs":
+                body = record["body"]
+            else:
+                return []
+            try:
+                message = json.loads(body)
+            except ValueError:
+                return []
+            # Batches mixing in foreign messages belong to the default handler
+            if not isinstance(message, dict) or "task" not in message:
+                return []
+            tasks.append((record, self.decode_task(message["task"])))
+        return tasks
+
+    def encode_message(self, task: Task, data: types.EventTask) -> str:
+        # Envelopes stay JSON for routing, other codecs encode the task data inside
+        if isinstance(task.codec, JSONCodec):
+            return task.codec.encode({"task": data})
+        payload = task.codec.encode(data)
+        return default_codec.encode({"task": {"path": task.path, "payload": payload}})
+
+    def decode_task(self, data: t.Dict[str, t.Any]) -> types.EventTask:
+        if "payload" not in data:
+            return t.cast(types.EventTask, data)
+        return get_task(data["path"]).codec.decode(data["payload"])
+
+    def run_records(
+        self,
+        tasks: t.List[t.Tuple[t.Dict[str, t.Any], types.EventTask]],
+        context: types.LambdaContext,
+    ) -> t.Any:
+        def is_fifo(record: t.Dict[str, t.Any]) -> bool:
+            return str(record.get("eventSourceARN", "")).endswith(".fifo")
+
+        def get_priority(item: t.Tuple[t.Dict[str, t.Any], types.EventTask]) -> int:
+            try:
+                return PRIORITIES[get_task(item[1]["path"]).priority]
+            except exceptions.ImportPathError:
+                return PRIORITIES["default"]
+
+        result = None
+        failures = []
+        failed_groups = set()
+        # FIFO batches keep their order, otherwise higher lanes go first
+        if not any(is_fifo(record) for record, _ in tasks):
+            tasks = sorted(tasks, key=get_priority)
+
+        for record, data in tasks:
+            if "Sns" in record:
+                result = run_task(data, app=self, context=context)
+                continue
+
+            group_id = record.get("attributes", {}).get("MessageGroupId")
+            if group_id is not None and group_id in failed_groups:
+                # Later messages of a failed group must not overtake it
+                failures.append({"itemIdentifier": record["messageId"]})
+                continue
+            try:
+                run_task(data, app=self, context=context)
+            except Exception:
+                self.log.exception(f"Task {data['path']} failed.")
+                failures.append({"itemIdentifier": record["messageId"]})
+                if group_id is not None:
+                    failed_groups.add(group_id)
+
+        if any("Sns" not in record for record, _ in tasks):
+            return {"batchItemFailures": failures}
+        return result
+
     @property
     def account_id(self) -> str:
         if self._account_id is None:
             self._account_id = self.client.get_identity().get("Account")
         return t.cast(str, self._account_id)
 
+    @property
+    def store(self) -> Store:
+        if self._store is None:
+            if self.config.sync:
+                self._store = MemoryStore()
+            else:
+                table_name = self.config.get_store_table_name()
+                self._store = DynamoDBStore(table_name, self.client)
+        return self._store
+
+    @property
+    def uses_store(self) -> bool:
+        # Results and chords are only known at runtime, deploy takes --store for them
+        return any(
+            task.dedupe
+            or task.debounce is not None
+            or task.throttle is not None
+            or (task.cache is not None and task.cache.shared)
+            for task in self.tasks
+        )
+
+    @property
+    def results(self) -> ResultBackend:
+        if self._results is None:
+            self._results = ResultBackend(
+                self.store,
+                ttl=self.config.result_ttl,
+                bucket=self.config.result_bucket,
+                client=self.client,
+            )
+        return self._results
+
+    @property
+    def idempotency(self) -> Idempotency:
+        if self._idempotency is None:
+            self._idempotency = Idempotency(
+                self.store,
+                ttl=self.config.idempotency_ttl,
+            )
+        return self._idempotency
+
+    @property
+    def task_cache(self) -> TaskCache:
+        if self._task_cache is None:
+            self._task_cache = TaskCache(self.store)
+        return self._task_cache
+
+    @property
+    def outbox(self) -> Outbox:
+        if self._outbox is None:
+            self._outbox = Outbox(
+                self.client,
+                self.config.get_outbox_path(),
+                metrics=self.metrics,
+            )
+        return self._outbox
+
     def task(self, *args: t.Any, **kwargs: t.Any) -> t.Callable:
         if len(args) == 1 and callable(args[0]):
             return self.task()(args[0])
 
-        service = kwargs.get("service", "sns")
-
         def decorator(f: t.Callable) -> t.Callable:
-            task_f = Task(f)
+            task_f = Task(f, **kwargs)
             self.tasks.append(task_f)
 
-            @functools.wraps(f)
-            def wrapper(*args: t.Any, **kwargs: t.Any) -> t.Any:
-                if self.config.sync:
-                    return f(*args, **kwargs)
-                payload = {
-                    "task": {"path": task_f.path, "args": args, "kwargs": kwargs},
-                }
-                if service == "sns":
-                    return self.client.sns_publish(
-                        target_arn=self.ARN(f"sns:{self.config.get_sns_topic_name()}"),
-                        message=payload,
+            def send(
+                args: t.Sequence,
+                kwargs: t.Dict[str, t.Any],
+                throttle: bool = True,
+            ) -> t.Any:
+                if task_f.batch is None:
+                    task_f.check_call(args, kwargs)
+                if self.config.sync or task_f.debounce is not None:
+                    # Buffered and local calls are not encoded before they run
+                    task_f.codec.encode([args, kwargs])
+                if task_f.throttle is not None and not self.admit(task_f, args, kwargs):
+                    return None
+                if task_f.debounce is not None and not self.config.sync:
+                    return self.get_debouncer(task_f).add(args, kwargs)
+
+                data = types.EventTask(path=task_f.path, args=args, kwargs=kwargs)
+                if task_f.batch is not None:
+                    if kwargs:
+                        raise TypeError(f"Batch task {task_f!r} takes no kwargs.")
+                    data = types.EventTask(
+                        path=task_f.path,
+                        args=None,
+                        kwargs=None,
+                        batch=[args],
                     )
-                return self.client.invoke_function(
-                    name=self.config.function_name,
-                    payload=payload,
-                    invocation_type="Event",
+                    if not self.config.sync:
+                        return self.get_batcher(task_f).add(args)
+                if self.config.sync:
+                    if task_f.is_async:
+                        return arun_task(data, task=task_f, app=self)
+                    return run_task(data, task=task_f, app=self)
+                return self.publish(task_f, data, throttle=throttle)
+
+            def sync_wrapper(*args: t.Any, **kwargs: t.Any) -> t.Any:
+                return send(args, kwargs)
+
+            def call(
+                *args: t.Any,
+                timeout: t.Optional[float] = None,
+                **kwargs: t.Any,
+            ) -> t.Any:
+                return self.call_task(task_f, args, kwargs, timeout=timeout)
+
+            executor = None
+            if task_f.executor is not None and task_f.executor != "process":
+                executor = self.get_executor(task_f.executor, task_f.workers)
+            if not isinstance(executor, ThreadExecutor):
+                executor = None
+
+            send_async = sync_to_async(send, executor)
+            call_async = sync_to_async(self.call_task, executor)
+
+            # Async producers wait for the rate limits without holding a thread
+            async def async_wrapper(*args: t.Any, **kwargs: t.Any) -> t.Any:
+                # Buffered calls are rate limited when their message is published
+                deferred = task_f.batch is not None or task_f.debounce is not None
+                if not deferred:
+                    await self.athrottle(task_f)
+                return await send_async(args, kwargs, deferred)
+
+            async def acall(
+                *args: t.Any,
+                timeout: t.Optional[float] = None,
+                **kwargs: t.Any,
+            ) -> t.Any:
+                if not self.config.sync:
+                    await self.athrottle(task_f)
+                return await call_async(
+                    task_f,
+                    args,
+                    kwargs,
+                    timeout=timeout,
+                    throttle=False,
+                )
+
+            wrapper: t.Callable = sync_wrapper
+            if task_f.is_async and not self.config.sync:
+                wrapper = async_wrapper
+            wrapper = functools.wraps(f)(wrapper)
+
+            def map_(items: t.Iterable) -> t.Any:
+                items = list(items)
+                for item in items:
+                    task_f.check_call((item,), {})
+                data = types.EventTask(
+                    path=task_f.path,
+                    args=None,
+                    kwargs=None,
+                    map=items,
+                )
+                if self.config.sync:
+                    return run_task(data, task=task_f, app=self)
+                return self.publish(task_f, data)
+
+            def chunked(
+                items: t.Iterable,
+                *,
+                target_bytes: int = MAX_MESSAGE_BYTES,
+                max_items: t.Optional[int] = None,
+            ) -> t.List[t.Any]:
+                return self.chunked(
+                    task_f,
+                    items,
+                    target_bytes=target_bytes,
+                    max_items=max_items,
                 )
 
-            if asyncio.iscoroutinefunction(f) and not self.config.sync:
-                wrapper = sync_to_async(wrapper)
+            def submit(*args: t.Any, **kwargs: t.Any) -> AsyncResult:
+                return self.submit_task(task_f, args, kwargs)
+
+            def signature(*args: t.Any, **kwargs: t.Any) -> Signature:
+                return Signature(self, task_f, args, kwargs)
 
             wrapper.at = self.onetime(f)  # type: ignore[attr-defined]
+            wrapper.map = map_  # type: ignore[attr-defined]
+            wrapper.chunked = chunked  # type: ignore[attr-defined]
+            wrapper.s = signature  # type: ignore[attr-defined]
+            wrapper.submit = submit  # type: ignore[attr-defined]
+            wrapper.call = call  # type: ignore[attr-defined]
+            wrapper.acall = acall  # type: ignore[attr-defined]
             wrapper.task = f  # type: ignore[attr-defined]
+            wrapper.definition = task_f  # type: ignore[attr-defined]
             wrapper.app = self  # type: ignore[attr-defined]
             return wrapper
 
         return decorator
 
+    def get_batcher(self, task: Task) -> Batcher:
+        with self._lock:
+            if task.path not in self.batchers:
+                self.batchers[task.path] = batcher = Batcher(self, task)
+                # Outside Lambda the process may exit before max_wait elapses
+                atexit.register(batcher.flush)
+        return self.batchers[task.path]
+
+    def get_debouncer(self, task: Task) -> Debouncer:
+        with self._lock:
+            if task.path not in self.debouncers:
+                self.debouncers[task.path] = Debouncer(self, task)
+        return self.debouncers[task.path]
+
+    def admit(self, task: Task, args: t.Sequence, kwargs: t.Dict[str, t.Any]) -> bool:
+        window = t.cast(float, task.throttle)
+        key = f"seda:throttle:{task.path}:{task.get_call_key(args, kwargs)}"
+
+        # Leading edge, the local tier saves a store round trip inside the window
+        if key in self._throttled or not self.store.add(key, 1, ttl=window):
+            self._throttled.set(key, True, ttl=window)
+            self.metrics.incr(f"task.throttled.{task.path}")
+            return False
+        self._throttled.set(key, True, ttl=window)
+        return True
+
+    def on_warmup(self, f: t.Callable[[], t.Any]) -> t.Callable[[], t.Any]:
+        self.warmup_hooks.append(f)
+        return f
+
+    def get_warmup_services(self) -> t.List[str]:
+        services = {"sns", "dynamodb"} if self.uses_store else {"sns"}
+        for task in self.tasks:
+            services.add("sns" if task.service == "sns" else "lambda")
+            if task.ordered_by is not None or self.config.lanes[task.priority].queue:
+                services.add("sqs")
+        if self.config.result_bucket is not None:
+            services.add("s3")
+        return sorted(services)
+
+    def warmup(
+        self,
+        modules: t.Sequence[str] = (),
+        *,
+        services: t.Optional[t.Sequence[str]] = None,
+        freeze: bool = True,
+    ) -> t.Dict[str, float]:
+        timings: t.Dict[str, float] = {}
+
+        def step(name: str, func: t.Callable[[], t.Any]) -> None:
+            start = time.perf_counter()
+            func()
+            timings[name] = time.perf_counter() - start
+            self.log.info(f"Warm-up {name} took {timings[name] * 1000:.1f}ms.")
+
+        def imports() -> None:
+            for module in modules:
+                importlib.import_module(module)
+            for task in [*self.tasks, *self.schedules]:
+                get_task(task.path)
+
+        def clients() -> None:
+            for service in self.get_warmup_services() if services is None else services:
+                self.client.client(service)
+
+        def arns() -> None:
+            self.ARN(f"sns:{self.config.get_sns_topic_name()}")
+            self.ARN(f"lambda:function:{self.config.function_name}")
+
+        def hooks() -> None:
+            for hook in self.warmup_hooks:
+                hook()
+
+        def gc_freeze() -> None:
+            # Objects created so far survive, keep them out of later collections
+            gc.collect()
+            gc.freeze()
+
+        step("imports", imports)
+        if not self.config.sync:
+            step("clients", clients)
+            step("arns", arns)
+        step("hooks", hooks)
+        if freeze:
+            step("gc", gc_freeze)
+        return timings
+
+    def flush(self) -> None:
+        for debouncer in list(self.debouncers.values()):
+            debouncer.flush()
+        for batcher in list(self.batchers.values()):
+            batcher.flush()
+        if self._outbox is not None:
+            self._outbox.flush()
+
+    def chunked(
+        self,
+        task: Task,
+        items: t.Iterable,
+        *,
+        target_bytes: int = MAX_MESSAGE_BYTES,
+        max_items: t.Optional[int] = None,
+    ) -> t.List[t.Any]:
+        items = list(items)
+        if task.batch is None:
+            for item in items:
+                task.check_call((item,), {})
+
+        futures: t.List[Future] = []
+        results = []
+        for chunk in pack(
+            items,
+            task.codec,
+            target_bytes=target_bytes,
+            max_items=max_items,
+        ):
+            data = types.EventTask(path=task.path, args=None, kwargs=None)
+            if task.batch is not None:
+                data["batch"] = [(item,) for item in chunk]
+            else:
+                data["map"] = chunk
+            if self.config.sync:
+                futures.append(
+                    self.executor.submit(run_task, data, task=task, app=self)
+                )
+            elif task.ordered_by is not None:
+                # Concurrent publishes would reach the FIFO topic in any order
+                results.append(self.publish(task, data))
+            else:
+                futures.append(self.executor.submit(self.publish, task, data))
+        return [*results, *(future.result() for future in futures)]
+
+    def get_executor(self, name: str, workers: t.Optional[int] = None) -> Executor:
+        if name in ("process", "thread"):
+            key = name if workers is None else f"{name}:{workers}"
+            if key not in self.executors:
+                executor_class = EXECUTORS[name]
+                self.executors[key] = executor_class(workers)
+            return self.executors[key]
+        try:
+            return self.executors[name]
+        except KeyError:
+            raise KeyError(f'Executor "{name}" is not registered.')
+
+    def get_limits(self, task: Task) -> t.List[TokenBucket]:
+        return [limit for limit in (task.rate_limit, self.rate_limit) if limit]
+
+    def throttle(self, task: Task) -> None:
+        delay = self.reserve_limits(task)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def athrottle(self, task: Task) -> None:
+        delay = self.reserve_limits(task)
+        if delay > 0:
+            await anyio.sleep(delay)
+
+    def reserve_limits(self, task: Task) -> float:
+        reserved: t.List[t.Tuple[TokenBucket, float]] = []
+        try:
+            for limit in self.get_limits(task):
+                reserved.append((limit, limit.reserve()))
+        except exceptions.RateLimitExceeded:
+            # Tokens taken from the other buckets are not spent
+            for limit, _ in reserved:
+                limit.refund()
+            raise
+
+        # Buckets refill in parallel, the call waits for the slowest one
+        delay = max((delay for _, delay in reserved), default=0.0)
+        self.metrics.observe(f"ratelimit.wait.{task.path}", delay)
+        if delay > 0:
+            self.metrics.incr(f"ratelimit.throttled.{task.path}")
+        return delay
+
+    def publish(
+        self,
+        task: Task,
+        data: types.EventTask,
+        *,
+        throttle: bool = True,
+    ) -> t.Any:
+        if throttle:
+            self.throttle(task)
+        payload = self.encode_message(task, data)
+
+        if task.ordered_by is not None:
+            topic_name = self.config.get_fifo_topic_name()
+            return self.sns_publish(
+                self.ARN(f"sns:{topic_name}"),
+                payload,
+                group_id=task.get_group_id(data),
+            )
+        if task.service == "sns":
+            topic_name = self.config.get_sns_topic_name(task.priority)
+            return self.sns_publish(
+                self.ARN(f"sns:{topic_name}"),
+                payload,
+                attributes={"function": self.get_function_name(task)},
+            )
+        return self.client.invoke_function(
+            name=self.get_function_name(task),
+            payload=payload,
+            invocation_type="Event",
+        )
+
+    def sns_publish(
+        self,
+        topic_arn: str,
+        message: str,
+        *,
+        group_id: t.Optional[str] = None,
+        attributes: t.Optional[t.Dict[str, str]] = None,
+    ) -> t.Any:
+        if self.config.outbox is None:
+            return self.client.sns_publish(
+                topic_arn,
+                message,
+                group_id=group_id,
+                attributes=attributes,
+            )
+
+        def send() -> t.Any:
+            # Spooled messages of the same topic and group go first
+            spooling = self._outbox is not None and self._outbox.pending(
+                topic_arn,
+                group_id,
+            )
+            if self.config.outbox == "fallback" and not spooling:
+                try:
+                    return self.client.sns_publish(
+                        topic_arn,
+                        message,
+                        group_id=group_id,
+                        attributes=attributes,
+                    )
+                except (BotoCoreError, ClientError, exceptions.CircuitOpen) as exc:
+                    if not is_transient(exc):
+                        raise
+                    self.log.warning(f"Publish to {topic_arn} spooled: {exc}")
+            self.outbox.put(
+                topic_arn,
+                message,
+                group_id=group_id,
+                attributes=attributes,
+            )
+
+        # Messages of a Django transaction are only sent once it commits
+        if on_commit(send):
+            return None
+        return send()
+
+    def continue_task(
+        self,
+        task: Task,
+        data: types.EventTask,
+        *,
+        throttle: bool = True,
+    ) -> t.Any:
+        if self.config.sync:
+            return run_task(data, task=task, app=self)
+        return self.publish(task, data, throttle=throttle)
+
+    def submit_task(
+        self,
+        task: Task,
+        args: t.Sequence,
+        kwargs: t.Dict[str, t.Any],
+    ) -> AsyncResult:
+        task.check_call(args, kwargs)
+        result = AsyncResult(self, task)
+        data = types.EventTask(
+            path=task.path,
+            args=args,
+            kwargs=kwargs,
+            result_id=result.id,
+        )
+        self.continue_task(task, data)
+        return result
+
+    def get_idempotency_key(
+        self,
+        task: Task,
+        data: types.EventTask,
+    ) -> t.Optional[str]:
+        # RPC callers wait for their own answer, hedged duplicates included
+        if not task.dedupe or data.get("rpc"):
+            return None
+        return self.idempotency.get_key(task, data)
+
+    def get_cached(self, task: Task, data: types.EventTask) -> t.Tuple[bool, t.Any]:
+        if task.cache is None or any(key in data for key in ("map", "cursor")):
+            return False, None
+
+        args, kwargs = data.get("args") or (), data.get("kwargs") or {}
+        found, result = self.task_cache.get(task, args, kwargs)
+        self.metrics.incr(f"cache.{'hits' if found else 'misses'}.{task.path}")
+        return found, result
+
+    def claim_task(
+        self,
+        task: Task,
+        data: types.EventTask,
+        *,
+        timeout: t.Optional[float] = None,
+    ) -> t.Tuple[bool, t.Optional[types.ClaimSource], t.Any]:
+        if "debounce" in data and not self.settle_debounce(task, data):
+            return False, None, None
+
+        found, result = self.get_cached(task, data)
+        if found:
+            return False, "cache", result
+
+        key = self.get_idempotency_key(task, data)
+        if key is None:
+            return True, None, None
+
+        claimed, found, result = self.idempotency.claim(key, task, timeout=timeout)
+        if not claimed:
+            self.metrics.incr(f"task.duplicates.{task.path}")
+        return claimed, "replay" if found else None, result
+
+    def settle_debounce(self, task: Task, data: types.EventTask) -> bool:
+        debounce = data["debounce"]
+        key = debounce["key"]
+        # The trigger is spent, calls from now on arm a new one
+        self.store.delete(f"{key}:armed")
+        state = self.store.get(key)
+
+        if state is not None and state["token"] != debounce["token"]:
+            self.metrics.incr(f"task.debounced.{task.path}")
+            debounce = types.EventDebounce(
+                key=key,
+                token=state["token"],
+                deadline=state["deadline"],
+            )
+            # The delivery runs the latest call in place of its own
+            data["args"], data["kwargs"] = task.codec.decode(state["call"])
+            data["debounce"] = debounce
+
+        if debounce["deadline"] > time.time():
+            # A later call moved the deadline, wait for it outside of Lambda
+            if self.store.add(
+                f"{key}:armed",
+                debounce["token"],
+                ttl=debounce["deadline"] - time.time() + DEBOUNCE_TTL,
+            ):
+                self.defer_task(task, data, debounce["deadline"])
+            return False
+        # Redeliveries of the last call run it once
+        return self.store.add(f"{key}:{debounce['token']}", 1, ttl=DEBOUNCE_TTL)
+
+    def defer_task(
+        self,
+        task: Task,
+        data: types.EventTask,
+        deadline: float,
+    ) -> types.CreateScheduleResponse:
+        # One-shot schedules deliver the message once the deadline has passed,
+        # instead of a billed sleep in the receiving invocation
+        when = datetime.fromtimestamp(math.ceil(deadline), timezone.utc)
+        schedule = Schedule(
+            task.func,
+            f"at({when.replace(tzinfo=None).isoformat()})",
+            args=data["args"],
+            kwargs=data["kwargs"],
+        )
+        role_name = self.config.get_schedule_role_name()
+        return self.client.create_schedule(
+            name=self.config.get_schedule_name(schedule),
+            group_name=self.config.get_schedule_group_name(onetime=True),
+            expression=schedule.expression,
+            target_arn=self.ARN(f"lambda:function:{self.get_function_name(task)}"),
+            role_arn=self.ARN(f"iam:role/{role_name}"),
+            target_input=json.loads(self.encode_message(task, data)),
+        )
+
+    def complete_task(
+        self,
+        task: Task,
+        data: types.EventTask,
+        result: t.Any,
+        *,
+        continued: bool = False,
+        cached: bool = False,
+        replayed: bool = False,
+    ) -> None:
+        stored = cached or replayed
+        key = self.get_idempotency_key(task, data)
+        if key is not None and not stored:
+            self.idempotency.save(key, task, result)
+        # The continuation reports the final result
+        if continued:
+            return
+        cacheable = not any(key in data for key in ("map", "cursor"))
+        if task.cache is not None and cacheable and not stored:
+            args, kwargs = data.get("args") or (), data.get("kwargs") or {}
+            self.task_cache.set(task, args, kwargs, result)
+        if "result_id" in data:
+            self.results.save(data["result_id"], task, result)
+        # The first delivery of a deduplicated message already sent its workflow
+        if ("chain" in data or "chord" in data) and not replayed:
+            workflows.complete(self, data, result)
+
+    def fail_task(self, task: Task, data: types.EventTask, exc: BaseException) -> None:
+        key = self.get_idempotency_key(task, data)
+        if key is not None:
+            # Let the retry run the task again
+            self.idempotency.release(key)
+        if "result_id" in data and self.is_last_attempt(data["result_id"]):
+            self.results.save_error(data["result_id"], exc)
+
+    def is_last_attempt(self, result_id: str) -> bool:
+        # Lambda retries failed async deliveries, waiters keep waiting until the last
+        if self.config.sync or self.config.max_attempts <= 1:
+            return True
+        attempts = self.store.incr(
+            f"seda:attempts:{result_id}",
+            ttl=self.config.result_ttl,
+        )
+        return attempts >= self.config.max_attempts
+
+    def put_result_lifecycle(self) -> types.Response:
+        bucket = t.cast(str, self.config.result_bucket)
+        days = max(1, math.ceil(self.config.result_ttl / 86400))
+        rule = {
+            "ID": RESULT_LIFECYCLE_RULE_ID,
+            "Filter": {"Prefix": RESULT_PREFIX},
+            "Status": "Enabled",
+            "Expiration": {"Days": days},
+        }
+        # Rules of the bucket owner are kept, only the seda rule is replaced
+        rules = [
+            current
+            for current in self.client.s3_get_bucket_lifecycle_rules(bucket)
+            if current.get("ID") != RESULT_LIFECYCLE_RULE_ID
+        ]
+        return self.client.s3_put_bucket_lifecycle_rules(bucket, [*rules, rule])
+
+    def call_task(
+        self,
+        task: Task,
+        args: t.Sequence,
+        kwargs: t.Dict[str, t.Any],
+        *,
+        timeout: t.Optional[float] = None,
+        throttle: bool = True,
+    ) -> t.Any:
+        task.check_call(args, kwargs)
+        data = types.EventTask(path=task.path, args=args, kwargs=kwargs)
+        if self.config.sync:
+            return run_task(data, task=task, app=self)
+
+        found, result = self.get_cached(task, data)
+        if found:
+            return result
+        if throttle:
+            self.throttle(task)
+
+        data["rpc"] = True
+        self.metrics.incr(f"rpc.calls.{task.path}")
+        if task.hedge is None:
+            result = self._invoke_rpc(task, data, timeout)
+        else:
+            result = self._hedged_rpc(task, data, timeout)
+
+        if task.cache is not None:
+            self.task_cache.set(task, args, kwargs, result)
+        return result
+
+    def _invoke_rpc(
+        self,
+        task: Task,
+        data: types.EventTask,
+        timeout: t.Optional[float],
+    ) -> t.Any:
+        start = time.monotonic()
+        try:
+            response = self.client.invoke_function(
+                name=self.get_function_name(task),
+                payload=self.encode_message(task, data),
+                log_type=None,
+                timeout=timeout,
+            )
+        except ReadTimeoutError as exc:
+            raise TimeoutError(f"{task!r} call timed out after {timeout}s.") from exc
+
+        payload = json.loads(response["Payload"].read())
+        if "FunctionError" in response:
+            raise exceptions.RemoteError.from_payload(payload)
+        # Each attempt is sampled on its own, hedges must not shorten the p95
+        self.metrics.observe(f"rpc.latency.{task.path}", time.monotonic() - start)
+        return task.codec.decode(payload)
+
+    def _hedged_rpc(
+        self,
+        task: Task,
+        data: types.EventTask,
+        timeout: t.Optional[float],
+    ) -> t.Any:
+        hedge = t.cast(HedgePolicy, task.hedge)
+        delay = hedge.get_delay(self.metrics, f"rpc.latency.{task.path}")
+        futures = [self.executor.submit(self._invoke_rpc, task, data, timeout)]
+        done, _ = wait(futures, timeout=delay)
+
+        if not done:
+            self.metrics.incr(f"rpc.hedges.{task.path}")
+            futures.append(self.executor.submit(self._invoke_rpc, task, data, timeout))
+
+        # A failed attempt only decides the call once no other one is pending
+        pending = set(futures)
+        succeeded: t.List[Future] = []
+        while pending and not succeeded:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            succeeded = [future for future in done if future.exception() is None]
+
+        winner = succeeded[0] if succeeded else futures[0]
+        for future in futures:
+            if future is not winner:
+                future.cancel()
+        if winner is not futures[0]:
+            self.metrics.incr(f"rpc.hedge_wins.{task.path}")
+        return winner.result()
+
     def onetime(self, func: t.Callable) -> t.Callable:
         def at(
             onetime_date: datetime,
@@ -214,6 +1047,23 @@ class Seda:
 
         return decorator
 
+    def get_deploy_schedules(
+        self,
+        jitter: t.Optional[types.JitterMode] = None,
+    ) -> t.List[Schedule]:
+        mode = jitter or self.config.schedule_jitter
+        if mode == "off":
+            return list(self.schedules)
+
+        now = datetime.now(timezone.utc)
+        return analysis.flatten_peaks(
+            self.schedules,
+            mode,
+            max_minutes=self.config.schedule_jitter_minutes,
+            after=now,
+            until=now + timedelta(days=7),
+        )
+
     def ARN(self, key: str) -> str:
         service, _, resource = key.partition(":")
 
@@ -223,11 +1073,25 @@ class Seda:
         region = "" if service in AWS_GLOBAL else self.config.region
         return f"arn:aws:{service}:{region}:{self.account_id}:{resource}"
 
-    def get_function(self) -> types.LambdaFunctionResponse:
-        return self.client.get_function(self.config.function_name)
+    def get_function_name(self, task: t.Optional[Task] = None) -> str:
+        if task is not None and task.function is not None:
+            return task.function
+        return self.config.function_name
+
+    def get_function_names(self) -> t.List[str]:
+        routed = {task.function for task in self.tasks if task.function is not None}
+        routed.discard(self.config.function_name)
+        return [self.config.function_name, *sorted(t.cast(t.Set[str], routed))]
+
+    def get_function(
+        self,
+        function_name: t.Optional[str] = None,
+    ) -> types.LambdaFunctionResponse:
+        return self.client.get_function(function_name or self.config.function_name)
 
-    def get_function_role_name(self) -> str:
-        return self.get_function()["Configuration"]["Role"].rsplit("/")[-1]
+    def get_function_role_name(self, function_name: t.Optional[str] = None) -> str:
+        function = self.get_function(function_name)
+        return function["Configuration"]["Role"].rsplit("/")[-1]
 
     def create_schedule_role(self) -> types.RoleResponse:
         trust_policy = policies.SCHEDULE_TRUST_POLICY.copy()
@@ -250,23 +1114,59 @@ class Seda:
         role_name = self.config.get_schedule_role_name()
         return self.client.delete_role(role_name)
 
-    def put_function_policy(self) -> types.Response:
-        function_role_name = self.get_function_role_name()
+    def put_function_policy(
+        self,
+        function_name: t.Optional[str] = None,
+    ) -> types.Response:
+        function_role_name = self.get_function_role_name(function_name)
         policy = policies.LAMBDA_FUNCTION_POLICY.copy()
         policy_name = self.config.get_function_policy_name()
         group_name = self.config.get_schedule_group_name(onetime=True)
         schedule_role_name = self.config.get_schedule_role_name()
+        topics = [
+            self.ARN(f"sns:{self.config.get_sns_topic_name(priority)}")
+            for priority in self.get_lanes()
+        ]
+        if self.has_ordered_tasks:
+            topics.append(self.ARN(f"sns:{self.config.get_fifo_topic_name()}"))
         resources = (
             self.ARN(f"scheduler:schedule/{group_name}/*"),
             self.ARN(f"iam:role/{schedule_role_name}"),
-            self.ARN(f"sns:{self.config.get_sns_topic_name()}"),
+            topics,
+            self.ARN(f"dynamodb:table/{self.config.get_store_table_name()}"),
         )
         for idx, resource in enumerate(resources):
             policy["Statement"][idx]["Resource"] = resource
+
+        queues = [
+            self.ARN(f"sqs:{self.config.get_sqs_queue_name(priority, name)}")
+            for priority, lane in self.get_lanes().items()
+            if lane.queue
+            for name in self.get_function_names()
+        ]
+        if self.has_ordered_tasks:
+            queues.append(self.ARN(f"sqs:{self.config.get_fifo_queue_name()}"))
+        if queues:
+            statement = policies.SQS_LANES_STATEMENT.copy()
+            statement["Resource"] = queues
+            policy = types.Policy(
+                Version=policy["Version"],
+                Statement=[*policy["Statement"], statement],
+            )
+        if self.config.result_bucket is not None:
+            statement = policies.S3_RESULTS_STATEMENT.copy()
+            statement["Resource"] = f"arn:aws:s3:::{self.config.result_bucket}/seda/*"
+            policy = types.Policy(
+                Version=policy["Version"],
+                Statement=[*policy["Statement"], statement],
+            )
         return self.client.put_role_policy(function_role_name, policy_name, policy)
 
-    def delete_function_policy(self) -> types.Response:
-        function_role_name = self.get_function_role_name()
+    def delete_function_policy(
+        self,
+        function_name: t.Optional[str] = None,
+    ) -> types.Response:
+        function_role_name = self.get_function_role_name(function_name)
         policy_name = self.config.get_function_policy_name()
         return self.client.delete_role_policy(function_role_name, policy_name)
 
@@ -339,11 +1239,22 @@ class Seda:
             target_input={"task": task},
         )
 
-    def create_sns_topic(self) -> types.CreateSNSTopicResponse:
-        return self.client.create_sns_topic(self.config.get_sns_topic_name())
+    def create_store_table(self) -> types.CreateDynamoDBTableResponse:
+        return self.client.create_dynamodb_table(self.config.get_store_table_name())
 
-    def delete_sns_topic(self) -> types.Response:
-        topic_arn = self.ARN(f"sns:{self.config.get_sns_topic_name()}")
+    def delete_store_table(self) -> types.Response:
+        return self.client.delete_dynamodb_table(self.config.get_store_table_name())
+
+    def create_sns_topic(
+        self,
+        priority: types.TaskPriority = "default",
+    ) -> types.CreateSNSTopicResponse:
+        return self.client.create_sns_topic(self.config.get_sns_topic_name(priority))
+
+    def delete_sns_topic(
+        self, priority: types.TaskPriority = "default"
+    ) -> types.Response:
+        topic_arn = self.ARN(f"sns:{self.config.get_sns_topic_name(priority)}")
 
         for sub in self.client.list_subscriptions_by_topic(topic_arn=topic_arn)[
             "Subscriptions"
@@ -351,31 +1262,235 @@ class Seda:
             self.client.sns_unsubscribe(sub["SubscriptionArn"])
         return self.client.delete_sns_topic(topic_arn)
 
-    def add_sns_permission(self) -> types.Response:
-        topic_arn = self.ARN(f"sns:{self.config.get_sns_topic_name()}")
+    def add_sns_permission(
+        self,
+        priority: types.TaskPriority = "default",
+        *,
+        function_name: t.Optional[str] = None,
+    ) -> types.Response:
+        topic_arn = self.ARN(f"sns:{self.config.get_sns_topic_name(priority)}")
         return self.client.add_lambda_permission(
-            function_name=self.config.function_name,
-            statement_id=self.config.get_sns_statement_id(),
+            function_name=function_name or self.config.function_name,
+            statement_id=self.config.get_sns_statement_id(priority),
             action="lambda:InvokeFunction",
             principal="sns.amazonaws.com",
             source_arn=topic_arn,
             source_account=self.account_id,
         )
 
-    def remove_sns_permission(self) -> types.Response:
+    def remove_sns_permission(
+        self,
+        priority: types.TaskPriority = "default",
+        *,
+        function_name: t.Optional[str] = None,
+    ) -> types.Response:
         return self.client.remove_lambda_permission(
-            function_name=self.config.function_name,
-            statement_id=self.config.get_sns_statement_id(),
+            function_name=function_name or self.config.function_name,
+            statement_id=self.config.get_sns_statement_id(priority),
         )
 
-    def sns_subscribe(self) -> types.CreateSubscriptionResponse:
-        topic_arn = self.ARN(f"sns:{self.config.get_sns_topic_name()}")
-        function_arn = self.ARN(f"lambda:function:{self.config.function_name}")
+    def sns_subscribe(
+        self,
+        priority: types.TaskPriority = "default",
+        *,
+        function_name: t.Optional[str] = None,
+    ) -> types.CreateSubscriptionResponse:
+        function_name = function_name or self.config.function_name
+        topic_arn = self.ARN(f"sns:{self.config.get_sns_topic_name(priority)}")
+        attributes = {"FilterPolicy": json.dumps(self.get_filter_policy(function_name))}
+        protocol: types.SubscriptionProtocol = "lambda"
+        endpoint = self.ARN(f"lambda:function:{function_name}")
+        if self.config.lanes[priority].queue:
+            queue_name = self.config.get_sqs_queue_name(priority, function_name)
+            protocol, endpoint = "sqs", self.ARN(f"sqs:{queue_name}")
+            attributes["RawMessageDelivery"] = "true"
+
+        # SNS rejects subscribing again with other attributes, update them instead
+        for sub in self.client.list_subscriptions_by_topic(topic_arn=topic_arn)[
+            "Subscriptions"
+        ]:
+            if sub["Protocol"] == protocol and sub["Endpoint"] == endpoint:
+                for name, value in attributes.items():
+                    response = self.client.sns_set_subscription_attributes(
+                        sub["SubscriptionArn"],
+                        name,
+                        value,
+                    )
+                return types.CreateSubscriptionResponse(
+                    ResponseMetadata=response["ResponseMetadata"],
+                    SubscriptionArn=sub["SubscriptionArn"],
+                )
+
         return self.client.sns_subscribe(
             topic_arn,
-            protocol="lambda",
-            endpoint=function_arn,
+            protocol=protocol,
+            endpoint=endpoint,
+            attributes=attributes,
+        )
+
+    def get_filter_policy(self, function_name: str) -> t.Dict[str, t.Any]:
+        # Each function only receives the tasks routed to it, the main function
+        # also receives messages published without the attribute
+        if function_name != self.config.function_name:
+            return {"function": [function_name]}
+        return {
+            "$or": [
+                {"function": [function_name]},
+                {"function": [{"exists": False}]},
+            ]
+        }
+
+    def create_sqs_queue(
+        self,
+        priority: types.TaskPriority,
+        *,
+        function_name: t.Optional[str] = None,
+    ) -> types.CreateSQSQueueResponse:
+        queue_name = self.config.get_sqs_queue_name(priority, function_name)
+        topic_arn = self.ARN(f"sns:{self.config.get_sns_topic_name(priority)}")
+        return self.client.create_sqs_queue(
+            queue_name,
+            attributes=self.get_sqs_queue_attributes(
+                queue_name,
+                topic_arn,
+                function_name=function_name,
+            ),
+        )
+
+    def get_sqs_queue_attributes(
+        self,
+        queue_name: str,
+        topic_arn: str,
+        *,
+        function_name: t.Optional[str] = None,
+    ) -> t.Dict[str, str]:
+        policy = policies.SQS_QUEUE_POLICY.copy()
+        policy["Statement"] = [
+            {
+                **policies.SQS_QUEUE_POLICY["Statement"][0],
+                "Resource": self.ARN(f"sqs:{queue_name}"),
+                "Condition": {"ArnEquals": {"aws:SourceArn": topic_arn}},
+            }
+        ]
+        # AWS recommends six times the function timeout for event sources
+        timeout = self.get_function(function_name)["Configuration"]["Timeout"]
+        return {
+            "Policy": json.dumps(policy),
+            "VisibilityTimeout": str(min(timeout * 6, 43200)),
+        }
+
+    def delete_sqs_queue(
+        self,
+        priority: types.TaskPriority,
+        *,
+        function_name: t.Optional[str] = None,
+    ) -> types.Response:
+        queue_url = self.client.get_sqs_queue_url(
+            self.config.get_sqs_queue_name(priority, function_name)
+        )
+        return self.client.delete_sqs_queue(queue_url)
+
+    def create_event_source_mapping(
+        self,
+        priority: types.TaskPriority,
+        *,
+        function_name: t.Optional[str] = None,
+    ) -> types.EventSourceMapping:
+        lane = self.config.lanes[priority]
+        function_name = function_name or self.config.function_name
+        queue_name = self.config.get_sqs_queue_name(priority, function_name)
+        return self.client.create_event_source_mapping(
+            function_name,
+            self.ARN(f"sqs:{queue_name}"),
+            batch_size=lane.batch_size,
+            batch_window=lane.batch_window,
+            max_concurrency=lane.max_concurrency,
+        )
+
+    def delete_event_source_mapping(
+        self,
+        priority: types.TaskPriority,
+        *,
+        function_name: t.Optional[str] = None,
+    ) -> None:
+        function_name = function_name or self.config.function_name
+        queue_name = self.config.get_sqs_queue_name(priority, function_name)
+        for mapping in self.client.list_event_source_mappings(
+            function_name,
+            self.ARN(f"sqs:{queue_name}"),
+        )["EventSourceMappings"]:
+            self.client.delete_event_source_mapping(mapping["UUID"])
+
+    def get_lanes(self) -> t.Dict[types.TaskPriority, Lane]:
+        # Only lanes something publishes to are provisioned, default always is
+        used = {"default", *self.config.configured_lanes}
+        used.update(task.priority for task in self.tasks if task.service == "sns")
+        return {
+            priority: lane
+            for priority, lane in self.config.lanes.items()
+            if priority in used
+        }
+
+    @property
+    def has_ordered_tasks(self) -> bool:
+        return any(task.ordered_by is not None for task in self.tasks)
+
+    def create_fifo_stack(self) -> None:
+        topic_name = self.config.get_fifo_topic_name()
+        queue_name = self.config.get_fifo_queue_name()
+        topic_arn = self.ARN(f"sns:{topic_name}")
+        queue_arn = self.ARN(f"sqs:{queue_name}")
+        attributes = {"FifoTopic": "true", "ContentBasedDeduplication": "true"}
+        self.client.create_sns_topic(topic_name, attributes)
+
+        try:
+            self.client.create_sqs_queue(
+                queue_name,
+                attributes={
+                    **self.get_sqs_queue_attributes(queue_name, topic_arn),
+                    "FifoQueue": "true",
+                    "ContentBasedDeduplication": "true",
+                },
+            )
+        except exceptions.AlreadyExistsError:
+            pass
+
+        self.client.sns_subscribe(
+            topic_arn,
+            protocol="sqs",
+            endpoint=queue_arn,
+            attributes={"RawMessageDelivery": "true"},
         )
+        lane = self.config.fifo_lane
+        try:
+            self.client.create_event_source_mapping(
+                self.config.function_name,
+                queue_arn,
+                batch_size=lane.batch_size,
+                max_concurrency=lane.max_concurrency,
+            )
+        except exceptions.AlreadyExistsError:
+            pass
+
+    def delete_fifo_stack(self) -> None:
+        topic_arn = self.ARN(f"sns:{self.config.get_fifo_topic_name()}")
+        queue_name = self.config.get_fifo_queue_name()
+        for mapping in self.client.list_event_source_mappings(
+            self.config.function_name,
+            self.ARN(f"sqs:{queue_name}"),
+        )["EventSourceMappings"]:
+            self.client.delete_event_source_mapping(mapping["UUID"])
+
+        try:
+            self.client.delete_sqs_queue(self.client.get_sqs_queue_url(queue_name))
+        except exceptions.NotFound:
+            pass
+
+        for sub in self.client.list_subscriptions_by_topic(topic_arn=topic_arn)[
+            "Subscriptions"
+        ]:
+            self.client.sns_unsubscribe(sub["SubscriptionArn"])
+        self.client.delete_sns_topic(topic_arn)
 
 
 _default_app = Seda()
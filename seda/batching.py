@@ -0,0 +1,188 @@
+import threading
+import time
+import typing as t
+import uuid
+
+from seda import types
+from seda.codecs import Codec
+from seda.tasks import BatchPolicy, Task
+
+if t.TYPE_CHECKING:
+    from seda.app import Seda
+
+# Room left for the message envelope within the 256 KB SNS/Lambda event limit
+ENVELOPE_BYTES = 1024
+MAX_MESSAGE_BYTES = 256 * 1024
+# Debounce records outlive their window until the last call has been delivered
+DEBOUNCE_TTL = 15 * 60
+
+
+def pack(
+    items: t.Iterable,
+    codec: Codec,
+    *,
+    target_bytes: int = MAX_MESSAGE_BYTES,
+    max_items: t.Optional[int] = None,
+) -> t.Iterator[t.List[t.Any]]:
+    chunk: t.List[t.Any] = []
+    size = ENVELOPE_BYTES
+
+    for item in items:
+        item_size = len(codec.encode(item)) + 1
+        if chunk and (
+            size + item_size > target_bytes
+            or (max_items is not None and len(chunk) >= max_items)
+        ):
+            yield chunk
+            chunk, size = [], ENVELOPE_BYTES
+        chunk.append(item)
+        size += item_size
+
+    if chunk:
+        yield chunk
+
+
+class Batcher:
+    def __init__(self, app: "Seda", task: Task) -> None:
+        self.app = app
+        self.task = task
+        self.policy = t.cast(BatchPolicy, task.batch)
+        self._items: t.List[t.Sequence] = []
+        self._bytes = ENVELOPE_BYTES
+        self._timer: t.Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, args: t.Sequence) -> t.Optional[t.Any]:
+        size = len(self.task.codec.encode(args)) + 1
+        batches = []
+
+        with self._lock:
+            if self._items and self._bytes + size > self.policy.max_bytes:
+                batches.append(self._take())
+            self._items.append(args)
+            self._bytes += size
+
+            if len(self._items) >= self.policy.max_items:
+                batches.append(self._take())
+            elif self._timer is None:
+                self._timer = threading.Timer(self.policy.max_wait, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        response = None
+        for items in batches:
+            response = self._publish(items)
+        return response
+
+    def _take(self) -> t.List[t.Sequence]:
+        items, self._items, self._bytes = self._items, [], ENVELOPE_BYTES
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return items
+
+    def _publish(self, items: t.List[t.Sequence]) -> t.Any:
+        return self.app.publish(
+            self.task,
+            types.EventTask(path=self.task.path, args=None, kwargs=None, batch=items),
+        )
+
+    def flush(self) -> t.Optional[t.Any]:
+        with self._lock:
+            items = self._take()
+        if not items:
+            return None
+        return self._publish(items)
+
+
+def get_debounce_state(
+    debounce: types.EventDebounce,
+    codec: Codec,
+    args: t.Sequence,
+    kwargs: t.Dict[str, t.Any],
+) -> t.Dict[str, t.Any]:
+    return {
+        "token": debounce["token"],
+        "deadline": debounce["deadline"],
+        "call": codec.encode([args, kwargs]),
+    }
+
+
+class Debouncer:
+    # Trailing edge, every call records itself as the latest call in the store
+    # and a single armed trigger per key runs the latest call once its window
+    # has passed, so repeated calls do not each cost an invocation
+    def __init__(self, app: "Seda", task: Task) -> None:
+        self.app = app
+        self.task = task
+        self.window = t.cast(float, task.debounce)
+        self._pending: t.Dict[
+            str,
+            t.Tuple[t.Sequence, t.Dict, types.EventDebounce, threading.Timer],
+        ] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, args: t.Sequence, kwargs: t.Dict[str, t.Any]) -> None:
+        key = f"seda:debounce:{self.task.path}:{self.task.get_call_key(args, kwargs)}"
+        debounce = types.EventDebounce(
+            key=key,
+            token=uuid.uuid4().hex,
+            deadline=time.time() + self.window,
+        )
+        state = get_debounce_state(debounce, self.task.codec, args, kwargs)
+        timer = threading.Timer(self.window, self._fire, (key,))
+        timer.daemon = True
+
+        # The store and the pending call are swapped together, a call replaced
+        # locally must not be the latest call in the store
+        with self._lock:
+            self.app.store.set(key, state, ttl=self.window + DEBOUNCE_TTL)
+            if key in self._pending:
+                self._pending[key][3].cancel()
+                self.app.metrics.incr(f"task.debounced.{self.task.path}")
+            self._pending[key] = (args, kwargs, debounce, timer)
+            timer.start()
+
+    def _fire(self, key: str) -> None:
+        with self._lock:
+            if key not in self._pending:
+                return
+            args, kwargs, debounce, _ = self._pending.pop(key)
+        self._send(args, kwargs, debounce)
+
+    def _send(
+        self,
+        args: t.Sequence,
+        kwargs: t.Dict[str, t.Any],
+        debounce: types.EventDebounce,
+    ) -> t.Any:
+        # An outstanding trigger picks up this call from the store
+        if not self.app.store.add(
+            f"{debounce['key']}:armed",
+            debounce["token"],
+            ttl=self.window + DEBOUNCE_TTL,
+        ):
+            return None
+        data = types.EventTask(
+            path=self.task.path,
+            args=args,
+            kwargs=kwargs,
+            debounce=debounce,
+        )
+        if debounce["deadline"] > time.time():
+            return self.app.defer_task(self.task, data, debounce["deadline"])
+        return self.app.publish(self.task, data)
+
+    def flush(self) -> None:
+        # Calls flushed before their deadline are delivered when it passes
+        with self._lock:
+            pending, self._pending = list(self._pending.values()), {}
+        for args, kwargs, debounce, timer in pending:
+            timer.cancel()
+            self._send(args, kwargs, debounce)
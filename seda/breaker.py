@@ -0,0 +1,97 @@
+import collections
+import threading
+import time
+import typing as t
+
+from seda.exceptions import CircuitOpen
+from seda.metrics import Metrics
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class BreakerPolicy:
+    def __init__(
+        self,
+        *,
+        error_rate: float = 0.5,
+        latency: t.Optional[float] = None,
+        min_calls: int = 20,
+        window: float = 30.0,
+        reset_timeout: float = 30.0,
+    ) -> None:
+        self.error_rate = error_rate
+        self.latency = latency
+        self.min_calls = min_calls
+        self.window = window
+        self.reset_timeout = reset_timeout
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} error_rate={self.error_rate:g}>"
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        policy: BreakerPolicy,
+        *,
+        metrics: t.Optional[Metrics] = None,
+    ) -> None:
+        self.name = name
+        self.policy = policy
+        self.metrics = metrics or Metrics()
+        self.state = CLOSED
+        self._calls: t.Deque[t.Tuple[float, bool]] = collections.deque()
+        self._opened = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.name} {self.state}>"
+
+    def _transition(self, state: str) -> None:
+        self.state = state
+        self.metrics.incr(f"breaker.{state}.{self.name}")
+        if state == OPEN:
+            self._opened = time.monotonic()
+        elif state == CLOSED:
+            self._calls.clear()
+
+    def before(self) -> None:
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self._opened < self.policy.reset_timeout:
+                    self.metrics.incr(f"breaker.rejected.{self.name}")
+                    raise CircuitOpen(f"Circuit {self.name} is open.")
+                self._transition(HALF_OPEN)
+
+            if self.state == HALF_OPEN:
+                # A single probe call decides whether the circuit closes
+                if self._probing:
+                    self.metrics.incr(f"breaker.rejected.{self.name}")
+                    raise CircuitOpen(f"Circuit {self.name} is half open.")
+                self._probing = True
+
+    def record(self, duration: float, *, failed: bool) -> None:
+        latency = self.policy.latency
+        failed = failed or (latency is not None and duration > latency)
+        now = time.monotonic()
+
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probing = False
+                self._transition(OPEN if failed else CLOSED)
+                return
+            if self.state == OPEN:
+                return
+
+            self._calls.append((now, failed))
+            while self._calls and self._calls[0][0] <= now - self.policy.window:
+                self._calls.popleft()
+            if len(self._calls) < self.policy.min_calls:
+                return
+            failures = sum(1 for _, call_failed in self._calls if call_failed)
+            if failures / len(self._calls) >= self.policy.error_rate:
+                self._transition(OPEN)
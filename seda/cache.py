@@ -0,0 +1,331 @@
+import collections
+import hashlib
+import logging
+import os
+import threading
+import time
+import typing as t
+
+from seda.codecs import Codec, default_codec
+from seda.metrics import Metrics
+from seda.stores import Store
+from seda.tasks import CachePolicy, Task
+
+_missing: t.Any = object()
+
+
+class LRUCache:
+    def __init__(self, max_entries: int = 1024, ttl: t.Optional[float] = None) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: t.OrderedDict[str, t.Tuple[t.Any, t.Optional[float]]] = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {len(self)}/{self.max_entries}>"
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _missing) is not _missing
+
+    def get(self, key: str, default: t.Any = None) -> t.Any:
+        with self._lock:
+            if key not in self._data:
+                return default
+            value, expires = self._data[key]
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: t.Any, *, ttl: t.Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+# Half of the smallest ephemeral storage a function can have (512 MB)
+MAX_DISK_BYTES = 256 * 1024 * 1024
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.value: t.Any = None
+        self.error: t.Optional[BaseException] = None
+
+
+class DiskCache:
+    def __init__(
+        self,
+        path: str,
+        *,
+        max_bytes: int = MAX_DISK_BYTES,
+        codec: Codec = default_codec,
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.codec = codec
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        self._size = sum(entry.stat().st_size for entry in os.scandir(path))
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.path} {self._size}/{self.max_bytes}>"
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.path, hashlib.sha256(key.encode()).hexdigest())
+
+    def get(self, key: str, default: t.Any = None) -> t.Any:
+        found, value, _ = self.get_item(key)
+        return value if found else default
+
+    def get_item(self, key: str) -> t.Tuple[bool, t.Any, t.Optional[float]]:
+        path = self._get_path(key)
+        try:
+            with open(path) as f:
+                record = self.codec.decode(f.read())
+        except (OSError, ValueError):
+            return False, None, None
+        ttl = None
+        if record["expires"] is not None:
+            ttl = record["expires"] - time.time()
+            if ttl <= 0:
+                self.delete(key)
+                return False, None, None
+        # Reads refresh the modification time used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return True, record["value"], ttl
+
+    def set(self, key: str, value: t.Any, *, ttl: t.Optional[float] = None) -> None:
+        expires = None if ttl is None else time.time() + ttl
+        data = self.codec.encode({"value": value, "expires": expires})
+        if len(data) > self.max_bytes:
+            return
+
+        path = self._get_path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with self._lock:
+            self._size -= self._unlink_size(path)
+            try:
+                with open(tmp_path, "w") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError:
+                self._unlink_size(tmp_path)
+                raise
+            self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._size -= self._unlink_size(self._get_path(key))
+
+    def clear(self) -> None:
+        with self._lock:
+            for entry in os.scandir(self.path):
+                self._unlink_size(entry.path)
+            self._size = 0
+
+    @staticmethod
+    def _unlink_size(path: str) -> int:
+        try:
+            size = os.stat(path).st_size
+            os.unlink(path)
+        except OSError:
+            return 0
+        return size
+
+    def _evict(self) -> None:
+        entries = sorted(os.scandir(self.path), key=lambda entry: entry.stat().st_mtime)
+        for entry in entries:
+            if self._size <= self.max_bytes * 0.9:
+                break
+            self._size -= self._unlink_size(entry.path)
+
+
+class Cache:
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: t.Optional[float] = None,
+        *,
+        path: t.Optional[str] = None,
+        max_disk_bytes: int = MAX_DISK_BYTES,
+        codec: Codec = default_codec,
+        name: str = "default",
+    ) -> None:
+        self.ttl = ttl
+        self.name = name
+        self.local = LRUCache(max_entries, ttl=ttl)
+        self.disk = None
+        if path is not None:
+            self.disk = DiskCache(path, max_bytes=max_disk_bytes, codec=codec)
+        self.metrics = Metrics()
+        self.log = logging.getLogger("seda")
+        self._inflight: t.Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.name} {self.local!r}>"
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _missing) is not _missing
+
+    def get(self, key: str, default: t.Any = None) -> t.Any:
+        value = self.local.get(key, _missing)
+        if value is _missing and self.disk is not None:
+            found, value, ttl = self.disk.get_item(key)
+            if found:
+                # Promoted entries keep the expiry they were written with
+                self.local.set(key, value, ttl=ttl)
+            else:
+                value = _missing
+        if value is _missing:
+            self.metrics.incr(f"cache.misses.{self.name}")
+            return default
+        self.metrics.incr(f"cache.hits.{self.name}")
+        return value
+
+    def set(self, key: str, value: t.Any, *, ttl: t.Optional[float] = None) -> None:
+        self.local.set(key, value, ttl=ttl)
+        if self.disk is None:
+            return
+        # The disk tier is best effort, the value stays cached in memory
+        try:
+            self.disk.set(key, value, ttl=self.ttl if ttl is None else ttl)
+        except (TypeError, ValueError, OSError) as exc:
+            self.log.warning(f"Cache {self.name} disk write failed: {exc}")
+
+    def delete(self, key: str) -> None:
+        self.local.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def clear(self) -> None:
+        self.local.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def get_or_set(
+        self,
+        key: str,
+        func: t.Callable[[], t.Any],
+        *,
+        ttl: t.Optional[float] = None,
+    ) -> t.Any:
+        value = self.get(key, _missing)
+        if value is not _missing:
+            return value
+
+        # Single flight, concurrent misses wait for the first caller
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._inflight[key] = _Flight()
+
+        if not leader:
+            flight.event.wait()
+            self.metrics.incr(f"cache.coalesced.{self.name}")
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = func()
+            self.set(key, flight.value, ttl=ttl)
+            return flight.value
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            flight.event.set()
+
+
+class TaskCache:
+    def __init__(self, store: t.Optional[Store] = None) -> None:
+        self.store = store
+        self._local: t.Dict[str, LRUCache] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.store!r}>"
+
+    def _get_local(self, task: Task) -> LRUCache:
+        with self._lock:
+            if task.path not in self._local:
+                policy = t.cast(CachePolicy, task.cache)
+                self._local[task.path] = LRUCache(policy.max_entries, ttl=policy.ttl)
+        return self._local[task.path]
+
+    @staticmethod
+    def get_key(task: Task, args: t.Sequence, kwargs: t.Dict[str, t.Any]) -> str:
+        payload = task.codec.encode([args, kwargs])
+        digest = hashlib.sha256(payload.encode()).hexdigest()
+        return f"seda:cache:{task.path}:{digest}"
+
+    def get(
+        self,
+        task: Task,
+        args: t.Sequence,
+        kwargs: t.Dict[str, t.Any],
+    ) -> t.Tuple[bool, t.Any]:
+        policy = t.cast(CachePolicy, task.cache)
+        key = self.get_key(task, args, kwargs)
+        local = self._get_local(task)
+
+        data = local.get(key)
+        if data is None and policy.shared and self.store is not None:
+            data = self.store.get(key)
+            if data is not None:
+                local.set(key, data)
+        if data is None:
+            return False, None
+        return True, task.codec.decode(data)
+
+    def set(
+        self,
+        task: Task,
+        args: t.Sequence,
+        kwargs: t.Dict[str, t.Any],
+        result: t.Any,
+    ) -> None:
+        policy = t.cast(CachePolicy, task.cache)
+        key = self.get_key(task, args, kwargs)
+        data = task.codec.encode(result)
+
+        self._get_local(task).set(key, data)
+        if policy.shared and self.store is not None:
+            self.store.set(key, data, ttl=policy.ttl)
+
+    def clear(self, task: t.Optional[Task] = None) -> None:
+        with self._lock:
+            caches = list(self._local.values())
+            if task is not None:
+                caches = [self._local[task.path]] if task.path in self._local else []
+        for cache in caches:
+            cache.clear()
@@ -1,28 +1,66 @@
 import logging
+import typing as t
 
 import click
 
-from seda import Seda, exceptions
+from seda import Seda, exceptions, types
 from seda.cli import options
+from seda.config import Lane
 
 logger = logging.getLogger("seda")
 
 
 def _deploy_sns_stack(app: Seda) -> None:
-    click.echo(f'Creating sns topic "{app.config.get_sns_topic_name()}"...')
-    app.create_sns_topic()
-
-    click.echo("Creating sns subscription...")
-    app.sns_subscribe()
+    for priority, lane in app.get_lanes().items():
+        topic_name = app.config.get_sns_topic_name(priority)
+        click.echo(f'Creating sns topic "{topic_name}"...')
+        app.create_sns_topic(priority)
+
+        for function_name in app.get_function_names():
+            _deploy_sns_subscription(app, priority, lane, function_name)
+
+
+def _deploy_sns_subscription(
+    app: Seda,
+    priority: types.TaskPriority,
+    lane: Lane,
+    function_name: str,
+) -> None:
+    if lane.queue:
+        queue_name = app.config.get_sqs_queue_name(priority, function_name)
+        click.echo(f'Creating sqs queue "{queue_name}"...')
+        try:
+            app.create_sqs_queue(priority, function_name=function_name)
+        except exceptions.AlreadyExistsError:
+            pass
+
+    click.echo(f'Creating sns subscription for "{function_name}"...')
+    app.sns_subscribe(priority, function_name=function_name)
+
+    if lane.queue:
+        click.echo("Creating sqs event source mapping...")
+        try:
+            app.create_event_source_mapping(priority, function_name=function_name)
+        except exceptions.AlreadyExistsError:
+            pass
+        return
 
     click.echo("Adding sns permission...")
     try:
-        app.add_sns_permission()
+        app.add_sns_permission(priority, function_name=function_name)
     except exceptions.AlreadyExistsError:
         pass
 
 
-def _deploy_scheduler_stack(app: Seda) -> None:
+def _deploy_fifo_stack(app: Seda) -> None:
+    if not app.has_ordered_tasks:
+        return
+
+    click.echo(f'Creating sns fifo topic "{app.config.get_fifo_topic_name()}"...')
+    app.create_fifo_stack()
+
+
+def _deploy_scheduler_stack(app: Seda, jitter: t.Optional[types.JitterMode]) -> None:
     try:
         app.delete_schedule_group()
     except exceptions.NotFound:
@@ -50,16 +88,54 @@ def _deploy_scheduler_stack(app: Seda) -> None:
         pass
 
     click.echo("Scheduling...")
-    for schedule in app.schedules:
+    for schedule in app.get_deploy_schedules(jitter):
         click.echo(f" - {repr(schedule)}")
         app.create_schedule(schedule)
 
 
+def _deploy_store(app: Seda, store: t.Optional[bool]) -> None:
+    if not (app.uses_store if store is None else store):
+        return
+
+    click.echo(f'Creating store table "{app.config.get_store_table_name()}"...')
+    try:
+        app.create_store_table()
+    except exceptions.AlreadyExistsError:
+        pass
+
+
+def _deploy_result_lifecycle(app: Seda) -> None:
+    if app.config.result_bucket is None:
+        return
+
+    click.echo(f'Expiring results in bucket "{app.config.result_bucket}"...')
+    try:
+        app.put_result_lifecycle()
+    except exceptions.NotFound:
+        logger.error(f'Result bucket "{app.config.result_bucket}" not found.')
+
+
 @click.command()
 @options.app()
 @options.function_name()
+@click.option(
+    "--jitter",
+    type=click.Choice(["off", "window", "offset"]),
+    default=None,
+    help="Spread schedules firing at peak times.",
+)
+@click.option(
+    "--store/--no-store",
+    default=None,
+    help="Create the store table, by default only when tasks use it.",
+)
 @click.pass_context
-def deploy(ctx: click.Context, app: Seda) -> None:
+def deploy(
+    ctx: click.Context,
+    app: Seda,
+    jitter: t.Optional[types.JitterMode],
+    store: t.Optional[bool],
+) -> None:
     """Deploy a SEDA application."""
     click.echo(f'Creating lambda policy "{app.config.get_function_policy_name()}"...')
     try:
@@ -70,5 +146,16 @@ def deploy(ctx: click.Context, app: Seda) -> None:
         logger.error(f'Lambda function "{app.config.function_name}" not found.')
         ctx.exit(1)
 
+    for function_name in app.get_function_names()[1:]:
+        click.echo(f'Creating lambda policy for "{function_name}"...')
+        try:
+            app.put_function_policy(function_name)
+        except exceptions.NotFound:
+            logger.error(f'Lambda function "{function_name}" not found.')
+            ctx.exit(1)
+
     _deploy_sns_stack(app)
-    _deploy_scheduler_stack(app)
+    _deploy_fifo_stack(app)
+    _deploy_scheduler_stack(app, jitter)
+    _deploy_store(app, store)
+    _deploy_result_lifecycle(app)
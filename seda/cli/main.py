@@ -7,6 +7,8 @@ from seda import __version__
 from seda.cli.cmd import python, shell
 from seda.cli.deploy import deploy
 from seda.cli.remove import remove
+from seda.cli.scheduler import scheduler
+from seda.cli.schedules import schedules
 
 
 def print_version(ctx: click.Context, param: click.Parameter, value: bool) -> None:
@@ -37,3 +39,5 @@ main.add_command(deploy)
 main.add_command(remove)
 main.add_command(shell)
 main.add_command(python)
+main.add_command(scheduler)
+main.add_command(schedules)
@@ -38,7 +38,7 @@ def app(required: bool = True) -> t.Callable:
             sys.path.insert(0, app_dir)
             try:
                 ctx.obj = get_app(path)
-            except exceptions.ImportPathError as exc:
+            except (exceptions.ImportPathError, exceptions.ExpressionError) as exc:
                 logger.error(f"App cannot be loaded. {exc}")
                 ctx.exit(1)
             return ctx.invoke(f, ctx.obj, *args, **kwargs)
@@ -2,24 +2,66 @@ import logging
 
 import click
 
-from seda import Seda, exceptions
+from seda import Seda, exceptions, types
 from seda.cli import callbacks, options
+from seda.config import Lane
 
 logger = logging.getLogger("seda")
 
 
 def _remove_sns_stack(app: Seda) -> None:
-    click.echo("Deleting sns permission...")
+    for priority, lane in app.config.lanes.items():
+        for function_name in app.get_function_names():
+            _remove_sns_subscription(app, priority, lane, function_name)
+
+        topic_name = app.config.get_sns_topic_name(priority)
+        click.echo(f'Deleting sns topic "{topic_name}"...')
+        try:
+            app.delete_sns_topic(priority)
+        except exceptions.NotFound:
+            pass
+
+
+def _remove_sns_subscription(
+    app: Seda,
+    priority: types.TaskPriority,
+    lane: Lane,
+    function_name: str,
+) -> None:
+    if not lane.queue:
+        click.echo(f'Deleting sns permission for "{function_name}"...')
+        try:
+            app.remove_sns_permission(priority, function_name=function_name)
+        except exceptions.NotFound:
+            pass
+        return
+
+    click.echo("Deleting sqs event source mapping...")
+    try:
+        app.delete_event_source_mapping(priority, function_name=function_name)
+    except exceptions.NotFound:
+        pass
+
+    queue_name = app.config.get_sqs_queue_name(priority, function_name)
+    click.echo(f'Deleting sqs queue "{queue_name}"...')
     try:
-        app.remove_sns_permission()
+        app.delete_sqs_queue(priority, function_name=function_name)
     except exceptions.NotFound:
         pass
 
-    click.echo(f'Deleting sns topic "{app.config.get_sns_topic_name()}"...')
+
+def _remove_fifo_stack(app: Seda) -> None:
+    if not app.has_ordered_tasks:
+        return
+
+    click.echo(f'Deleting sns fifo topic "{app.config.get_fifo_topic_name()}"...')
     try:
-        app.delete_sns_topic()
+        app.delete_fifo_stack()
     except exceptions.NotFound:
         pass
+    except ValueError as exc:
+        # The queue could not have been created with this name
+        logger.warning(str(exc))
 
 
 def _remove_scheduler_stack(app: Seda) -> None:
@@ -44,6 +86,14 @@ def _remove_scheduler_stack(app: Seda) -> None:
         pass
 
 
+def _remove_store(app: Seda) -> None:
+    click.echo(f'Deleting store table "{app.config.get_store_table_name()}"...')
+    try:
+        app.delete_store_table()
+    except exceptions.NotFound:
+        pass
+
+
 @click.command()
 @click.option(
     "--yes",
@@ -66,5 +116,14 @@ def remove(ctx: click.Context, app: Seda) -> None:
             logger.error(f'Lambda function "{app.config.function_name}" not found.')
             ctx.exit(1)
 
+    for function_name in app.get_function_names()[1:]:
+        click.echo(f'Deleting lambda policy for "{function_name}"...')
+        try:
+            app.delete_function_policy(function_name)
+        except exceptions.NotFound:
+            pass
+
     _remove_sns_stack(app)
+    _remove_fifo_stack(app)
     _remove_scheduler_stack(app)
+    _remove_store(app)
@@ -0,0 +1,42 @@
+import logging
+import typing as t
+
+import click
+
+from seda import Seda
+from seda.cli import options
+from seda.scheduler import FileLock, Scheduler
+
+logger = logging.getLogger("seda")
+
+
+@click.command()
+@options.app()
+@click.option(
+    "--workers",
+    type=int,
+    default=None,
+    help="Number of worker threads to run the schedules.",
+)
+@click.option(
+    "--lock-file",
+    default=None,
+    help="Lock file path for leader election between schedulers.",
+)
+@click.pass_context
+def scheduler(
+    ctx: click.Context,
+    app: Seda,
+    workers: t.Optional[int],
+    lock_file: t.Optional[str],
+) -> None:
+    """Run schedules in-process (worker mode)."""
+    lock = FileLock(lock_file) if lock_file else None
+    engine = Scheduler(app, workers=workers, lock=lock)
+    click.echo(f"Running {len(app.schedules)} schedules...")
+    for schedule in app.schedules:
+        click.echo(f" - {repr(schedule)}")
+    try:
+        engine.run()
+    except KeyboardInterrupt:
+        engine.stop()
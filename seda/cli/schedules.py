@@ -0,0 +1,88 @@
+import typing as t
+from datetime import datetime, timedelta, timezone
+
+import click
+
+from seda import Seda, analysis, types
+from seda.cli import options
+
+
+@click.group()
+def schedules() -> None:
+    """Inspect application schedules."""
+
+
+@schedules.command()
+@options.app()
+@click.option(
+    "--hours",
+    type=int,
+    default=24,
+    show_default=True,
+    help="Projection window in hours.",
+)
+@click.option(
+    "--bucket",
+    type=int,
+    default=60,
+    show_default=True,
+    help="Bucket size in seconds.",
+)
+@click.option(
+    "--threshold",
+    type=int,
+    default=None,
+    help="Invocations per bucket flagged as a peak [default: 2x mean].",
+)
+@click.option(
+    "--jitter",
+    type=click.Choice(["off", "window", "offset"]),
+    default=None,
+    help="Project the load after spreading peak schedules.",
+)
+@click.pass_context
+def analyze(
+    ctx: click.Context,
+    app: Seda,
+    hours: int,
+    bucket: int,
+    threshold: t.Optional[int],
+    jitter: t.Optional[types.JitterMode],
+) -> None:
+    """Project schedule invocations per time bucket and flag peaks."""
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    until = now + timedelta(hours=hours)
+    bucket_size = timedelta(seconds=bucket)
+    schedules = app.schedules
+
+    if jitter is not None and jitter != "off":
+        schedules = analysis.flatten_peaks(
+            schedules,
+            jitter,
+            max_minutes=app.config.schedule_jitter_minutes,
+            after=now,
+            until=until,
+            bucket=bucket_size,
+            threshold=threshold,
+        )
+
+    load = analysis.project_load(schedules, now, until, bucket_size)
+    total = sum(len(v) for v in load.values())
+    click.echo(
+        f"{len(schedules)} schedules, {total} invocations in {hours}h, "
+        f"max {max((len(v) for v in load.values()), default=0)} per {bucket}s."
+    )
+
+    peaks = analysis.find_peaks(load, threshold)
+    if not peaks:
+        click.echo("No peaks found.")
+        return
+
+    click.echo(f"{len(peaks)} peaks:")
+    for peak, count in peaks[:20]:
+        paths = sorted({schedule.path for schedule in load[peak]})
+        if len(paths) > 5:
+            paths = paths[:5] + [f"+{len(paths) - 5} more"]
+        click.echo(f" - {peak.isoformat()} {count} invocations: {', '.join(paths)}")
+    if len(peaks) > 20:
+        click.echo(f"   ... {len(peaks) - 20} more")
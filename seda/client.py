@@ -1,14 +1,40 @@
 import base64
 import json
 import sys
+import threading
+import time
 import typing as t
 from datetime import datetime
 
-from botocore.client import BaseClient
+from botocore.client import BaseClient, Config
+from botocore.exceptions import ClientError
 
 from seda import exceptions, types
+from seda.breaker import BreakerPolicy, CircuitBreaker
+from seda.metrics import Metrics
 from seda.session import Session
 
+TRANSIENT_ERROR_CODES = {
+    "InternalError",
+    "InternalFailure",
+    "KMSThrottling",
+    "ServiceUnavailable",
+    "Throttled",
+    "Throttling",
+    "ThrottlingException",
+    "TooManyRequestsException",
+}
+
+
+def get_message_attributes(
+    attributes: t.Dict[str, str],
+) -> t.Dict[str, t.Dict[str, str]]:
+    return {
+        name: {"DataType": "String", "StringValue": value}
+        for name, value in attributes.items()
+    }
+
+
 if sys.version_info < (3, 8):  # pragma: no cover
     from typing_extensions import Literal
 else:  # pragma: no cover
@@ -17,16 +43,99 @@ else:  # pragma: no cover
 
 DEFAULT_RETRY_DELAY = 2
 
+# Clients are cached per read timeout, so deadlines are floored to a few
+# buckets instead of creating a client for every remaining time
+TIMEOUT_BUCKETS = (1, 2, 5, 10, 30, 60, 120, 300, 900)
+
+
+def get_timeout_bucket(timeout: float) -> int:
+    return max(
+        (bucket for bucket in TIMEOUT_BUCKETS if bucket <= timeout),
+        default=TIMEOUT_BUCKETS[0],
+    )
+
 
 class Client:
-    def __init__(self, session: Session) -> None:
-        self._client_cache: t.Dict[str, BaseClient] = {}
+    def __init__(
+        self,
+        session: Session,
+        *,
+        breaker: t.Optional[BreakerPolicy] = None,
+        metrics: t.Optional[Metrics] = None,
+    ) -> None:
+        self._client_cache: t.Dict[t.Tuple[str, t.Optional[int]], BaseClient] = {}
         self.session = session
+        self.breaker = breaker
+        self.metrics = metrics or Metrics()
+        self.breakers: t.Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
 
-    def client(self, service_name: str) -> BaseClient:
-        if service_name not in self._client_cache:
-            self._client_cache[service_name] = self.session.client(service_name)
-        return self._client_cache[service_name]
+    def client(
+        self,
+        service_name: str,
+        *,
+        timeout: t.Optional[float] = None,
+    ) -> BaseClient:
+        bucket = None if timeout is None else get_timeout_bucket(timeout)
+        key = (service_name, bucket)
+
+        if key not in self._client_cache:
+            config = None
+            if bucket is not None:
+                config = Config(
+                    read_timeout=bucket,
+                    retries={"total_max_attempts": 1},
+                )
+            client = self.session.client(service_name, config)
+            if self.breaker is not None:
+                events = client.meta.events
+                events.register("before-call", self._before_call)
+                events.register("after-call", self._after_call)
+                events.register("after-call-error", self._after_call_error)
+            self._client_cache[key] = client
+        return self._client_cache[key]
+
+    def get_breaker(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            if name not in self.breakers:
+                self.breakers[name] = CircuitBreaker(
+                    name,
+                    t.cast(BreakerPolicy, self.breaker),
+                    metrics=self.metrics,
+                )
+            return self.breakers[name]
+
+    def _before_call(
+        self,
+        model: t.Any,
+        context: t.Dict[str, t.Any],
+        **kwargs: t.Any,
+    ) -> None:
+        breaker = self.get_breaker(f"{model.service_model.service_name}.{model.name}")
+        breaker.before()
+        context["seda_breaker"] = (breaker, time.monotonic())
+
+    def _after_call(
+        self,
+        http_response: t.Any,
+        parsed: t.Dict[str, t.Any],
+        context: t.Dict[str, t.Any],
+        **kwargs: t.Any,
+    ) -> None:
+        # Client errors such as missing resources say nothing about the service
+        code = parsed.get("Error", {}).get("Code")
+        status = http_response.status_code
+        failed = status >= 500 or status == 429 or code in TRANSIENT_ERROR_CODES
+        self._record(context, failed=failed)
+
+    def _after_call_error(self, context: t.Dict[str, t.Any], **kwargs: t.Any) -> None:
+        self._record(context, failed=True)
+
+    def _record(self, context: t.Dict[str, t.Any], *, failed: bool) -> None:
+        if "seda_breaker" not in context:
+            return
+        breaker, started = context.pop("seda_breaker")
+        breaker.record(time.monotonic() - started, failed=failed)
 
     def get_identity(self) -> types.IdentityResponse:
         return self.client("sts").get_caller_identity()
@@ -109,22 +218,28 @@ class Client:
             "Event", "RequestResponse", "DryRun"
         ] = "RequestResponse",
         client_context: t.Optional[t.Dict[str, t.Any]] = None,
-        payload: t.Optional[t.Dict[str, t.Any]] = None,
+        payload: t.Optional[t.Union[str, t.Dict[str, t.Any]]] = None,
         log_type: t.Optional[Literal["Tail"]] = "Tail",
         qualifier: str = "$LATEST",
+        timeout: t.Optional[float] = None,
     ) -> types.InvokeFunctionResponse:
-        client = self.client("lambda")
+        client = self.client("lambda", timeout=timeout)
+        data: t.Dict[str, t.Any] = {
+            "FunctionName": name,
+            "InvocationType": invocation_type,
+            "Payload": (
+                payload if isinstance(payload, str) else json.dumps(payload or {})
+            ),
+            "Qualifier": qualifier,
+        }
+        if client_context is not None:
+            data["ClientContext"] = base64.b64encode(
+                json.dumps(client_context).encode()
+            ).decode()
+        if log_type is not None:
+            data["LogType"] = log_type
         try:
-            return client.invoke(
-                FunctionName=name,
-                InvocationType=invocation_type,
-                ClientContext=base64.b64encode(
-                    json.dumps(client_context or {}).encode()
-                ).decode(),
-                Payload=json.dumps(payload or {}),
-                LogType=log_type,
-                Qualifier=qualifier,
-            )
+            return client.invoke(**data)
         except client.exceptions.ResourceNotFoundException as exc:
             raise exceptions.NotFound(exc)
 
@@ -265,10 +380,14 @@ class Client:
         except client.exceptions.ResourceNotFoundException as exc:
             raise exceptions.NotFound(exc)
 
-    def create_sns_topic(self, name: str) -> types.CreateSNSTopicResponse:
+    def create_sns_topic(
+        self,
+        name: str,
+        attributes: t.Optional[t.Dict[str, str]] = None,
+    ) -> types.CreateSNSTopicResponse:
         client = self.client("sns")
         try:
-            return client.create_topic(Name=name)
+            return client.create_topic(Name=name, Attributes=attributes or {})
         except client.exceptions.ConflictException as exc:
             raise exceptions.AlreadyExistsError(exc)
 
@@ -285,13 +404,17 @@ class Client:
         *,
         protocol: types.SubscriptionProtocol,
         endpoint: str,
+        attributes: t.Optional[t.Dict[str, str]] = None,
     ) -> types.CreateSubscriptionResponse:
         client = self.client("sns")
-        return client.subscribe(
-            TopicArn=topic_arn,
-            Protocol=protocol,
-            Endpoint=endpoint,
-        )
+        data: t.Dict[str, t.Any] = {
+            "TopicArn": topic_arn,
+            "Protocol": protocol,
+            "Endpoint": endpoint,
+        }
+        if attributes:
+            data["Attributes"] = attributes
+        return client.subscribe(**data)
 
     def list_subscriptions_by_topic(
         self,
@@ -303,6 +426,19 @@ class Client:
         except client.exceptions.NotFoundException as exc:
             raise exceptions.NotFound(exc)
 
+    def sns_set_subscription_attributes(
+        self,
+        subscription_arn: str,
+        name: str,
+        value: str,
+    ) -> types.Response:
+        client = self.client("sns")
+        return client.set_subscription_attributes(
+            SubscriptionArn=subscription_arn,
+            AttributeName=name,
+            AttributeValue=value,
+        )
+
     def sns_unsubscribe(self, subscription_arn: str) -> types.Response:
         client = self.client("sns")
         return client.unsubscribe(SubscriptionArn=subscription_arn)
@@ -310,7 +446,292 @@ class Client:
     def sns_publish(
         self,
         target_arn: str,
-        message: t.Dict[str, t.Any],
+        message: t.Union[str, t.Dict[str, t.Any]],
+        *,
+        group_id: t.Optional[str] = None,
+        attributes: t.Optional[t.Dict[str, str]] = None,
     ) -> types.SNSPublishResponse:
         client = self.client("sns")
-        return client.publish(TargetArn=target_arn, Message=json.dumps(message))
+        if not isinstance(message, str):
+            message = json.dumps(message)
+        data: t.Dict[str, t.Any] = {"TargetArn": target_arn, "Message": message}
+        if group_id is not None:
+            data["MessageGroupId"] = group_id
+        if attributes:
+            data["MessageAttributes"] = get_message_attributes(attributes)
+        return client.publish(**data)
+
+    def sns_publish_batch(
+        self,
+        topic_arn: str,
+        entries: t.Sequence[t.Dict[str, t.Any]],
+    ) -> types.SNSPublishBatchResponse:
+        client = self.client("sns")
+        return client.publish_batch(
+            TopicArn=topic_arn,
+            PublishBatchRequestEntries=list(entries),
+        )
+
+    def create_dynamodb_table(
+        self,
+        name: str,
+        *,
+        key: str = "pk",
+        ttl_attribute: t.Optional[str] = "ttl",
+    ) -> types.CreateDynamoDBTableResponse:
+        client = self.client("dynamodb")
+        try:
+            response = client.create_table(
+                TableName=name,
+                AttributeDefinitions=[{"AttributeName": key, "AttributeType": "S"}],
+                KeySchema=[{"AttributeName": key, "KeyType": "HASH"}],
+                BillingMode="PAY_PER_REQUEST",
+            )
+        except client.exceptions.ResourceInUseException as exc:
+            raise exceptions.AlreadyExistsError(exc)
+
+        if ttl_attribute is not None:
+            client.get_waiter("table_exists").wait(TableName=name)
+            client.update_time_to_live(
+                TableName=name,
+                TimeToLiveSpecification={
+                    "Enabled": True,
+                    "AttributeName": ttl_attribute,
+                },
+            )
+        return response
+
+    def delete_dynamodb_table(self, name: str) -> types.Response:
+        client = self.client("dynamodb")
+        try:
+            return client.delete_table(TableName=name)
+        except client.exceptions.ResourceNotFoundException as exc:
+            raise exceptions.NotFound(exc)
+
+    def dynamodb_get_item(
+        self,
+        table_name: str,
+        key: types.DynamoDBItem,
+        *,
+        consistent: bool = True,
+    ) -> t.Optional[types.DynamoDBItem]:
+        client = self.client("dynamodb")
+        try:
+            response = client.get_item(
+                TableName=table_name,
+                Key=key,
+                ConsistentRead=consistent,
+            )
+        except client.exceptions.ResourceNotFoundException as exc:
+            raise exceptions.NotFound(exc)
+        return response.get("Item")
+
+    def dynamodb_batch_get_items(
+        self,
+        table_name: str,
+        keys: t.Sequence[types.DynamoDBItem],
+        *,
+        consistent: bool = True,
+    ) -> t.List[types.DynamoDBItem]:
+        client = self.client("dynamodb")
+        items: t.List[types.DynamoDBItem] = []
+        delay = 0.05
+
+        # BatchGetItem takes up to 100 keys and may leave some unprocessed
+        for idx in range(0, len(keys), 100):
+            chunk = list(keys[idx:][:100])
+            request = {
+                table_name: {
+                    "Keys": chunk,
+                    "ConsistentRead": consistent,
+                }
+            }
+            while request:
+                try:
+                    response = client.batch_get_item(RequestItems=request)
+                except client.exceptions.ResourceNotFoundException as exc:
+                    raise exceptions.NotFound(exc)
+                items.extend(response["Responses"].get(table_name, ()))
+                request = response.get("UnprocessedKeys") or {}
+                if request:
+                    time.sleep(delay)
+                    delay = min(delay * 2, 1)
+        return items
+
+    def dynamodb_put_item(
+        self,
+        table_name: str,
+        item: types.DynamoDBItem,
+        *,
+        condition: t.Optional[str] = None,
+        names: t.Optional[t.Dict[str, str]] = None,
+        values: t.Optional[types.DynamoDBItem] = None,
+    ) -> types.Response:
+        client = self.client("dynamodb")
+        data: t.Dict[str, t.Any] = {"TableName": table_name, "Item": item}
+        if condition is not None:
+            data["ConditionExpression"] = condition
+        if names:
+            data["ExpressionAttributeNames"] = names
+        if values:
+            data["ExpressionAttributeValues"] = values
+        try:
+            return client.put_item(**data)
+        except client.exceptions.ConditionalCheckFailedException as exc:
+            raise exceptions.ConditionFailed(exc)
+        except client.exceptions.ResourceNotFoundException as exc:
+            raise exceptions.NotFound(exc)
+
+    def dynamodb_update_item(
+        self,
+        table_name: str,
+        key: types.DynamoDBItem,
+        *,
+        update: str,
+        names: t.Optional[t.Dict[str, str]] = None,
+        values: t.Optional[types.DynamoDBItem] = None,
+        condition: t.Optional[str] = None,
+    ) -> types.DynamoDBItem:
+        client = self.client("dynamodb")
+        data: t.Dict[str, t.Any] = {
+            "TableName": table_name,
+            "Key": key,
+            "UpdateExpression": update,
+            "ReturnValues": "ALL_NEW",
+        }
+        if condition is not None:
+            data["ConditionExpression"] = condition
+        if names:
+            data["ExpressionAttributeNames"] = names
+        if values:
+            data["ExpressionAttributeValues"] = values
+        try:
+            return client.update_item(**data)["Attributes"]
+        except client.exceptions.ConditionalCheckFailedException as exc:
+            raise exceptions.ConditionFailed(exc)
+        except client.exceptions.ResourceNotFoundException as exc:
+            raise exceptions.NotFound(exc)
+
+    def dynamodb_delete_item(
+        self,
+        table_name: str,
+        key: types.DynamoDBItem,
+    ) -> types.Response:
+        client = self.client("dynamodb")
+        try:
+            return client.delete_item(TableName=table_name, Key=key)
+        except client.exceptions.ResourceNotFoundException as exc:
+            raise exceptions.NotFound(exc)
+
+    def s3_put_object(
+        self, bucket: str, key: str, body: t.Union[str, bytes]
+    ) -> types.Response:
+        client = self.client("s3")
+        try:
+            return client.put_object(Bucket=bucket, Key=key, Body=body)
+        except client.exceptions.NoSuchBucket as exc:
+            raise exceptions.NotFound(exc)
+
+    def s3_get_bucket_lifecycle_rules(self, bucket: str) -> t.List[t.Dict[str, t.Any]]:
+        client = self.client("s3")
+        try:
+            return client.get_bucket_lifecycle_configuration(Bucket=bucket)["Rules"]
+        except client.exceptions.NoSuchBucket as exc:
+            raise exceptions.NotFound(exc)
+        except ClientError as exc:
+            if exc.response["Error"]["Code"] == "NoSuchLifecycleConfiguration":
+                return []
+            raise
+
+    def s3_put_bucket_lifecycle_rules(
+        self,
+        bucket: str,
+        rules: t.List[t.Dict[str, t.Any]],
+    ) -> types.Response:
+        client = self.client("s3")
+        try:
+            return client.put_bucket_lifecycle_configuration(
+                Bucket=bucket,
+                LifecycleConfiguration={"Rules": rules},
+            )
+        except client.exceptions.NoSuchBucket as exc:
+            raise exceptions.NotFound(exc)
+
+    def s3_get_object(self, bucket: str, key: str) -> bytes:
+        client = self.client("s3")
+        try:
+            return client.get_object(Bucket=bucket, Key=key)["Body"].read()
+        except (client.exceptions.NoSuchBucket, client.exceptions.NoSuchKey) as exc:
+            raise exceptions.NotFound(exc)
+
+    def create_sqs_queue(
+        self,
+        name: str,
+        attributes: t.Optional[t.Dict[str, str]] = None,
+    ) -> types.CreateSQSQueueResponse:
+        client = self.client("sqs")
+        try:
+            return client.create_queue(QueueName=name, Attributes=attributes or {})
+        except client.exceptions.QueueNameExists as exc:
+            raise exceptions.AlreadyExistsError(exc)
+
+    def get_sqs_queue_url(self, name: str) -> str:
+        client = self.client("sqs")
+        try:
+            return client.get_queue_url(QueueName=name)["QueueUrl"]
+        except client.exceptions.QueueDoesNotExist as exc:
+            raise exceptions.NotFound(exc)
+
+    def delete_sqs_queue(self, queue_url: str) -> types.Response:
+        client = self.client("sqs")
+        try:
+            return client.delete_queue(QueueUrl=queue_url)
+        except client.exceptions.QueueDoesNotExist as exc:
+            raise exceptions.NotFound(exc)
+
+    def create_event_source_mapping(
+        self,
+        function_name: str,
+        event_source_arn: str,
+        *,
+        batch_size: int = 10,
+        batch_window: int = 0,
+        max_concurrency: t.Optional[int] = None,
+    ) -> types.EventSourceMapping:
+        client = self.client("lambda")
+        data: t.Dict[str, t.Any] = {
+            "FunctionName": function_name,
+            "EventSourceArn": event_source_arn,
+            "BatchSize": batch_size,
+            "MaximumBatchingWindowInSeconds": batch_window,
+            "FunctionResponseTypes": ["ReportBatchItemFailures"],
+        }
+        if max_concurrency is not None:
+            data["ScalingConfig"] = {"MaximumConcurrency": max_concurrency}
+        try:
+            return client.create_event_source_mapping(**data)
+        except client.exceptions.ResourceConflictException as exc:
+            raise exceptions.AlreadyExistsError(exc)
+        except client.exceptions.ResourceNotFoundException as exc:
+            raise exceptions.NotFound(exc)
+
+    def list_event_source_mappings(
+        self,
+        function_name: str,
+        event_source_arn: str,
+    ) -> types.ListEventSourceMappingsResponse:
+        client = self.client("lambda")
+        try:
+            return client.list_event_source_mappings(
+                FunctionName=function_name,
+                EventSourceArn=event_source_arn,
+            )
+        except client.exceptions.ResourceNotFoundException as exc:
+            raise exceptions.NotFound(exc)
+
+    def delete_event_source_mapping(self, uuid: str) -> types.Response:
+        client = self.client("lambda")
+        try:
+            return client.delete_event_source_mapping(UUID=uuid)
+        except client.exceptions.ResourceNotFoundException as exc:
+            raise exceptions.NotFound(exc)
@@ -0,0 +1,39 @@
+import json
+import typing as t
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+
+
+class Codec:
+    def encode(self, obj: t.Any) -> str:
+        raise NotImplementedError
+
+    def decode(self, data: t.Union[str, bytes]) -> t.Any:
+        raise NotImplementedError
+
+
+class JSONCodec(Codec):
+    def __init__(self, encoder: t.Optional[t.Type[json.JSONEncoder]] = None) -> None:
+        self.encoder = encoder
+
+    @staticmethod
+    def default(obj: t.Any) -> t.Any:
+        if isinstance(obj, (datetime, date, time)):
+            return obj.isoformat()
+        if isinstance(obj, (Decimal, uuid.UUID)):
+            return str(obj)
+        if isinstance(obj, (set, frozenset)):
+            return list(obj)
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    def encode(self, obj: t.Any) -> str:
+        if self.encoder is not None:
+            return json.dumps(obj, cls=self.encoder, separators=(",", ":"))
+        return json.dumps(obj, default=self.default, separators=(",", ":"))
+
+    def decode(self, data: t.Union[str, bytes]) -> t.Any:
+        return json.loads(data)
+
+
+default_codec = JSONCodec()
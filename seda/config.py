@@ -15,6 +15,7 @@ except ImportError:  # pragma: nocover
     mangum = None  # type: ignore[assignment]
 
 from seda import types
+from seda.breaker import BreakerPolicy
 from seda.logging import LOGGING_CONFIG
 from seda.session import Session
 from seda.tasks import Schedule
@@ -25,6 +26,45 @@ SCHEDULE_GROUP_NAME = "seda-f-$function_name"
 SCHEDULE_NAME = "$path-$uid"
 SCHEDULE_ROLE_NAME = "seda-schedule-$region-f-$function_name"
 SNS_TOPIC_NAME = "seda-async-f-$function_name"
+STORE_TABLE_NAME = "seda-store-f-$function_name"
+OUTBOX_PATH = "/tmp/seda-outbox-f-$function_name.db"
+MAX_QUEUE_NAME_LENGTH = 80
+
+
+class Lane:
+    def __init__(
+        self,
+        *,
+        queue: bool = False,
+        batch_size: int = 10,
+        batch_window: int = 0,
+        max_concurrency: t.Optional[int] = None,
+    ) -> None:
+        self.queue = queue
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.max_concurrency = max_concurrency
+
+    def __repr__(self) -> str:
+        transport = "sqs" if self.queue else "sns"
+        return f"<{self.__class__.__name__} {transport}>"
+
+
+# Bulk work is buffered in a queue with capped concurrency
+DEFAULT_LANES: t.Dict[types.TaskPriority, Lane] = {
+    "high": Lane(),
+    "default": Lane(),
+    "bulk": Lane(queue=True, batch_size=10, batch_window=5, max_concurrency=5),
+}
+
+
+def _check_queue_name(name: str) -> str:
+    if len(name) > MAX_QUEUE_NAME_LENGTH:
+        raise ValueError(
+            f'SQS queue name "{name}" is longer than {MAX_QUEUE_NAME_LENGTH} '
+            "characters, use a shorter sns_topic_name."
+        )
+    return name
 
 
 class Config:
@@ -41,6 +81,19 @@ class Config:
         schedule_name: str = SCHEDULE_NAME,
         schedule_role_name: str = SCHEDULE_ROLE_NAME,
         sns_topic_name: str = SNS_TOPIC_NAME,
+        store_table_name: str = STORE_TABLE_NAME,
+        result_ttl: float = 24 * 3600,
+        result_bucket: t.Optional[str] = None,
+        max_attempts: int = 3,
+        idempotency_ttl: float = 24 * 3600,
+        deadline_margin: float = 2.0,
+        schedule_jitter: types.JitterMode = "off",
+        schedule_jitter_minutes: int = 15,
+        lanes: t.Optional[t.Dict[types.TaskPriority, Lane]] = None,
+        fifo_lane: t.Optional[Lane] = None,
+        outbox: t.Optional[types.OutboxMode] = None,
+        outbox_path: str = OUTBOX_PATH,
+        breaker: t.Optional[BreakerPolicy] = None,
         region: t.Optional[str] = None,
         profile: t.Optional[str] = None,
         access_key_id: t.Optional[str] = None,
@@ -65,6 +118,20 @@ class Config:
         self.schedule_name = Template(schedule_name)
         self.schedule_role_name = Template(schedule_role_name)
         self.sns_topic_name = Template(sns_topic_name)
+        self.store_table_name = Template(store_table_name)
+        self.result_ttl = result_ttl
+        self.result_bucket = result_bucket
+        self.max_attempts = max_attempts
+        self.idempotency_ttl = idempotency_ttl
+        self.deadline_margin = deadline_margin
+        self.schedule_jitter = schedule_jitter
+        self.schedule_jitter_minutes = schedule_jitter_minutes
+        self.lanes = {**DEFAULT_LANES, **(lanes or {})}
+        self.configured_lanes = set(lanes or {})
+        self.fifo_lane = fifo_lane or Lane(queue=True, batch_size=10)
+        self.outbox = outbox
+        self.outbox_path = Template(outbox_path)
+        self.breaker = breaker
         self._account_id: t.Optional[str] = None
         self.lifespan = lifespan if django is not None else "off"
 
@@ -129,8 +196,32 @@ class Config:
             uid=get_uid(),
         )
 
-    def get_sns_topic_name(self) -> str:
-        return self.sns_topic_name.substitute(function_name=self.function_name)
+    def get_sns_topic_name(self, priority: types.TaskPriority = "default") -> str:
+        name = self.sns_topic_name.substitute(function_name=self.function_name)
+        return name if priority == "default" else f"{name}-{priority}"
+
+    def get_sqs_queue_name(
+        self,
+        priority: types.TaskPriority,
+        function_name: t.Optional[str] = None,
+    ) -> str:
+        name = self.get_sns_topic_name(priority)
+        if function_name is not None and function_name != self.function_name:
+            name += f"-{function_name}"
+        return _check_queue_name(f"{name}-queue")
+
+    def get_fifo_topic_name(self) -> str:
+        return f"{self.get_sns_topic_name()}-ordered.fifo"
+
+    def get_fifo_queue_name(self) -> str:
+        return _check_queue_name(f"{self.get_sns_topic_name()}-ordered-queue.fifo")
+
+    def get_outbox_path(self) -> str:
+        return self.outbox_path.substitute(function_name=self.function_name)
+
+    def get_store_table_name(self) -> str:
+        return self.store_table_name.substitute(function_name=self.function_name)
 
-    def get_sns_statement_id(self) -> str:
-        return f"seda-f-{self.function_name}-permission-sns"
+    def get_sns_statement_id(self, priority: types.TaskPriority = "default") -> str:
+        statement_id = f"seda-f-{self.function_name}-permission-sns"
+        return statement_id if priority == "default" else f"{statement_id}-{priority}"
@@ -0,0 +1,123 @@
+import contextvars
+import time
+import typing as t
+
+from seda import types
+from seda.tasks import Task
+
+if t.TYPE_CHECKING:
+    from seda.app import Seda
+    from seda.executors import Executor
+
+_current_task: "contextvars.ContextVar[TaskContext]" = contextvars.ContextVar(
+    "seda_task"
+)
+_unset: t.Any = object()
+
+
+class TaskContext:
+    def __init__(
+        self,
+        task: Task,
+        data: types.EventTask,
+        *,
+        app: t.Optional["Seda"] = None,
+        lambda_context: t.Optional[types.LambdaContext] = None,
+        margin: float = 0,
+    ) -> None:
+        self.task = task
+        self.data = data
+        self.app = app
+        self.lambda_context = lambda_context
+        self.margin = margin
+        self.cursor = data.get("cursor")
+        self.checkpoint_cursor: t.Any = _unset
+        self.checkpoints = 0
+        self.item_cost = 0.0
+        self.deadline: t.Optional[float] = None
+        self.continued = False
+        self._last_checkpoint = time.monotonic()
+
+        if lambda_context is not None:
+            remaining = lambda_context.get_remaining_time_in_millis() / 1000
+            self.deadline = time.monotonic() + remaining
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.task.path} cursor={self.cursor!r}>"
+
+    @property
+    def remaining(self) -> t.Optional[float]:
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    @property
+    def time_left(self) -> t.Optional[float]:
+        remaining = self.remaining
+        return None if remaining is None else max(remaining - self.margin, 0)
+
+    @property
+    def has_checkpoint(self) -> bool:
+        return self.checkpoint_cursor is not _unset
+
+    @property
+    def should_continue(self) -> bool:
+        time_left = self.time_left
+        return time_left is not None and time_left < self.item_cost
+
+    @property
+    def executor(self) -> t.Optional["Executor"]:
+        if self.app is None or self.task.executor is None:
+            return None
+        return self.app.get_executor(self.task.executor, self.task.workers)
+
+    @property
+    def args(self) -> t.Sequence:
+        if "batch" in self.data:
+            return ([tuple(args) for args in self.data["batch"]],)
+        return self.data.get("args") or ()
+
+    @property
+    def kwargs(self) -> t.Dict[str, t.Any]:
+        return self.data.get("kwargs") or {}
+
+    def call(self) -> t.Any:
+        return self.task.func(*self.args, **self.kwargs)
+
+    def checkpoint(self, cursor: t.Any) -> None:
+        now = time.monotonic()
+        cost = now - self._last_checkpoint
+        self._last_checkpoint = now
+        self.checkpoints += 1
+        self.checkpoint_cursor = cursor
+        # Projected cost of the next item, biased towards the slowest one seen
+        self.item_cost = max(cost, self.item_cost * 0.9)
+
+        if self.app is not None:
+            self.app.metrics.observe(f"task.item.{self.task.path}", cost)
+
+    def continue_with(self, cursor: t.Any = _unset) -> t.Any:
+        if self.app is None:
+            raise RuntimeError(f"{self.task!r} cannot be continued without an app.")
+        if cursor is _unset:
+            cursor = self.checkpoint_cursor
+
+        data = types.EventTask(
+            path=self.data["path"],
+            args=self.data.get("args"),
+            kwargs=self.data.get("kwargs"),
+            cursor=cursor,
+        )
+        for key in ("batch", "chain", "chord", "result_id"):
+            if key in self.data:
+                data[key] = self.data[key]  # type: ignore[literal-required]
+        self.continued = True
+        # Continuations carry on admitted work and skip the rate limits
+        return self.app.continue_task(self.task, data, throttle=False)
+
+
+def current_task() -> TaskContext:
+    try:
+        return _current_task.get()
+    except LookupError:
+        raise RuntimeError("No task is running in this context.")
@@ -1,3 +1,7 @@
+import builtins
+import functools
+import typing as t
+
 from botocore.exceptions import BotoCoreError
 
 
@@ -27,5 +31,67 @@ class ValidationError(AWSError):
     pass
 
 
+class ConditionFailed(AWSError):
+    pass
+
+
 class ImportPathError(Exception):
     pass
+
+
+class RemoteError(Exception):
+    def __init__(
+        self,
+        msg: str,
+        *,
+        error_type: str = "Exception",
+        traceback: t.Sequence[str] = (),
+    ) -> None:
+        self.msg = msg
+        self.error_type = error_type
+        self.traceback = "".join(traceback)
+        super().__init__(msg)
+
+    def __str__(self) -> str:
+        if not self.traceback:
+            return self.msg
+        return f"{self.msg}\n\nRemote traceback:\n{self.traceback}"
+
+    @classmethod
+    def from_payload(cls, payload: t.Dict[str, t.Any]) -> "RemoteError":
+        error_type = payload.get("errorType", "Exception")
+        msg = payload.get("errorMessage", "")
+        traceback = payload.get("stackTrace") or ()
+        try:
+            return _remote_error_class(error_type)(
+                msg,
+                error_type=error_type,
+                traceback=traceback,
+            )
+        except TypeError:
+            return cls(msg, error_type=error_type, traceback=traceback)
+
+
+@functools.lru_cache(maxsize=None)
+def _remote_error_class(error_type: str) -> t.Type[RemoteError]:
+    builtin = getattr(builtins, error_type, None)
+
+    if isinstance(builtin, type) and issubclass(builtin, Exception):
+        return type(error_type, (RemoteError, builtin), {})
+    return RemoteError
+
+
+class ExpressionError(ValueError):
+    pass
+
+
+class RateLimitExceeded(TimeoutError):
+    pass
+
+
+class CircuitOpen(Exception):
+    pass
+
+
+class ResultTooLarge(ValueError):
+    pass
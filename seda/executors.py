@@ -0,0 +1,313 @@
+import asyncio
+import collections
+import contextvars
+import functools
+import multiprocessing
+import os
+import pickle
+import threading
+import traceback
+import typing as t
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from multiprocessing.connection import Connection, wait
+
+import anyio
+
+from seda.exceptions import RemoteError
+from seda.tasks import Task
+
+
+class Executor:
+    def run(self, task: Task, args: t.Sequence, kwargs: t.Dict[str, t.Any]) -> t.Any:
+        raise NotImplementedError
+
+    def map(self, task: Task, items: t.Iterable) -> t.List[t.Any]:
+        return [self.run(task, (item,), {}) for item in items]
+
+    async def arun(
+        self,
+        task: Task,
+        args: t.Sequence,
+        kwargs: t.Dict[str, t.Any],
+    ) -> t.Any:
+        partial = functools.partial(self.run, task, args, kwargs)
+        return await anyio.to_thread.run_sync(partial)
+
+    async def amap(self, task: Task, items: t.Iterable) -> t.List[t.Any]:
+        partial = functools.partial(self.map, task, items)
+        return await anyio.to_thread.run_sync(partial)
+
+    def shutdown(self) -> None:
+        pass
+
+
+def call(task: Task, args: t.Sequence, kwargs: t.Dict[str, t.Any]) -> t.Any:
+    if task.is_async:
+        return anyio.run(functools.partial(task.func, *args, **kwargs))
+    return task.func(*args, **kwargs)
+
+
+class Gate:
+    # Queues calls beyond the limit instead of blocking pool threads
+    def __init__(self, pool: ThreadPoolExecutor, limit: int) -> None:
+        self.pool = pool
+        self.limit = limit
+        self.running = 0
+        self._pending: t.Deque[t.Tuple[t.Callable, Future]] = collections.deque()
+        self._lock = threading.Lock()
+
+    def submit(self, fn: t.Callable) -> Future:
+        future: Future = Future()
+        with self._lock:
+            if self.running >= self.limit:
+                self._pending.append((fn, future))
+                return future
+            self.running += 1
+        self._start(fn, future)
+        return future
+
+    def _start(self, fn: t.Callable, future: Future) -> None:
+        if not future.set_running_or_notify_cancel():
+            return self._release()
+        inner = self.pool.submit(fn)
+        inner.add_done_callback(lambda f: self._done(f, future))
+
+    def _done(self, inner: Future, future: Future) -> None:
+        try:
+            # The outer future is already running and can no longer be cancelled
+            if inner.cancelled():
+                future.set_exception(CancelledError())
+            elif inner.exception() is None:
+                future.set_result(inner.result())
+            else:
+                future.set_exception(inner.exception())
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        with self._lock:
+            if not self._pending:
+                self.running -= 1
+                return
+            fn, future = self._pending.popleft()
+        self._start(fn, future)
+
+
+class ThreadExecutor(Executor):
+    def __init__(self, workers: t.Optional[int] = None) -> None:
+        self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="seda-executor",
+        )
+        self._gates: t.Dict[str, Gate] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} workers={self.workers}>"
+
+    def submit(
+        self,
+        fn: t.Callable,
+        *,
+        key: t.Optional[str] = None,
+        limit: t.Optional[int] = None,
+    ) -> Future:
+        fn = functools.partial(contextvars.copy_context().run, fn)
+        if key is None or limit is None:
+            return self._pool.submit(fn)
+
+        with self._lock:
+            if key not in self._gates:
+                self._gates[key] = Gate(self._pool, limit)
+        return self._gates[key].submit(fn)
+
+    def submit_task(
+        self,
+        task: Task,
+        args: t.Sequence,
+        kwargs: t.Dict[str, t.Any],
+    ) -> Future:
+        return self.submit(
+            functools.partial(call, task, args, kwargs),
+            key=task.path,
+            limit=task.max_concurrency,
+        )
+
+    def run(self, task: Task, args: t.Sequence, kwargs: t.Dict[str, t.Any]) -> t.Any:
+        return self.submit_task(task, args, kwargs).result()
+
+    def map(self, task: Task, items: t.Iterable) -> t.List[t.Any]:
+        futures = [self.submit_task(task, (item,), {}) for item in items]
+        return [future.result() for future in futures]
+
+    async def arun(
+        self,
+        task: Task,
+        args: t.Sequence,
+        kwargs: t.Dict[str, t.Any],
+    ) -> t.Any:
+        return await asyncio.wrap_future(self.submit_task(task, args, kwargs))
+
+    async def amap(self, task: Task, items: t.Iterable) -> t.List[t.Any]:
+        futures = [self.submit_task(task, (item,), {}) for item in items]
+        return list(await asyncio.gather(*map(asyncio.wrap_future, futures)))
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
+
+
+def _worker(conn: Connection) -> None:
+    from seda.run import get_task
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        path, args, kwargs = message
+        try:
+            response = (True, call(get_task(path), args, kwargs))
+            conn.send(response)
+        except BaseException as exc:
+            tb = traceback.format_exception(type(exc), exc, exc.__traceback__)
+            try:
+                conn.send((False, exc, tb))
+            except (pickle.PicklingError, TypeError, AttributeError):
+                conn.send((False, RuntimeError(repr(exc)), tb))
+
+
+class Worker:
+    def __init__(self, ctx: t.Any) -> None:
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    @property
+    def alive(self) -> bool:
+        return t.cast(bool, self.process.is_alive())
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+
+
+class ProcessExecutor(Executor):
+    # Pipe based IPC, Lambda has no /dev/shm for multiprocessing queues and locks
+    def __init__(self, workers: t.Optional[int] = None) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        # Forking a process that runs threads can copy locks held by them
+        methods = multiprocessing.get_all_start_methods()
+        self._ctx = multiprocessing.get_context(
+            "forkserver" if "forkserver" in methods else "spawn"
+        )
+        self._idle: t.List[Worker] = []
+        self._size = 0
+        self._available = threading.Condition()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} workers={self.workers}>"
+
+    def _checkout(self, count: int) -> t.List[Worker]:
+        with self._available:
+            while True:
+                alive = [worker for worker in self._idle if worker.alive]
+                self._size -= len(self._idle) - len(alive)
+                self._idle = alive
+                if self._idle or self._size < self.workers:
+                    break
+                self._available.wait()
+            workers = [self._idle.pop() for _ in range(min(count, len(self._idle)))]
+            spawn = min(count - len(workers), self.workers - self._size)
+            self._size += spawn
+
+        started: t.List[Worker] = []
+        try:
+            for _ in range(spawn):
+                started.append(Worker(self._ctx))
+        except BaseException:
+            self._checkin(workers + started, lost=spawn - len(started))
+            raise
+        return workers + started
+
+    def _checkin(self, workers: t.List[Worker], lost: int = 0) -> None:
+        with self._available:
+            self._idle.extend(workers)
+            self._size -= lost
+            self._available.notify_all()
+
+    def run(self, task: Task, args: t.Sequence, kwargs: t.Dict[str, t.Any]) -> t.Any:
+        return self._execute(task, [(args, kwargs)])[0]
+
+    def map(self, task: Task, items: t.Iterable) -> t.List[t.Any]:
+        return self._execute(task, [((item,), {}) for item in items])
+
+    def _execute(
+        self,
+        task: Task,
+        calls: t.Sequence[t.Tuple[t.Sequence, t.Dict[str, t.Any]]],
+    ) -> t.List[t.Any]:
+        results: t.List[t.Any] = [None] * len(calls)
+        if not calls:
+            return results
+        pending = iter(enumerate(calls))
+        busy: t.Dict[Connection, t.Tuple[Worker, int]] = {}
+        # The pool is only locked to check workers out and in, calls run unlocked
+        idle = self._checkout(len(calls))
+        lost = 0
+
+        try:
+            while True:
+                while idle:
+                    item = next(pending, None)
+                    if item is None:
+                        break
+                    idx, (args, kwargs) = item
+                    worker = idle.pop()
+                    worker.conn.send((task.path, tuple(args), kwargs))
+                    busy[worker.conn] = (worker, idx)
+                if not busy:
+                    return results
+
+                for conn in wait(list(busy)):
+                    worker, idx = busy.pop(t.cast(Connection, conn))
+                    try:
+                        response = worker.conn.recv()
+                    except EOFError:
+                        lost += 1
+                        worker.stop()
+                        raise RuntimeError(f"{task!r} worker process died.")
+                    idle.append(worker)
+                    if not response[0]:
+                        _, exc, tb = response
+                        raise exc from RemoteError(str(exc), traceback=tb)
+                    results[idx] = response[1]
+        except BaseException:
+            for worker, _ in busy.values():
+                worker.stop()
+            lost += len(busy)
+            raise
+        finally:
+            self._checkin(idle, lost=lost)
+
+    def shutdown(self) -> None:
+        with self._available:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+        for worker in idle:
+            worker.stop()
+
+
+EXECUTORS: t.Dict[str, t.Callable[[t.Optional[int]], Executor]] = {
+    "process": ProcessExecutor,
+    "thread": ThreadExecutor,
+}
@@ -0,0 +1,437 @@
+import bisect
+import calendar
+import functools
+import heapq
+import itertools
+import re
+import typing as t
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+
+try:
+    import zoneinfo
+except ImportError:  # pragma: nocover
+    try:
+        from backports import zoneinfo  # type: ignore[no-redef]
+    except ImportError:
+        zoneinfo = None  # type: ignore[assignment]
+
+from seda.exceptions import ExpressionError
+
+if t.TYPE_CHECKING:
+    from seda.tasks import Schedule
+
+MONTHS = "JAN FEB MAR APR MAY JUN JUL AUG SEP OCT NOV DEC".split()
+WEEKDAYS = "SUN MON TUE WED THU FRI SAT".split()
+
+RATE_UNITS = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+}
+
+_expression_re = re.compile(r"^\s*(cron|rate|at)\((.*)\)\s*$")
+_rate_re = re.compile(r"^\s*(\d+)\s+(minutes?|hours?|days?)\s*$")
+
+
+class Expression:
+    kind: str
+
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.expression}>"
+
+    def next_after(
+        self,
+        after: datetime,
+        *,
+        start: t.Optional[datetime] = None,
+    ) -> t.Optional[datetime]:
+        raise NotImplementedError
+
+    def iter_after(
+        self,
+        after: datetime,
+        *,
+        start: t.Optional[datetime] = None,
+    ) -> t.Iterator[datetime]:
+        fire_time = self.next_after(after, start=start)
+
+        while fire_time is not None:
+            yield fire_time
+            fire_time = self.next_after(fire_time, start=start)
+
+    def next_n(
+        self,
+        after: datetime,
+        n: int,
+        *,
+        start: t.Optional[datetime] = None,
+    ) -> t.List[datetime]:
+        return list(itertools.islice(self.iter_after(after, start=start), n))
+
+
+class AtExpression(Expression):
+    kind = "at"
+
+    def __init__(self, expression: str, value: str) -> None:
+        super().__init__(expression)
+        try:
+            self.datetime = datetime.strptime(value.strip(), "%Y-%m-%dT%H:%M:%S")
+        except ValueError:
+            raise ExpressionError(
+                f'Invalid "at" expression "{expression}", '
+                'must be "at(yyyy-mm-ddThh:mm:ss)".'
+            )
+
+    def next_after(
+        self,
+        after: datetime,
+        *,
+        start: t.Optional[datetime] = None,
+    ) -> t.Optional[datetime]:
+        value = self.datetime.replace(tzinfo=after.tzinfo)
+        return value if value > after else None
+
+
+class RateExpression(Expression):
+    kind = "rate"
+
+    def __init__(self, expression: str, value: str) -> None:
+        super().__init__(expression)
+        match = _rate_re.match(value)
+        if match is None:
+            raise ExpressionError(
+                f'Invalid "rate" expression "{expression}", '
+                'must be "rate(value unit)".'
+            )
+        amount, unit = int(match.group(1)), match.group(2)
+        if amount < 1:
+            raise ExpressionError(f'Rate value must be positive in "{expression}".')
+        if (amount == 1) == unit.endswith("s"):
+            raise ExpressionError(
+                f'Rate unit "{unit}" does not match value {amount} in "{expression}".'
+            )
+        self.interval = amount * RATE_UNITS[unit.rstrip("s")]
+
+    def next_after(
+        self,
+        after: datetime,
+        *,
+        start: t.Optional[datetime] = None,
+    ) -> t.Optional[datetime]:
+        if start is None:
+            return after + self.interval
+        if start > after:
+            return start
+        periods = (after - start) // self.interval + 1
+        return start + periods * self.interval
+
+
+class CronField:
+    def __init__(
+        self,
+        name: str,
+        value: str,
+        minimum: int,
+        maximum: int,
+        names: t.Sequence[str] = (),
+    ) -> None:
+        self.name = name
+        self.minimum = minimum
+        self.maximum = maximum
+        self.names = names
+        self.any = value == "*"
+        self.values = sorted(self.parse(value))
+
+    def __contains__(self, value: int) -> bool:
+        if self.any:
+            return True
+        index = bisect.bisect_left(self.values, value)
+        return index < len(self.values) and self.values[index] == value
+
+    def next(self, value: int) -> t.Optional[int]:
+        index = bisect.bisect_left(self.values, value)
+        return self.values[index] if index < len(self.values) else None
+
+    def number(self, value: str) -> int:
+        upper = value.upper()
+        if upper in self.names:
+            return self.names.index(upper) + self.minimum
+        try:
+            number = int(value)
+        except ValueError:
+            raise ExpressionError(f'Invalid {self.name} value "{value}".')
+        if not self.minimum <= number <= self.maximum:
+            raise ExpressionError(
+                f'{self.name.capitalize()} value "{value}" out of range '
+                f"{self.minimum}-{self.maximum}."
+            )
+        return number
+
+    def parse(self, value: str) -> t.Set[int]:
+        values: t.Set[int] = set()
+
+        for part in value.split(","):
+            rng, _, step = part.partition("/")
+            if rng == "*":
+                first, last = self.minimum, self.maximum
+            elif "-" in rng:
+                lower, _, upper = rng.partition("-")
+                first, last = self.number(lower), self.number(upper)
+            else:
+                first = self.number(rng)
+                last = self.maximum if step else first
+            increment = self.number_step(step) if step else 1
+
+            if first <= last:
+                values.update(range(first, last + 1, increment))
+            else:
+                span = self.maximum - self.minimum + 1
+                values.update(
+                    (n - self.minimum) % span + self.minimum
+                    for n in range(first, last + span + 1, increment)
+                )
+        return values
+
+    def number_step(self, value: str) -> int:
+        if not value.isdigit() or int(value) < 1:
+            raise ExpressionError(f'Invalid {self.name} increment "{value}".')
+        return int(value)
+
+
+class DayOfMonthField:
+    def __init__(self, value: str) -> None:
+        self.value = value
+        self.any = value in ("*", "?")
+        self.last = value == "L"
+        self.last_weekday = value == "LW"
+        self.weekday: t.Optional[int] = None
+        self.days: t.Optional[CronField] = None
+
+        if value.endswith("W") and not self.last_weekday:
+            self.weekday = CronField("day-of-month", value[:-1], 1, 31).values[0]
+        elif not (self.any or self.last or self.last_weekday):
+            self.days = CronField("day-of-month", value, 1, 31)
+
+    def matches(self, day: date) -> bool:
+        if self.any:
+            return True
+        last_day = calendar.monthrange(day.year, day.month)[1]
+        if self.last:
+            return day.day == last_day
+        if self.last_weekday:
+            return day == _nearest_weekday(day.replace(day=last_day))
+        if self.weekday is not None:
+            target = day.replace(day=min(self.weekday, last_day))
+            return day == _nearest_weekday(target)
+        return day.day in t.cast(CronField, self.days)
+
+
+class DayOfWeekField:
+    def __init__(self, value: str) -> None:
+        self.value = value
+        self.any = value in ("*", "?")
+        self.nth: t.Optional[t.Tuple[int, int]] = None
+        self.last: t.Optional[int] = None
+        self.days: t.Optional[CronField] = None
+
+        if "#" in value:
+            weekday, _, nth = value.partition("#")
+            if not nth.isdigit() or not 1 <= int(nth) <= 5:
+                raise ExpressionError(f'Invalid day-of-week "{value}".')
+            self.nth = (self._field(weekday).values[0], int(nth))
+        elif value.endswith("L") and value != "L":
+            self.last = self._field(value[:-1]).values[0]
+        elif value == "L":
+            self.last = 7
+        elif not self.any:
+            self.days = self._field(value)
+
+    @staticmethod
+    def _field(value: str) -> CronField:
+        return CronField("day-of-week", value, 1, 7, WEEKDAYS)
+
+    def matches(self, day: date) -> bool:
+        if self.any:
+            return True
+        weekday = (day.weekday() + 1) % 7 + 1
+        if self.nth is not None:
+            return weekday == self.nth[0] and (day.day - 1) // 7 + 1 == self.nth[1]
+        if self.last is not None:
+            last_day = calendar.monthrange(day.year, day.month)[1]
+            return weekday == self.last and day.day + 7 > last_day
+        return weekday in t.cast(CronField, self.days)
+
+
+class CronExpression(Expression):
+    kind = "cron"
+
+    def __init__(self, expression: str, value: str) -> None:
+        super().__init__(expression)
+        self.value = value
+        fields = value.split()
+        if len(fields) != 6:
+            raise ExpressionError(
+                f'Invalid "cron" expression "{expression}", must have 6 fields: '
+                "minutes hours day-of-month month day-of-week year."
+            )
+        minutes, hours, days, months, weekdays, years = fields
+
+        if (days == "?") == (weekdays == "?"):
+            raise ExpressionError(
+                f'Invalid "cron" expression "{expression}", one of day-of-month '
+                'or day-of-week must be "?".'
+            )
+        self.minutes = CronField("minutes", minutes, 0, 59)
+        self.hours = CronField("hours", hours, 0, 23)
+        self.days = DayOfMonthField(days)
+        self.months = CronField("month", months, 1, 12, MONTHS)
+        self.weekdays = DayOfWeekField(weekdays)
+        self.years = CronField("year", years, 1970, 2199)
+
+    def matches_day(self, day: date) -> bool:
+        return (
+            day.year in self.years
+            and day.month in self.months
+            and self.days.matches(day)
+            and self.weekdays.matches(day)
+        )
+
+    def next_after(
+        self,
+        after: datetime,
+        *,
+        start: t.Optional[datetime] = None,
+    ) -> t.Optional[datetime]:
+        if start is not None and start > after:
+            after = start - timedelta(minutes=1)
+        current = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        day = current.date()
+        hour, minute = current.hour, current.minute
+
+        while True:
+            # Impossible dates with any year would otherwise run to date.max
+            if day.year > self.years.maximum:
+                return None
+            if day.year not in self.years:
+                year = self.years.next(day.year)
+                if year is None:
+                    return None
+                day, hour, minute = date(year, 1, 1), 0, 0
+            if day.month not in self.months:
+                month = self.months.next(day.month)
+                if month is None:
+                    day, hour, minute = date(day.year + 1, 1, 1), 0, 0
+                else:
+                    day, hour, minute = date(day.year, month, 1), 0, 0
+                continue
+
+            if self.matches_day(day):
+                fire_time = self._next_time(hour, minute)
+                if fire_time is not None:
+                    return datetime.combine(day, fire_time, tzinfo=after.tzinfo)
+            day, hour, minute = day + timedelta(days=1), 0, 0
+
+    def _next_time(self, hour: int, minute: int) -> t.Optional[time]:
+        while True:
+            if hour not in self.hours:
+                next_hour = self.hours.next(hour)
+                if next_hour is None:
+                    return None
+                hour, minute = next_hour, 0
+            next_minute = self.minutes.next(minute)
+            if next_minute is not None:
+                return time(hour, next_minute)
+            hour, minute = hour + 1, 0
+            if hour > 23:
+                return None
+
+
+def _nearest_weekday(day: date) -> date:
+    if day.weekday() == 5:
+        return day - timedelta(days=1) if day.day > 1 else day + timedelta(days=2)
+    if day.weekday() == 6:
+        last_day = calendar.monthrange(day.year, day.month)[1]
+        return day + timedelta(days=1) if day.day < last_day else day - timedelta(2)
+    return day
+
+
+def get_timezone(name: t.Optional[str]) -> tzinfo:
+    if name is None or name.upper() == "UTC":
+        return timezone.utc
+    if zoneinfo is None:  # pragma: nocover
+        raise RuntimeError(f'Timezone "{name}" requires "backports.zoneinfo".')
+    try:
+        return _zone(name)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        raise ExpressionError(f'Unknown timezone "{name}".')
+
+
+@functools.lru_cache(maxsize=None)
+def _zone(name: str) -> tzinfo:
+    return zoneinfo.ZoneInfo(name)
+
+
+def as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def fire_times(
+    schedules: t.Iterable["Schedule"],
+    after: datetime,
+    until: datetime,
+) -> t.Dict["Schedule", t.List[datetime]]:
+    # Schedules sharing expression, timezone and dates are evaluated once
+    groups: t.Dict[t.Tuple, t.List["Schedule"]] = {}
+    for schedule in schedules:
+        key = (
+            schedule.expression,
+            schedule.timezone,
+            schedule.start_date,
+            schedule.end_date,
+        )
+        groups.setdefault(key, []).append(schedule)
+
+    result: t.Dict["Schedule", t.List[datetime]] = {}
+    for group in groups.values():
+        times = list(group[0].iter_fire_times(after, until))
+        result.update((schedule, times) for schedule in group)
+    return result
+
+
+def iter_fire_times(
+    schedules: t.Iterable["Schedule"],
+    after: datetime,
+    until: datetime,
+) -> t.Iterator[t.Tuple[datetime, "Schedule"]]:
+    streams = [
+        zip(times, itertools.repeat(idx), itertools.repeat(schedule))
+        for idx, (schedule, times) in enumerate(
+            fire_times(schedules, after, until).items()
+        )
+    ]
+    for fire_time, _, schedule in heapq.merge(*streams):
+        yield fire_time, schedule
+
+
+EXPRESSIONS: t.Dict[str, t.Type[Expression]] = {
+    "at": AtExpression,
+    "cron": CronExpression,
+    "rate": RateExpression,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def parse(expression: str) -> Expression:
+    match = _expression_re.match(expression)
+    if match is None:
+        raise ExpressionError(
+            f'Invalid expression "{expression}", '
+            'must be "cron(...)", "rate(...)" or "at(...)".'
+        )
+    kind, value = match.groups()
+    return EXPRESSIONS[kind](expression, value)  # type: ignore[call-arg]
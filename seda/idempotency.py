@@ -0,0 +1,87 @@
+import hashlib
+import typing as t
+
+from seda import types
+from seda.cache import LRUCache
+from seda.stores import Store
+from seda.tasks import Task
+
+# Claims outlive the longest possible invocation (15 minutes)
+CLAIM_TTL = 15 * 60
+# Envelope fields telling apart deliveries of the same call
+ENVELOPE_KEYS = ("result_id", "chain", "chord")
+
+
+class Idempotency:
+    def __init__(
+        self,
+        store: Store,
+        *,
+        ttl: float = 24 * 3600,
+        max_entries: int = 1024,
+    ) -> None:
+        self.store = store
+        self.ttl = ttl
+        self.local = LRUCache(max_entries, ttl=ttl)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.store!r}>"
+
+    @staticmethod
+    def get_key(task: Task, data: types.EventTask) -> str:
+        args = data.get("args") or ()
+        kwargs = data.get("kwargs") or {}
+        context = t.cast(types.ScheduleTask, data).get("context")
+
+        if task.key is None and context is not None and "ExecutionId" in context:
+            key = context["ExecutionId"]
+        elif "batch" in data:
+            payload = task.codec.encode(data["batch"])
+            key = hashlib.sha256(payload.encode()).hexdigest()
+        else:
+            key = task.get_call_key(args, kwargs)
+
+        # Workflow members and submits with equal arguments are different calls
+        fields = t.cast(t.Dict[str, t.Any], data)
+        envelope = {name: fields[name] for name in ENVELOPE_KEYS if name in fields}
+        if envelope:
+            payload = task.codec.encode(envelope)
+            key += ":" + hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+        # Continuations are deliveries of their own
+        if "cursor" in data:
+            cursor = task.codec.encode(data["cursor"])
+            key += ":" + hashlib.sha256(cursor.encode()).hexdigest()[:16]
+        return f"seda:idempotency:{task.path}:{key}"
+
+    def claim(
+        self,
+        key: str,
+        task: Task,
+        *,
+        timeout: t.Optional[float] = None,
+    ) -> t.Tuple[bool, bool, t.Any]:
+        # Pending claims expire with the invocation, so a killed run is taken over
+        ttl = CLAIM_TTL if timeout is None else min(max(timeout, 1), CLAIM_TTL)
+        record = self.local.get(key)
+        if record is None:
+            if self.store.add(key, {"status": "pending"}, ttl=ttl):
+                return True, False, None
+            record = self.store.get(key)
+            if record is None:
+                # Claim expired between both calls
+                claimed = self.store.add(key, {"status": "pending"}, ttl=ttl)
+                return claimed, False, None
+
+        if record["status"] == "success":
+            self.local.set(key, record)
+            return False, True, task.codec.decode(record["data"])
+        return False, False, None
+
+    def save(self, key: str, task: Task, result: t.Any) -> None:
+        record = {"status": "success", "data": task.codec.encode(result)}
+        self.store.set(key, record, ttl=self.ttl)
+        self.local.set(key, record)
+
+    def release(self, key: str) -> None:
+        self.store.delete(key)
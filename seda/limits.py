@@ -0,0 +1,74 @@
+import threading
+import time
+import typing as t
+
+import anyio
+
+from seda.exceptions import RateLimitExceeded
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        rate: float,
+        burst: t.Optional[int] = None,
+        *,
+        max_wait: t.Optional[float] = 30.0,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError(f"Token bucket rate must be positive, got {rate}.")
+        if burst is not None and burst < 1:
+            raise ValueError(f"Token bucket burst must be at least 1, got {burst}.")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self.max_wait = max_wait
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} rate={self.rate}/s burst={self.burst}>"
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens: int = 1) -> float:
+        with self._lock:
+            self._refill()
+            # Tokens may go negative, later callers queue behind the reservation
+            delay = max(tokens - self._tokens, 0) / self.rate
+            if self.max_wait is not None and delay > self.max_wait:
+                raise RateLimitExceeded(
+                    f"{self!r} would block for {delay:.2f}s "
+                    f"(max_wait={self.max_wait}s)."
+                )
+            self._tokens -= tokens
+            return delay
+
+    def refund(self, tokens: int = 1) -> None:
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.burst, self._tokens + tokens)
+
+    def acquire(self, tokens: int = 1) -> float:
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def aacquire(self, tokens: int = 1) -> float:
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await anyio.sleep(delay)
+        return delay
+
+    def snapshot(self) -> t.Dict[str, float]:
+        return {"rate": self.rate, "burst": self.burst, "tokens": self.tokens}
@@ -0,0 +1,58 @@
+import collections
+import threading
+import typing as t
+
+
+class Metrics:
+    def __init__(self, max_samples: int = 1000) -> None:
+        self.max_samples = max_samples
+        self._counters: t.Dict[str, float] = collections.defaultdict(float)
+        self._samples: t.Dict[str, t.Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def incr(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            if name not in self._samples:
+                self._samples[name] = collections.deque(maxlen=self.max_samples)
+            self._samples[name].append(value)
+
+    def count(self, name: str) -> float:
+        return self._counters.get(name, 0)
+
+    def samples(self, name: str) -> t.List[float]:
+        with self._lock:
+            return list(self._samples.get(name, ()))
+
+    def percentile(self, name: str, q: float) -> t.Optional[float]:
+        samples = sorted(self.samples(name))
+        if not samples:
+            return None
+        return samples[min(int(q * len(samples)), len(samples) - 1)]
+
+    def rate(self, name: str, total: str) -> float:
+        count = self.count(total)
+        return self.count(name) / count if count else 0.0
+
+    def snapshot(self) -> t.Dict[str, t.Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            names = list(self._samples)
+        timings = {
+            name: {
+                "count": len(self.samples(name)),
+                "p50": self.percentile(name, 0.5),
+                "p95": self.percentile(name, 0.95),
+                "p99": self.percentile(name, 0.99),
+            }
+            for name in names
+        }
+        return {"counters": counters, "timings": timings}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._samples.clear()
@@ -0,0 +1,207 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+import typing as t
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from seda.client import TRANSIENT_ERROR_CODES, Client, get_message_attributes
+from seda.exceptions import CircuitOpen
+from seda.metrics import Metrics
+
+try:
+    from django.core.exceptions import ImproperlyConfigured
+    from django.db import transaction
+except ImportError:  # pragma: nocover
+    transaction = None  # type: ignore[assignment]
+
+# SNS PublishBatch accepts up to 10 entries per request
+MAX_BATCH_ENTRIES = 10
+
+
+def is_transient(exc: BaseException) -> bool:
+    if isinstance(exc, ClientError):
+        error = exc.response.get("Error", {})
+        status = exc.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+        return error.get("Code") in TRANSIENT_ERROR_CODES or status >= 500
+    return isinstance(exc, (BotoCoreError, CircuitOpen))
+
+
+def on_commit(func: t.Callable[[], t.Any]) -> bool:
+    if transaction is None:
+        return False
+    try:
+        if not transaction.get_connection().in_atomic_block:
+            return False
+    except ImproperlyConfigured:
+        return False
+    transaction.on_commit(func)
+    return True
+
+
+class Outbox:
+    def __init__(
+        self,
+        client: Client,
+        path: str,
+        *,
+        metrics: t.Optional[Metrics] = None,
+        max_interval: float = 30.0,
+    ) -> None:
+        self.client = client
+        self.path = path
+        self.metrics = metrics or Metrics()
+        self.max_interval = max_interval
+        self.log = logging.getLogger("seda")
+        self._conn = sqlite3.connect(
+            path,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seda_outbox "
+            "(id INTEGER PRIMARY KEY AUTOINCREMENT, topic_arn TEXT NOT NULL, "
+            "message TEXT NOT NULL, group_id TEXT, attributes TEXT)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS seda_outbox_topic "
+            "ON seda_outbox (topic_arn, group_id)"
+        )
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread: t.Optional[threading.Thread] = None
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.path} pending={len(self)}>"
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count()
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM seda_outbox").fetchone()[0]
+
+    def pending(self, topic_arn: str, group_id: t.Optional[str] = None) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM seda_outbox WHERE topic_arn = ? AND group_id IS ? "
+                "LIMIT 1",
+                (topic_arn, group_id),
+            ).fetchone()
+        return row is not None
+
+    def put(
+        self,
+        topic_arn: str,
+        message: str,
+        *,
+        group_id: t.Optional[str] = None,
+        attributes: t.Optional[t.Dict[str, str]] = None,
+    ) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO seda_outbox (topic_arn, message, group_id, attributes) "
+                "VALUES (?, ?, ?, ?)",
+                (topic_arn, message, group_id, json.dumps(attributes or {})),
+            )
+        self.metrics.incr("outbox.spooled")
+        self.start()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run,
+                name="seda-outbox",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        delay = 0.1
+        while True:
+            # Exiting under the lock lets a concurrent put() start a new thread
+            with self._lock:
+                if not self._count():
+                    self._thread = None
+                    return
+            if self.flush():
+                delay = 0.1
+                continue
+            # Back off while the transport keeps failing
+            time.sleep(delay)
+            delay = min(delay * 2, self.max_interval)
+
+    def _take(self, limit: int) -> t.List[t.Tuple]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, topic_arn, message, group_id, attributes "
+                "FROM seda_outbox ORDER BY id LIMIT ?",
+                (limit,),
+            ).fetchall()
+
+    def _delete(self, ids: t.Sequence[int]) -> None:
+        if not ids:
+            return
+        placeholders = ",".join("?" * len(ids))
+        with self._lock:
+            self._conn.execute(
+                f"DELETE FROM seda_outbox WHERE id IN ({placeholders})", tuple(ids)
+            )
+
+    def flush(self) -> int:
+        sent = 0
+        with self._flush_lock:
+            while True:
+                rows = self._take(MAX_BATCH_ENTRIES * 10)
+                if not rows:
+                    return sent
+
+                batches: t.Dict[str, t.List[t.Tuple]] = {}
+                for row in rows:
+                    batches.setdefault(row[1], []).append(row)
+
+                for topic_arn, entries in batches.items():
+                    for idx in range(0, len(entries), MAX_BATCH_ENTRIES):
+                        delivered = self._publish(topic_arn, entries[idx:][:10])
+                        if delivered is None:
+                            return sent
+                        sent += delivered
+
+    def _publish(self, topic_arn: str, rows: t.Sequence[t.Tuple]) -> t.Optional[int]:
+        entries = []
+        for row_id, _, message, group_id, attributes in rows:
+            entry: t.Dict[str, t.Any] = {"Id": str(row_id), "Message": message}
+            if group_id is not None:
+                entry["MessageGroupId"] = group_id
+            attributes = json.loads(attributes)
+            if attributes:
+                entry["MessageAttributes"] = get_message_attributes(attributes)
+            entries.append(entry)
+
+        try:
+            response = self.client.sns_publish_batch(topic_arn, entries)
+        except (BotoCoreError, ClientError, CircuitOpen) as exc:
+            self.log.warning(f"Outbox flush to {topic_arn} failed: {exc}")
+            return None
+
+        failed, dropped = False, []
+        for failure in response.get("Failed", []):
+            # Sender faults are permanent, retrying them would block the spool
+            if failure.get("SenderFault"):
+                self.log.error(
+                    f"Outbox message {failure['Id']} rejected: {failure.get('Message')}"
+                )
+                dropped.append(int(failure["Id"]))
+            else:
+                failed = True
+
+        delivered = [int(entry["Id"]) for entry in response.get("Successful", [])]
+        self._delete([*delivered, *dropped])
+        self.metrics.incr("outbox.sent", len(delivered))
+        self.metrics.incr("outbox.dropped", len(dropped))
+        return None if failed else len(delivered)
@@ -44,5 +44,42 @@ LAMBDA_FUNCTION_POLICY = types.Policy(
             "Action": "sns:Publish",
             "Resource": [],
         },
+        {
+            "Effect": "Allow",
+            "Action": [
+                "dynamodb:GetItem",
+                "dynamodb:BatchGetItem",
+                "dynamodb:PutItem",
+                "dynamodb:UpdateItem",
+                "dynamodb:DeleteItem",
+            ],
+            "Resource": [],
+        },
+    ],
+)
+
+S3_RESULTS_STATEMENT = types.Statement(
+    Effect="Allow",
+    Action=["s3:GetObject", "s3:PutObject"],
+    Resource=[],
+)
+
+SQS_LANES_STATEMENT = types.Statement(
+    Effect="Allow",
+    Action=["sqs:ReceiveMessage", "sqs:DeleteMessage", "sqs:GetQueueAttributes"],
+    Resource=[],
+)
+
+SQS_QUEUE_POLICY = types.Policy(
+    Version=POLICY_VERSION,
+    Statement=[
+        {
+            "Effect": "Allow",
+            "Action": "sqs:SendMessage",
+            "Principal": {
+                "Service": "sns.amazonaws.com",
+            },
+            "Resource": [],
+        },
     ],
 )
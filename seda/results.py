@@ -0,0 +1,145 @@
+import logging
+import time
+import traceback
+import typing as t
+import uuid
+
+from seda import exceptions
+from seda.stores import Store
+from seda.tasks import Task
+
+if t.TYPE_CHECKING:
+    from seda.app import Seda
+    from seda.client import Client
+
+# Results above this size are offloaded to S3, DynamoDB items are limited to 400 KB
+MAX_ITEM_BYTES = 300_000
+RESULT_PREFIX = "seda/results/"
+RESULT_LIFECYCLE_RULE_ID = "seda-results"
+
+
+class ResultBackend:
+    def __init__(
+        self,
+        store: Store,
+        *,
+        ttl: float = 24 * 3600,
+        bucket: t.Optional[str] = None,
+        client: t.Optional["Client"] = None,
+        max_item_bytes: int = MAX_ITEM_BYTES,
+    ) -> None:
+        self.store = store
+        self.ttl = ttl
+        self.bucket = bucket
+        self.client = client
+        self.max_item_bytes = max_item_bytes
+        self.log = logging.getLogger("seda")
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.store!r}>"
+
+    @staticmethod
+    def get_key(result_id: str) -> str:
+        return f"seda:result:{result_id}"
+
+    def save(self, result_id: str, task: Task, result: t.Any) -> None:
+        data = task.codec.encode(result)
+        record = {"status": "success", "data": data}
+
+        if len(data) > self.max_item_bytes:
+            if self.bucket is None:
+                exc = exceptions.ResultTooLarge(
+                    f"{task!r} result is {len(data)} bytes, results over "
+                    f"{self.max_item_bytes} bytes require a result_bucket."
+                )
+                self.log.error(str(exc))
+                return self.save_error(result_id, exc)
+            key = f"{RESULT_PREFIX}{result_id}"
+            t.cast("Client", self.client).s3_put_object(self.bucket, key, data)
+            record = {"status": "success", "s3": key}
+        self.store.set(self.get_key(result_id), record, ttl=self.ttl)
+
+    def save_error(self, result_id: str, exc: BaseException) -> None:
+        record = {
+            "status": "failure",
+            "error": {
+                "errorType": type(exc).__name__,
+                "errorMessage": str(exc),
+                "stackTrace": traceback.format_exception(
+                    type(exc), exc, exc.__traceback__
+                ),
+            },
+        }
+        self.store.set(self.get_key(result_id), record, ttl=self.ttl)
+
+    def get_many(self, result_ids: t.Sequence[str]) -> t.Dict[str, t.Any]:
+        keys = {self.get_key(result_id): result_id for result_id in result_ids}
+        records = self.store.get_many(list(keys))
+        return {keys[key]: record for key, record in records.items()}
+
+    def load(self, record: t.Dict[str, t.Any], task: Task) -> t.Any:
+        if record["status"] == "failure":
+            raise exceptions.RemoteError.from_payload(record["error"])
+        if "s3" in record:
+            client = t.cast("Client", self.client)
+            data = client.s3_get_object(t.cast(str, self.bucket), record["s3"])
+            return task.codec.decode(data)
+        return task.codec.decode(record["data"])
+
+
+class AsyncResult:
+    def __init__(
+        self,
+        app: "Seda",
+        task: Task,
+        result_id: t.Optional[str] = None,
+    ) -> None:
+        self.app = app
+        self.task = task
+        self.id = result_id or uuid.uuid4().hex
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.task.path} {self.id}>"
+
+    def ready(self) -> bool:
+        return bool(self.app.results.get_many([self.id]))
+
+    def get(self, timeout: t.Optional[float] = None) -> t.Any:
+        return gather([self], timeout=timeout)[0]
+
+
+def gather(
+    results: t.Sequence[AsyncResult],
+    *,
+    timeout: t.Optional[float] = None,
+    interval: float = 0.1,
+    max_interval: float = 2.0,
+) -> t.List[t.Any]:
+    if not results:
+        return []
+
+    backend = results[0].app.results
+    deadline = None if timeout is None else time.monotonic() + timeout
+    records: t.Dict[str, t.Any] = {}
+
+    while True:
+        # One batched lookup per round for every pending result
+        pending = [result.id for result in results if result.id not in records]
+        records.update(backend.get_many(pending))
+        pending = [result_id for result_id in pending if result_id not in records]
+        if not pending:
+            break
+
+        delay = interval
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(
+                    f"{len(pending)} of {len(results)} results not ready "
+                    f"after {timeout}s."
+                )
+            delay = min(delay, remaining)
+        time.sleep(delay)
+        interval = min(interval * 2, max_interval)
+
+    return [backend.load(records[result.id], result.task) for result in results]
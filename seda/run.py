@@ -5,25 +5,197 @@ import typing as t
 import anyio
 
 from seda import types
+from seda.context import TaskContext, _current_task
+from seda.executors import ThreadExecutor, call
+from seda.tasks import Task
 from seda.utils import get_callable
 
+if t.TYPE_CHECKING:
+    from seda.app import Seda
 
-def run_task(data: types.EventTask) -> t.Any:
-    func = get_callable(data["path"])
-    f = getattr(func, "task", func)
-    task = functools.partial(f, *data.get("args") or (), **data.get("kwargs") or {})
 
-    if asyncio.iscoroutinefunction(f):
-        result = anyio.run(task)
-        # asyncio.get_event_loop support
-        asyncio.set_event_loop(asyncio.new_event_loop())
-        return result
-    return task()
+def get_task(path: str) -> Task:
+    func = get_callable(path)
+    definition = getattr(func, "definition", None)
+    return definition if definition is not None else Task(func)
 
 
-def sync_to_async(f: t.Callable) -> t.Callable:
+def get_context(
+    data: types.EventTask,
+    *,
+    task: t.Optional[Task] = None,
+    app: t.Optional["Seda"] = None,
+    context: t.Optional[types.LambdaContext] = None,
+) -> TaskContext:
+    return TaskContext(
+        task or get_task(data["path"]),
+        data,
+        app=app,
+        lambda_context=context,
+        margin=0 if app is None else app.config.deadline_margin,
+    )
+
+
+def run_task(
+    data: types.EventTask,
+    *,
+    task: t.Optional[Task] = None,
+    app: t.Optional["Seda"] = None,
+    context: t.Optional[types.LambdaContext] = None,
+) -> t.Any:
+    task_context = get_context(data, task=task, app=app, context=context)
+    claimed, found, result = _claim(task_context)
+
+    if claimed:
+        try:
+            if task_context.task.is_async:
+                result = anyio.run(_run_async, task_context)
+                # asyncio.get_event_loop support
+                asyncio.set_event_loop(asyncio.new_event_loop())
+            else:
+                result = _run_sync(task_context)
+        except Exception as exc:
+            _fail(task_context, exc)
+            raise
+    # Stored results still fulfil the result id of this delivery
+    if claimed or found is not None:
+        _complete(task_context, result, found)
+
+    if data.get("rpc"):
+        return task_context.task.codec.encode(result)
+    return result
+
+
+async def arun_task(
+    data: types.EventTask,
+    *,
+    task: t.Optional[Task] = None,
+    app: t.Optional["Seda"] = None,
+    context: t.Optional[types.LambdaContext] = None,
+) -> t.Any:
+    task_context = get_context(data, task=task, app=app, context=context)
+    claimed, found, result = await anyio.to_thread.run_sync(_claim, task_context)
+
+    if claimed:
+        try:
+            if task_context.task.is_async or task_context.executor is not None:
+                result = await _run_async(task_context)
+            else:
+                result = await anyio.to_thread.run_sync(_run_sync, task_context)
+        except Exception as exc:
+            await anyio.to_thread.run_sync(_fail, task_context, exc)
+            raise
+    if claimed or found is not None:
+        await anyio.to_thread.run_sync(_complete, task_context, result, found)
+    return result
+
+
+def _claim(
+    context: TaskContext,
+) -> t.Tuple[bool, t.Optional[types.ClaimSource], t.Any]:
+    if context.app is None:
+        return True, None, None
+    return context.app.claim_task(
+        context.task,
+        context.data,
+        timeout=context.remaining,
+    )
+
+
+def _complete(
+    context: TaskContext,
+    result: t.Any,
+    found: t.Optional[types.ClaimSource] = None,
+) -> None:
+    if context.app is not None:
+        context.app.complete_task(
+            context.task,
+            context.data,
+            result,
+            continued=context.continued,
+            cached=found == "cache",
+            replayed=found == "replay",
+        )
+
+
+def _fail(context: TaskContext, exc: BaseException) -> None:
+    if context.app is not None:
+        context.app.fail_task(context.task, context.data, exc)
+
+
+def _run_sync(context: TaskContext) -> t.Any:
+    token = _current_task.set(context)
+    executor = context.executor
+    try:
+        if "map" in context.data:
+            if executor is not None:
+                return executor.map(context.task, context.data["map"])
+            return [call(context.task, (item,), {}) for item in context.data["map"]]
+        if context.task.is_generator:
+            return _iterate(context)
+        if executor is not None:
+            return executor.run(context.task, context.args, context.kwargs)
+        return context.call()
+    finally:
+        _current_task.reset(token)
+
+
+async def _run_async(context: TaskContext) -> t.Any:
+    token = _current_task.set(context)
+    try:
+        with anyio.move_on_after(context.time_left):
+            executor = context.executor
+            if "map" in context.data:
+                if executor is not None:
+                    return await executor.amap(context.task, context.data["map"])
+                return await anyio.to_thread.run_sync(_run_sync, context)
+            if executor is not None:
+                return await executor.arun(context.task, context.args, context.kwargs)
+            if context.task.is_generator:
+                return await _aiterate(context)
+            return await context.call()
+
+        if not context.has_checkpoint:
+            raise TimeoutError(f"{context.task!r} cancelled before the Lambda timeout.")
+        await anyio.to_thread.run_sync(context.continue_with)
+        return None
+    finally:
+        _current_task.reset(token)
+
+
+def _iterate(context: TaskContext) -> None:
+    generator = context.call()
+    try:
+        for cursor in generator:
+            context.checkpoint(cursor)
+            if context.should_continue:
+                context.continue_with()
+                return
+    finally:
+        generator.close()
+
+
+async def _aiterate(context: TaskContext) -> None:
+    generator = context.call()
+    try:
+        async for cursor in generator:
+            context.checkpoint(cursor)
+            if context.should_continue:
+                await anyio.to_thread.run_sync(context.continue_with)
+                return
+    finally:
+        with anyio.CancelScope(shield=True):
+            await generator.aclose()
+
+
+def sync_to_async(
+    f: t.Callable,
+    executor: t.Optional[ThreadExecutor] = None,
+) -> t.Callable:
     async def wrapper(*args: t.Any, **kwargs: t.Any) -> t.Any:
         partial = functools.partial(f, *args, **kwargs)
+        if executor is not None:
+            return await asyncio.wrap_future(executor.submit(partial))
         return await anyio.to_thread.run_sync(partial)
 
     return wrapper
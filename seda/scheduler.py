@@ -0,0 +1,166 @@
+import heapq
+import itertools
+import logging
+import os
+import threading
+import typing as t
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+
+try:
+    import fcntl
+except ImportError:  # pragma: nocover
+    fcntl = None  # type: ignore[assignment]
+
+from seda import types
+from seda.exceptions import ImportPathError
+from seda.expressions import as_utc
+from seda.run import get_task, run_task
+from seda.tasks import PRIORITIES, Schedule
+from seda.utils import get_uid
+
+if t.TYPE_CHECKING:
+    from seda.app import Seda
+
+
+class Lock:
+    def acquire(self) -> bool:
+        raise NotImplementedError
+
+    def release(self) -> None:
+        raise NotImplementedError
+
+
+class FileLock(Lock):
+    def __init__(self, path: str) -> None:
+        if fcntl is None:  # pragma: nocover
+            raise RuntimeError("File locks are not supported on this platform.")
+        self.path = path
+        self._fd: t.Optional[int] = None
+
+    def acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+class Scheduler:
+    def __init__(
+        self,
+        app: "Seda",
+        *,
+        workers: t.Optional[int] = None,
+        lock: t.Optional[Lock] = None,
+        lock_interval: float = 5.0,
+    ) -> None:
+        self.app = app
+        self.lock = lock
+        self.lock_interval = lock_interval
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="seda-scheduler",
+        )
+        self.log = logging.getLogger("seda")
+        self._heap: t.List[t.Tuple[datetime, int, Schedule]] = []
+        self._counter = itertools.count()
+        self._stop = threading.Event()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    @staticmethod
+    def now() -> datetime:
+        return datetime.now(timezone.utc)
+
+    def add(self, schedule: Schedule, now: t.Optional[datetime] = None) -> None:
+        self._push(schedule, now or self.now())
+
+    def _push(self, schedule: Schedule, after: datetime) -> None:
+        fire_time = schedule.next_after(after)
+
+        if fire_time is not None:
+            heapq.heappush(self._heap, (fire_time, next(self._counter), schedule))
+
+    def tick(self, now: t.Optional[datetime] = None) -> int:
+        now = as_utc(now or self.now())
+        fired = 0
+
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            fire_time, _, schedule = heapq.heappop(self._heap)
+            due.append((fire_time, schedule))
+            self._push(schedule, max(fire_time, now))
+
+        # Higher lanes first when several schedules are due on the same tick
+        for fire_time, schedule in sorted(due, key=lambda item: self.priority(item[1])):
+            self.dispatch(schedule, fire_time)
+            fired += 1
+        return fired
+
+    def priority(self, schedule: Schedule) -> int:
+        try:
+            return PRIORITIES[get_task(schedule.path).priority]
+        except ImportPathError:
+            return PRIORITIES["default"]
+
+    def dispatch(self, schedule: Schedule, fire_time: datetime) -> Future:
+        task = types.ScheduleTask(
+            path=schedule.path,
+            args=schedule.args,
+            kwargs=schedule.kwargs,
+            context={
+                "ScheduleArn": "",
+                "ScheduledTime": fire_time.isoformat(),
+                "ExecutionId": get_uid(),
+                "AttemptNumber": "1",
+                "Expression": schedule.expression,
+            },
+        )
+        future = self.executor.submit(run_task, task, app=self.app)
+        future.add_done_callback(lambda f: self._done(schedule, f))
+        return future
+
+    def _done(self, schedule: Schedule, future: Future) -> None:
+        exc = future.exception()
+        if exc is not None:
+            self.log.error(f"{schedule!r} failed: {exc!r}")
+
+    def timeout(self, now: t.Optional[datetime] = None) -> float:
+        now = now or self.now()
+        if not self._heap:
+            return self.lock_interval
+        delay = (self._heap[0][0] - now).total_seconds()
+        return max(min(delay, self.lock_interval), 0)
+
+    def run(self) -> None:
+        now = self.now()
+        for schedule in self.app.schedules:
+            self.add(schedule, now)
+
+        try:
+            while not self._stop.is_set():
+                if self.lock is not None and not self.lock.acquire():
+                    self._stop.wait(self.lock_interval)
+                    continue
+                self.tick()
+                self._stop.wait(self.timeout())
+        finally:
+            if self.lock is not None:
+                self.lock.release()
+            self.executor.shutdown(wait=True)
+
+    def stop(self) -> None:
+        self._stop.set()
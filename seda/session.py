@@ -1,7 +1,7 @@
 import typing as t
 
 import botocore.session
-from botocore.client import BaseClient
+from botocore.client import BaseClient, Config
 
 from seda import __version__
 
@@ -46,5 +46,9 @@ class Session:
     def region(self) -> str:
         return self._session.get_config_variable("region")
 
-    def client(self, service_name: str) -> BaseClient:
-        return self._session.create_client(service_name)
+    def client(
+        self,
+        service_name: str,
+        config: t.Optional[Config] = None,
+    ) -> BaseClient:
+        return self._session.create_client(service_name, config=config)
@@ -0,0 +1,353 @@
+import math
+import sqlite3
+import threading
+import time
+import typing as t
+
+from seda import exceptions, types
+from seda.codecs import Codec, default_codec
+
+if t.TYPE_CHECKING:
+    from seda.client import Client
+
+
+class Store:
+    def get(self, key: str) -> t.Any:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: t.Sequence[str]) -> t.Dict[str, t.Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: t.Any, *, ttl: t.Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    def add(self, key: str, value: t.Any, *, ttl: t.Optional[float] = None) -> bool:
+        raise NotImplementedError
+
+    def incr(self, key: str, amount: int = 1, *, ttl: t.Optional[float] = None) -> int:
+        raise NotImplementedError
+
+    def add_member(
+        self,
+        key: str,
+        member: str,
+        *,
+        ttl: t.Optional[float] = None,
+    ) -> int:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+def _expires(ttl: t.Optional[float]) -> t.Optional[float]:
+    return None if ttl is None else time.time() + ttl
+
+
+class MemoryStore(Store):
+    def __init__(self) -> None:
+        self._data: t.Dict[str, t.Tuple[t.Any, t.Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} keys={len(self._data)}>"
+
+    def _get(self, key: str) -> t.Tuple[bool, t.Any]:
+        if key not in self._data:
+            return False, None
+        value, expires = self._data[key]
+        if expires is not None and expires <= time.time():
+            del self._data[key]
+            return False, None
+        return True, value
+
+    def get_many(self, keys: t.Sequence[str]) -> t.Dict[str, t.Any]:
+        with self._lock:
+            values = {key: self._get(key) for key in keys}
+        return {key: value for key, (found, value) in values.items() if found}
+
+    def set(self, key: str, value: t.Any, *, ttl: t.Optional[float] = None) -> None:
+        with self._lock:
+            self._data[key] = (value, _expires(ttl))
+
+    def add(self, key: str, value: t.Any, *, ttl: t.Optional[float] = None) -> bool:
+        with self._lock:
+            if self._get(key)[0]:
+                return False
+            self._data[key] = (value, _expires(ttl))
+            return True
+
+    def incr(self, key: str, amount: int = 1, *, ttl: t.Optional[float] = None) -> int:
+        with self._lock:
+            found, value = self._get(key)
+            value = (value if found else 0) + amount
+            expires = self._data[key][1] if found else _expires(ttl)
+            self._data[key] = (value, expires)
+            return t.cast(int, value)
+
+    def add_member(
+        self,
+        key: str,
+        member: str,
+        *,
+        ttl: t.Optional[float] = None,
+    ) -> int:
+        with self._lock:
+            found, members = self._get(key)
+            members = {*(members if found else ()), member}
+            expires = self._data[key][1] if found else _expires(ttl)
+            self._data[key] = (members, expires)
+            return len(members)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class SQLiteStore(Store):
+    def __init__(self, path: str = ":memory:", *, codec: Codec = default_codec) -> None:
+        self.path = path
+        self.codec = codec
+        self._conn = sqlite3.connect(
+            path,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seda_store "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL)"
+        )
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.path}>"
+
+    def _purge(self, key: str) -> None:
+        self._conn.execute(
+            "DELETE FROM seda_store WHERE key = ? AND expires <= ?",
+            (key, time.time()),
+        )
+
+    def get_many(self, keys: t.Sequence[str]) -> t.Dict[str, t.Any]:
+        if not keys:
+            return {}
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, value FROM seda_store WHERE key IN ({placeholders}) "
+                "AND (expires IS NULL OR expires > ?)",
+                (*keys, time.time()),
+            ).fetchall()
+        return {key: self.codec.decode(value) for key, value in rows}
+
+    def set(self, key: str, value: t.Any, *, ttl: t.Optional[float] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "REPLACE INTO seda_store (key, value, expires) VALUES (?, ?, ?)",
+                (key, self.codec.encode(value), _expires(ttl)),
+            )
+
+    def add(self, key: str, value: t.Any, *, ttl: t.Optional[float] = None) -> bool:
+        with self._lock:
+            self._purge(key)
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO seda_store (key, value, expires) "
+                "VALUES (?, ?, ?)",
+                (key, self.codec.encode(value), _expires(ttl)),
+            )
+            return cursor.rowcount == 1
+
+    def incr(self, key: str, amount: int = 1, *, ttl: t.Optional[float] = None) -> int:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._purge(key)
+                row = self._conn.execute(
+                    "SELECT value FROM seda_store WHERE key = ?", (key,)
+                ).fetchone()
+                value = (0 if row is None else int(row[0])) + amount
+                if row is None:
+                    self._conn.execute(
+                        "INSERT INTO seda_store (key, value, expires) VALUES (?, ?, ?)",
+                        (key, str(value), _expires(ttl)),
+                    )
+                else:
+                    self._conn.execute(
+                        "UPDATE seda_store SET value = ? WHERE key = ?",
+                        (str(value), key),
+                    )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return value
+
+    def add_member(
+        self,
+        key: str,
+        member: str,
+        *,
+        ttl: t.Optional[float] = None,
+    ) -> int:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._purge(key)
+                row = self._conn.execute(
+                    "SELECT value FROM seda_store WHERE key = ?", (key,)
+                ).fetchone()
+                members = set([] if row is None else self.codec.decode(row[0]))
+                members.add(member)
+                value = self.codec.encode(sorted(members))
+                if row is None:
+                    self._conn.execute(
+                        "INSERT INTO seda_store (key, value, expires) VALUES (?, ?, ?)",
+                        (key, value, _expires(ttl)),
+                    )
+                else:
+                    self._conn.execute(
+                        "UPDATE seda_store SET value = ? WHERE key = ?",
+                        (value, key),
+                    )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return len(members)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM seda_store WHERE key = ?", (key,))
+
+
+class DynamoDBStore(Store):
+    # Items: pk (S), v (S, codec encoded), n (N, counters) or m (SS, member sets),
+    # ttl (N, epoch seconds for DynamoDB TTL), exp (N, exact expiry)
+    def __init__(
+        self,
+        table_name: str,
+        client: "Client",
+        *,
+        codec: Codec = default_codec,
+        consistent: bool = True,
+    ) -> None:
+        self.table_name = table_name
+        self.client = client
+        self.codec = codec
+        self.consistent = consistent
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.table_name}>"
+
+    @staticmethod
+    def _key(key: str) -> types.DynamoDBItem:
+        return {"pk": {"S": key}}
+
+    def _item(
+        self,
+        key: str,
+        value: t.Any,
+        ttl: t.Optional[float],
+    ) -> types.DynamoDBItem:
+        item = {"pk": {"S": key}, "v": {"S": self.codec.encode(value)}}
+        return {**item, **self._expiry(_expires(ttl))}
+
+    @staticmethod
+    def _expiry(expires: t.Optional[float]) -> types.DynamoDBItem:
+        if expires is None:
+            return {}
+        # DynamoDB TTL takes whole seconds, sub-second windows are checked on exp
+        return {
+            "ttl": {"N": str(math.ceil(expires))},
+            "exp": {"N": f"{expires:.3f}"},
+        }
+
+    def _update(
+        self,
+        key: str,
+        update: str,
+        values: types.DynamoDBItem,
+        ttl: t.Optional[float],
+    ) -> types.DynamoDBItem:
+        names = None
+        expiry = self._expiry(_expires(ttl))
+        if expiry:
+            update += " SET #ttl = if_not_exists(#ttl, :ttl)"
+            update += ", #exp = if_not_exists(#exp, :exp)"
+            names = {"#ttl": "ttl", "#exp": "exp"}
+            values = {**values, ":ttl": expiry["ttl"], ":exp": expiry["exp"]}
+        return self.client.dynamodb_update_item(
+            self.table_name,
+            self._key(key),
+            update=update,
+            names=names,
+            values=values,
+        )
+
+    @staticmethod
+    def _expired(item: types.DynamoDBItem) -> bool:
+        if "exp" in item:
+            return float(item["exp"]["N"]) <= time.time()
+        return "ttl" in item and int(item["ttl"]["N"]) <= time.time()
+
+    def _value(self, item: types.DynamoDBItem) -> t.Tuple[bool, t.Any]:
+        # Expired items linger until DynamoDB removes them in the background
+        if self._expired(item):
+            return False, None
+        if "n" in item:
+            return True, int(item["n"]["N"])
+        if "m" in item:
+            return True, set(item["m"]["SS"])
+        return True, self.codec.decode(item["v"]["S"])
+
+    def get(self, key: str) -> t.Any:
+        item = self.client.dynamodb_get_item(
+            self.table_name,
+            self._key(key),
+            consistent=self.consistent,
+        )
+        return None if item is None else self._value(item)[1]
+
+    def get_many(self, keys: t.Sequence[str]) -> t.Dict[str, t.Any]:
+        items = self.client.dynamodb_batch_get_items(
+            self.table_name,
+            [self._key(key) for key in dict.fromkeys(keys)],
+            consistent=self.consistent,
+        )
+        values = {item["pk"]["S"]: self._value(item) for item in items}
+        return {key: value for key, (found, value) in values.items() if found}
+
+    def set(self, key: str, value: t.Any, *, ttl: t.Optional[float] = None) -> None:
+        self.client.dynamodb_put_item(self.table_name, self._item(key, value, ttl))
+
+    def add(self, key: str, value: t.Any, *, ttl: t.Optional[float] = None) -> bool:
+        try:
+            self.client.dynamodb_put_item(
+                self.table_name,
+                self._item(key, value, ttl),
+                condition="attribute_not_exists(pk) OR #exp <= :now",
+                names={"#exp": "exp"},
+                values={":now": {"N": f"{time.time():.3f}"}},
+            )
+        except exceptions.ConditionFailed:
+            return False
+        return True
+
+    def incr(self, key: str, amount: int = 1, *, ttl: t.Optional[float] = None) -> int:
+        values = {":amount": {"N": str(amount)}}
+        attributes = self._update(key, "ADD n :amount", values, ttl)
+        return int(attributes["n"]["N"])
+
+    def add_member(
+        self,
+        key: str,
+        member: str,
+        *,
+        ttl: t.Optional[float] = None,
+    ) -> int:
+        values = {":member": {"SS": [member]}}
+        attributes = self._update(key, "ADD m :member", values, ttl)
+        return len(attributes["m"]["SS"])
+
+    def delete(self, key: str) -> None:
+        self.client.dynamodb_delete_item(self.table_name, self._key(key))
@@ -1,8 +1,18 @@
+import asyncio
+import hashlib
 import inspect
+import itertools
+import re
 import typing as t
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from seda import types
+from seda.codecs import Codec, default_codec
+from seda.exceptions import ExpressionError
+from seda.expressions import Expression, as_utc, get_timezone, parse, zoneinfo
+from seda.limits import TokenBucket
+from seda.metrics import Metrics
+from seda.validation import Validator, check_arguments, compile_validators
 
 
 class BaseTask:
@@ -16,7 +26,206 @@ class BaseTask:
         return f"<@task {self.path}>"
 
 
+PRIORITIES: t.Dict[types.TaskPriority, int] = {"high": 0, "default": 1, "bulk": 2}
+
+
+# SNS FIFO message group ids, alphanumeric and punctuation up to 128 characters
+_group_id_re = re.compile(r"^[A-Za-z0-9!-/:-@\[-`{-~]{1,128}$")
+
+
+def _seconds(value: t.Optional[t.Union[float, timedelta]]) -> t.Optional[float]:
+    return value.total_seconds() if isinstance(value, timedelta) else value
+
+
+class HedgePolicy:
+    def __init__(
+        self,
+        *,
+        quantile: float = 0.95,
+        delay: t.Optional[float] = None,
+        default_delay: float = 1.0,
+        min_samples: int = 20,
+    ) -> None:
+        self.quantile = quantile
+        self.delay = delay
+        self.default_delay = default_delay
+        self.min_samples = min_samples
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} p{self.quantile * 100:g}>"
+
+    def get_delay(self, metrics: Metrics, name: str) -> float:
+        if self.delay is not None:
+            return self.delay
+        if len(metrics.samples(name)) < self.min_samples:
+            return self.default_delay
+        return t.cast(float, metrics.percentile(name, self.quantile))
+
+
+class BatchPolicy:
+    def __init__(
+        self,
+        *,
+        max_items: int = 100,
+        max_wait: t.Union[float, timedelta] = 1.0,
+        max_bytes: int = 250_000,
+    ) -> None:
+        self.max_items = max_items
+        self.max_wait = t.cast(float, _seconds(max_wait))
+        self.max_bytes = max_bytes
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} max_items={self.max_items} "
+            f"max_wait={self.max_wait}s max_bytes={self.max_bytes}>"
+        )
+
+
+class CachePolicy:
+    def __init__(
+        self,
+        *,
+        ttl: t.Union[float, timedelta] = 300,
+        max_entries: int = 1024,
+        shared: bool = True,
+    ) -> None:
+        self.ttl = t.cast(float, _seconds(ttl))
+        self.max_entries = max_entries
+        self.shared = shared
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} ttl={self.ttl}s "
+            f"max_entries={self.max_entries} shared={self.shared}>"
+        )
+
+
 class Task(BaseTask):
+    def __init__(
+        self,
+        func: t.Callable,
+        *,
+        service: types.TaskService = "sns",
+        priority: types.TaskPriority = "default",
+        codec: t.Optional[Codec] = None,
+        idempotent: bool = False,
+        dedupe: bool = False,
+        key: t.Optional[t.Callable[..., t.Hashable]] = None,
+        hedge: t.Optional[HedgePolicy] = None,
+        executor: t.Optional[str] = None,
+        workers: t.Optional[int] = None,
+        max_concurrency: t.Optional[int] = None,
+        batch: t.Optional[BatchPolicy] = None,
+        cache: t.Optional[CachePolicy] = None,
+        rate_limit: t.Optional[TokenBucket] = None,
+        debounce: t.Optional[t.Union[float, timedelta]] = None,
+        throttle: t.Optional[t.Union[float, timedelta]] = None,
+        ordered_by: t.Optional[t.Callable[..., t.Hashable]] = None,
+        function: t.Optional[str] = None,
+        validate: bool = False,
+    ) -> None:
+        super().__init__(func)
+        self.service = service
+        self.priority = priority
+        self.codec = codec or default_codec
+        self.idempotent = idempotent
+        self.dedupe = dedupe
+        self.key = key
+        self.hedge = hedge
+        self.executor = executor
+        self.workers = workers
+        self.max_concurrency = max_concurrency
+        self.batch = batch
+        self.cache = cache
+        self.rate_limit = rate_limit
+        self.debounce = _seconds(debounce)
+        self.throttle = _seconds(throttle)
+        self.ordered_by = ordered_by
+        self.function = function
+        self.validate = validate
+        self.signature = inspect.signature(func)
+        self._validators: t.Optional[t.Dict[str, Validator]] = None
+
+        if priority not in PRIORITIES:
+            raise ValueError(f'Task {self!r} priority "{priority}" is not valid.')
+
+        if ordered_by is not None and (service != "sns" or priority != "default"):
+            raise ValueError(f"Ordered task {self!r} must use the default sns lane.")
+
+        if ordered_by is not None and function is not None:
+            raise ValueError(f"Ordered task {self!r} cannot be routed to a function.")
+
+        if max_concurrency is not None and executor is None:
+            self.executor = "thread"
+
+        if self.executor is not None and self.is_generator:
+            raise ValueError(f"Generator task {self!r} cannot run on an executor.")
+
+        if cache is not None and (self.is_generator or batch is not None):
+            raise ValueError(f"Task {self!r} results cannot be cached.")
+
+        if debounce is not None and (throttle is not None or batch is not None):
+            raise ValueError(f"Debounced task {self!r} cannot be throttled or batched.")
+
+        if key is not None and not (dedupe or debounce or throttle):
+            if idempotent:
+                raise ValueError(
+                    f"Task {self!r} key requires dedupe=True, "
+                    "idempotent only allows hedging."
+                )
+            raise ValueError(
+                f"Task {self!r} key requires dedupe, debounce or throttle."
+            )
+
+        if hedge is not None and not idempotent:
+            raise ValueError(f"Hedged task {self!r} must be idempotent.")
+
+    def get_call_key(self, args: t.Sequence, kwargs: t.Dict[str, t.Any]) -> str:
+        if self.key is not None:
+            return str(self.key(*args, **kwargs))
+        payload = self.codec.encode([args, kwargs])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def check_call(self, args: t.Sequence, kwargs: t.Dict[str, t.Any]) -> None:
+        try:
+            bound = self.signature.bind(*args, **kwargs)
+        except TypeError as exc:
+            raise TypeError(f"{self!r} {exc}") from None
+        if not self.validate:
+            return
+
+        # Hints are resolved on first use, once forward references are importable
+        if self._validators is None:
+            self._validators = compile_validators(self.func, self.signature)
+        error = check_arguments(bound.arguments, self.signature, self._validators)
+        if error is not None:
+            raise TypeError(f"{self!r} {error}.")
+
+    def get_group_id(self, data: types.EventTask) -> t.Optional[str]:
+        if self.ordered_by is None:
+            return None
+        # Map and batch payloads carry several keys, they are ordered per task
+        if any(key in data for key in ("map", "batch")):
+            return self.path
+        args, kwargs = data.get("args") or (), data.get("kwargs") or {}
+        group_id = str(self.ordered_by(*args, **kwargs))
+        # Keys SNS would reject are hashed, equal keys still share a group
+        if not _group_id_re.match(group_id):
+            return hashlib.sha256(group_id.encode()).hexdigest()
+        return group_id
+
+    @property
+    def is_async(self) -> bool:
+        return asyncio.iscoroutinefunction(self.func) or inspect.isasyncgenfunction(
+            self.func
+        )
+
+    @property
+    def is_generator(self) -> bool:
+        return inspect.isgeneratorfunction(self.func) or inspect.isasyncgenfunction(
+            self.func
+        )
+
     def __eq__(self, other: t.Any) -> bool:
         if not isinstance(other, Task):
             return NotImplemented
@@ -53,6 +262,61 @@ class Schedule(BaseTask):
         self.start_date = start_date
         self.end_date = end_date
         self.kms_key = kms_key
+        self.validate()
+
+    @property
+    def parsed_expression(self) -> Expression:
+        return parse(self.expression)
+
+    def validate(self) -> None:
+        expression = self.parsed_expression
+        # Cron fields can combine into dates that do not exist, e.g. February 30
+        epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+        if expression.kind == "cron" and expression.next_after(epoch) is None:
+            raise ExpressionError(f'Expression "{self.expression}" never fires.')
+        if zoneinfo is not None:
+            get_timezone(self.timezone)
+
+    def next_after(self, after: datetime) -> t.Optional[datetime]:
+        after = as_utc(after)
+        expression = self.parsed_expression
+        # Rates are fixed intervals of absolute time, DST only shifts wall clocks
+        tz = timezone.utc if expression.kind == "rate" else get_timezone(self.timezone)
+        start = None
+        if self.start_date is not None:
+            start = as_utc(self.start_date).astimezone(tz)
+        fire_time = expression.next_after(after.astimezone(tz), start=start)
+
+        # Wall-clock times repeated by DST transitions
+        while fire_time is not None and fire_time.astimezone(timezone.utc) <= after:
+            fire_time = expression.next_after(fire_time, start=start)
+        if fire_time is None:
+            return None
+        fire_time = fire_time.astimezone(timezone.utc)
+
+        if self.end_date is not None and fire_time > as_utc(self.end_date):
+            return None
+        return fire_time
+
+    def iter_fire_times(
+        self,
+        after: datetime,
+        until: t.Optional[datetime] = None,
+    ) -> t.Iterator[datetime]:
+        until = None if until is None else as_utc(until)
+        fire_time = self.next_after(after)
+
+        while fire_time is not None and (until is None or fire_time <= until):
+            yield fire_time
+            fire_time = self.next_after(fire_time)
+
+    def next_fire_times(
+        self,
+        n: int = 1,
+        after: t.Optional[datetime] = None,
+    ) -> t.List[datetime]:
+        after = datetime.now(timezone.utc) if after is None else after
+        return list(itertools.islice(self.iter_fire_times(after), n))
 
     @property
     def identity(self) -> t.Tuple:
@@ -68,6 +332,22 @@ class Schedule(BaseTask):
             self.end_date,
         )
 
+    def replace(self, **changes: t.Any) -> "Schedule":
+        options: t.Dict[str, t.Any] = {
+            "expression": self.expression,
+            "args": self.args,
+            "kwargs": self.kwargs,
+            "timezone": self.timezone,
+            "time_window": self.time_window,
+            "dead_letter_arn": self.dead_letter_arn,
+            "retry_policy": self.retry_policy,
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+            "kms_key": self.kms_key,
+        }
+        options.update(changes)
+        return self.__class__(self.func, **options)
+
     def __repr__(self) -> str:
         return f"<@schedule {self.path}({self.expression})>"
 
@@ -16,6 +16,12 @@ else:
 
 LambdaEvent = t.Dict[str, t.Any]
 Lifespan = Literal["auto", "on", "off"]
+JitterMode = Literal["off", "window", "offset"]
+OutboxMode = Literal["fallback", "always"]
+# Where the result of a delivery that did not run the task came from
+ClaimSource = Literal["cache", "replay"]
+TaskService = Literal["sns", "lambda"]
+TaskPriority = Literal["high", "default", "bulk"]
 PolicyVersion = Literal["2012-10-17", "2012-10-17", "2008-10-17"]
 SubscriptionProtocol = Literal[
     "http",
@@ -172,6 +178,19 @@ class SNSPublishResponse(Response):
     MessageId: str
 
 
+class SNSPublishBatchResultEntry(TypedDict):
+    Id: str
+    MessageId: NotRequired[str]
+    Code: NotRequired[str]
+    Message: NotRequired[str]
+    SenderFault: NotRequired[bool]
+
+
+class SNSPublishBatchResponse(Response):
+    Successful: t.List[SNSPublishBatchResultEntry]
+    Failed: t.List[SNSPublishBatchResultEntry]
+
+
 class CreateSubscriptionResponse(Response):
     SubscriptionArn: str
 
@@ -209,10 +228,73 @@ class EventRecord(TypedDict):
     Sns: SNSRecord
 
 
+class SQSRecord(TypedDict):
+    messageId: str
+    receiptHandle: str
+    body: str
+    attributes: t.Dict[str, str]
+    messageAttributes: t.Dict[str, t.Any]
+    eventSource: str
+    eventSourceARN: str
+    awsRegion: str
+
+
+class CreateSQSQueueResponse(Response):
+    QueueUrl: str
+
+
+class EventSourceMapping(TypedDict):
+    UUID: str
+    EventSourceArn: str
+    FunctionArn: str
+    BatchSize: int
+    State: str
+
+
+class ListEventSourceMappingsResponse(Response):
+    EventSourceMappings: t.List[EventSourceMapping]
+
+
+DynamoDBItem = t.Dict[str, t.Dict[str, t.Any]]
+
+
+class CreateDynamoDBTableResponse(Response):
+    TableDescription: t.Dict[str, t.Any]
+
+
+class EventStep(TypedDict):
+    path: NotRequired[str]
+    args: NotRequired[t.Sequence]
+    kwargs: NotRequired[t.Optional[t.Dict[str, t.Any]]]
+    group: NotRequired[t.List[t.List["EventStep"]]]
+
+
+class EventChord(TypedDict):
+    id: str
+    index: int
+    size: int
+    chain: t.List[EventStep]
+    parent: t.Optional["EventChord"]
+
+
+class EventDebounce(TypedDict):
+    key: str
+    token: str
+    deadline: float
+
+
 class EventTask(TypedDict):
     path: str
     args: t.Optional[t.Sequence]
     kwargs: t.Optional[t.Dict[str, t.Any]]
+    rpc: NotRequired[bool]
+    cursor: NotRequired[t.Any]
+    map: NotRequired[t.Sequence]
+    batch: NotRequired[t.Sequence[t.Sequence]]
+    chain: NotRequired[t.List[EventStep]]
+    chord: NotRequired[EventChord]
+    result_id: NotRequired[str]
+    debounce: NotRequired[EventDebounce]
 
 
 class ScheduleTaskContext(TypedDict):
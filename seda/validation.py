@@ -0,0 +1,83 @@
+import inspect
+import sys
+import typing as t
+
+if sys.version_info < (3, 8):  # pragma: no cover
+    from typing_extensions import Literal
+else:  # pragma: no cover
+    from typing import Literal
+
+Validator = t.Callable[[t.Any], bool]
+
+# PEP 484 numeric tower, ints are accepted where floats are expected
+NUMERIC_TYPES: t.Dict[type, t.Tuple[type, ...]] = {
+    float: (float, int),
+    complex: (complex, float, int),
+}
+
+
+def compile_hint(hint: t.Any) -> t.Optional[Validator]:
+    if hint is t.Any or hint is inspect.Parameter.empty:
+        return None
+
+    supertype = getattr(hint, "__supertype__", None)
+    if supertype is not None:
+        return compile_hint(supertype)
+
+    origin = getattr(hint, "__origin__", None)
+    args = getattr(hint, "__args__", ())
+    if origin is t.Union or type(hint).__name__ == "UnionType":
+        compiled = [compile_hint(arg) for arg in args]
+        if any(validator is None for validator in compiled):
+            return None
+        validators = t.cast(t.List[Validator], compiled)
+        return lambda value: any(validator(value) for validator in validators)
+    if origin is Literal:
+        choices = tuple(args)
+        return lambda value: value in choices
+    if isinstance(origin, type):
+        return lambda value: isinstance(value, origin)
+    if isinstance(hint, type):
+        types = NUMERIC_TYPES.get(hint, (hint,))
+        return lambda value: isinstance(value, types)
+    # Type variables, protocols and unresolved references are not checked
+    return None
+
+
+def compile_validators(
+    func: t.Callable,
+    signature: inspect.Signature,
+) -> t.Dict[str, Validator]:
+    try:
+        hints = t.get_type_hints(func)
+    except Exception:
+        return {}
+
+    validators = {}
+    for name in signature.parameters:
+        validator = compile_hint(hints.get(name, inspect.Parameter.empty))
+        if validator is not None:
+            validators[name] = validator
+    return validators
+
+
+def check_arguments(
+    arguments: t.Dict[str, t.Any],
+    signature: inspect.Signature,
+    validators: t.Dict[str, Validator],
+) -> t.Optional[str]:
+    for name, validator in validators.items():
+        if name not in arguments:
+            continue
+        kind = signature.parameters[name].kind
+        if kind is inspect.Parameter.VAR_POSITIONAL:
+            values = list(arguments[name])
+        elif kind is inspect.Parameter.VAR_KEYWORD:
+            values = list(arguments[name].values())
+        else:
+            values = [arguments[name]]
+
+        for value in values:
+            if not validator(value):
+                return f"argument {name!r} got {type(value).__name__}"
+    return None
@@ -0,0 +1,146 @@
+import typing as t
+import uuid
+
+from seda import types
+from seda.run import get_task
+from seda.tasks import Task
+
+if t.TYPE_CHECKING:
+    from seda.app import Seda
+
+CHORD_TTL = 7 * 24 * 3600
+
+_unset: t.Any = object()
+
+
+class Workflow:
+    def __init__(self, app: "Seda", steps: t.List[types.EventStep]) -> None:
+        self.app = app
+        self.steps = steps
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} steps={len(self.steps)}>"
+
+    def __or__(self, other: "Workflow") -> "Workflow":
+        return chain(self, other)
+
+    def __call__(self) -> None:
+        dispatch(self.app, self.steps)
+
+
+class Signature(Workflow):
+    def __init__(
+        self,
+        app: "Seda",
+        task: Task,
+        args: t.Sequence = (),
+        kwargs: t.Optional[t.Dict[str, t.Any]] = None,
+    ) -> None:
+        self.task = task
+        self.args = tuple(args)
+        self.kwargs = kwargs or {}
+        step = types.EventStep(path=task.path, args=self.args, kwargs=self.kwargs)
+        super().__init__(app, [step])
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.task.path}{self.args!r}>"
+
+
+def chain(*workflows: Workflow) -> Workflow:
+    if not workflows:
+        raise ValueError("chain() requires at least one task.")
+    return Workflow(
+        workflows[0].app,
+        [step for workflow in workflows for step in workflow.steps],
+    )
+
+
+def group(*workflows: Workflow) -> Workflow:
+    if not workflows:
+        raise ValueError("group() requires at least one task.")
+    step = types.EventStep(group=[workflow.steps for workflow in workflows])
+    return Workflow(workflows[0].app, [step])
+
+
+def chord(header: t.Sequence[Workflow], callback: Workflow) -> Workflow:
+    return chain(group(*header), callback)
+
+
+def dispatch(
+    app: "Seda",
+    steps: t.List[types.EventStep],
+    chord: t.Optional[types.EventChord] = None,
+    result: t.Any = _unset,
+) -> None:
+    step, rest = steps[0], steps[1:]
+
+    if "group" in step:
+        members = step["group"]
+        if not rest and chord is None:
+            for member in members:
+                dispatch(app, member, None, result)
+            return
+
+        chord_id = uuid.uuid4().hex
+        for idx, member in enumerate(members):
+            info = types.EventChord(
+                id=chord_id,
+                index=idx,
+                size=len(members),
+                chain=rest,
+                parent=chord,
+            )
+            dispatch(app, member, info, result)
+        return
+
+    args = tuple(step.get("args") or ())
+    if result is not _unset:
+        args = (result, *args)
+    data = types.EventTask(path=step["path"], args=args, kwargs=step.get("kwargs"))
+    if rest:
+        data["chain"] = rest
+    if chord is not None:
+        data["chord"] = chord
+    app.continue_task(get_task(step["path"]), data)
+
+
+def complete(app: "Seda", data: types.EventTask, result: t.Any) -> None:
+    chain = data.get("chain") or []
+    chord = data.get("chord")
+
+    while not chain:
+        if chord is None:
+            return
+        results = _join(app, chord, result)
+        if results is None:
+            return
+        chain, chord, result = chord["chain"], chord["parent"], results
+
+    dispatch(app, chain, chord, result)
+
+
+def _join(
+    app: "Seda",
+    chord: types.EventChord,
+    result: t.Any,
+) -> t.Optional[t.List[t.Any]]:
+    prefix = f"seda:chord:{chord['id']}"
+
+    # The result is written before the member joins the set, a single atomic
+    # update, so a crash in between is repaired by the redelivery
+    app.store.set(f"{prefix}:{chord['index']}", result, ttl=CHORD_TTL)
+    members = app.store.add_member(
+        f"{prefix}:members",
+        str(chord["index"]),
+        ttl=CHORD_TTL,
+    )
+    # Members delivered again after the chord completed see a full set too,
+    # only the first of them sends the callback
+    if members != chord["size"] or not app.store.add(
+        f"{prefix}:fired", True, ttl=CHORD_TTL
+    ):
+        return None
+
+    keys = [f"{prefix}:{idx}" for idx in range(chord["size"])]
+    values = app.store.get_many(keys)
+    return [values.get(key) for key in keys]
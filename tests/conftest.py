@@ -0,0 +1,52 @@
+import typing as t
+
+import pytest
+
+from seda import Seda, types
+
+AppFactory = t.Callable[..., Seda]
+
+
+class LambdaContext:
+    aws_request_id = "test"
+    client_context = None
+    function_name = "api"
+    function_version = "$LATEST"
+    identity = None
+    invoked_function_arn = "arn:aws:lambda:us-east-1:123456789012:function:api"
+    log_group_name = "/aws/lambda/api"
+    log_stream_name = "test"
+    memory_limit_in_mb = 128
+
+    def __init__(self, remaining: float = 900.0) -> None:
+        self.remaining = remaining
+
+    def get_remaining_time_in_millis(self) -> int:
+        return int(self.remaining * 1000)
+
+
+@pytest.fixture
+def app() -> Seda:
+    # Seda is a singleton, a new instance resets the state left by other tests
+    return Seda()
+
+
+@pytest.fixture
+def make_app() -> AppFactory:
+    # Apps talking to AWS, with credentials and account set to skip any lookup
+    def factory(**kwargs: t.Any) -> Seda:
+        options: t.Dict[str, t.Any] = {
+            "function_name": "api",
+            "region": "us-east-1",
+            "access_key_id": "test",
+            "secret_access_key": "test",
+            "account_id": "123456789012",
+        }
+        return Seda(**{**options, **kwargs})
+
+    return factory
+
+
+@pytest.fixture
+def lambda_context() -> types.LambdaContext:
+    return t.cast(types.LambdaContext, LambdaContext())
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta, timezone
+
+from seda.analysis import find_peaks, flatten_peaks, get_offset, jitter, project_load
+from seda.tasks import Schedule
+
+AFTER = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def noop() -> None:
+    pass
+
+
+def get_schedule(expression: str) -> Schedule:
+    return Schedule(noop, expression, args=None, kwargs=None)
+
+
+def test_project_load_buckets_fire_times() -> None:
+    hourly = get_schedule("cron(0 * * * ? *)")
+    daily = get_schedule("cron(0 9 * * ? *)")
+    load = project_load([hourly, daily], AFTER, AFTER + timedelta(days=1))
+
+    assert len(load) == 24
+    assert load[AFTER.replace(hour=9)] == [hourly, daily]
+    assert find_peaks(load) == [(AFTER.replace(hour=9), 2)]
+    assert find_peaks({}) == []
+
+
+def test_offset_jitter_is_deterministic() -> None:
+    schedule = get_schedule("cron(0 9 * * ? *)")
+    offset = get_offset(schedule, 15)
+    jittered = jitter(schedule, "offset")
+
+    assert jittered.expression == f"cron({offset} 9 * * ? *)"
+    assert jitter(schedule, "offset").expression == jittered.expression
+    assert jittered.time_window is None
+
+
+def test_offset_jitter_keeps_steps() -> None:
+    schedule = get_schedule("cron(0/30 * * * ? *)")
+    offset = get_offset(schedule, 15)
+
+    assert jitter(schedule, "offset").expression == f"cron({offset}/30 * * * ? *)"
+
+
+def test_window_jitter() -> None:
+    # Minute lists cannot be shifted, a flexible window is used instead
+    schedule = jitter(get_schedule("cron(0,30 9 * * ? *)"), "offset", 10)
+    at = get_schedule("at(2030-01-01T09:00:00)")
+
+    assert schedule.time_window == {"Mode": "FLEXIBLE", "MaximumWindowInMinutes": 10}
+    assert jitter(get_schedule("rate(1 hour)"), "window").time_window is not None
+    assert jitter(at, "window") is at
+    assert jitter(schedule, "off") is schedule
+
+
+def test_flatten_only_crowded_schedules() -> None:
+    crowded = [
+        get_schedule("cron(0 9 * * ? *)"),
+        get_schedule("cron(0 9 ? * * *)"),
+        get_schedule("cron(0 9,21 * * ? *)"),
+    ]
+    quiet = get_schedule("cron(17 13 * * ? *)")
+    schedules = flatten_peaks(
+        [*crowded, quiet],
+        "window",
+        after=AFTER,
+        until=AFTER + timedelta(days=1),
+        threshold=3,
+    )
+
+    assert all(schedule.time_window is not None for schedule in schedules[:3])
+    assert schedules[3] is quiet
@@ -0,0 +1,60 @@
+import atexit
+import typing as t
+
+import pytest
+
+from seda import Seda
+from seda.batching import pack
+from seda.codecs import JSONCodec
+from seda.tasks import BatchPolicy
+from tests.conftest import AppFactory
+
+
+def track(events: t.List[t.Any]) -> None:
+    pass
+
+
+def spy_publish(app: Seda, monkeypatch: pytest.MonkeyPatch) -> t.List[t.Any]:
+    published: t.List[t.Any] = []
+    monkeypatch.setattr(
+        app, "publish", lambda task, data, **kwargs: published.append(data["batch"])
+    )
+    return published
+
+
+def test_pack_respects_limits() -> None:
+    chunks = list(pack(range(10), JSONCodec(), max_items=4))
+    # 1024 envelope bytes leave room for four 103 byte items
+    sized = list(pack(["x" * 100] * 10, JSONCodec(), target_bytes=1500))
+
+    assert chunks == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    assert [len(chunk) for chunk in sized] == [4, 4, 2]
+
+
+def test_batch_publishes_at_max_items(
+    make_app: AppFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    app = make_app()
+    published = spy_publish(app, monkeypatch)
+    task = app.task(batch=BatchPolicy(max_items=2, max_wait=60))(track)
+    task("a")
+    assert published == []
+
+    task("b")
+    assert published == [[("a",), ("b",)]]
+
+
+def test_batch_flushed_at_exit(
+    make_app: AppFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    hooks: t.List[t.Callable] = []
+    monkeypatch.setattr(atexit, "register", hooks.append)
+    app = make_app()
+    published = spy_publish(app, monkeypatch)
+    task = app.task(batch=BatchPolicy(max_items=10, max_wait=60))(track)
+    task("a")
+    task("b")
+
+    for hook in hooks:
+        hook()
+    assert published == [[("a",), ("b",)]]
@@ -0,0 +1,104 @@
+import time
+import typing as t
+
+import pytest
+from botocore.awsrequest import AWSResponse
+from botocore.exceptions import ClientError
+
+from seda.breaker import CLOSED, HALF_OPEN, OPEN, BreakerPolicy, CircuitBreaker
+from seda.exceptions import CircuitOpen
+from tests.conftest import AppFactory
+
+TOPIC_ARN = "arn:aws:sns:us-east-1:123456789012:seda-api"
+
+
+def get_breaker(latency: t.Optional[float] = None) -> CircuitBreaker:
+    policy = BreakerPolicy(min_calls=4, reset_timeout=0.05, latency=latency)
+    return CircuitBreaker("sns.Publish", policy)
+
+
+def test_opens_above_error_rate() -> None:
+    breaker = get_breaker()
+    for failed in (False, True, False):
+        breaker.record(0.01, failed=failed)
+    assert breaker.state == CLOSED
+
+    breaker.record(0.01, failed=True)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpen):
+        breaker.before()
+
+
+def test_slow_calls_count_as_failures() -> None:
+    breaker = get_breaker(latency=0.1)
+    for _ in range(4):
+        breaker.record(0.5, failed=False)
+
+    assert breaker.state == OPEN
+
+
+def test_half_open_probe_closes() -> None:
+    breaker = get_breaker()
+    for _ in range(4):
+        breaker.record(0.01, failed=True)
+    time.sleep(0.06)
+
+    breaker.before()
+    assert breaker.state == HALF_OPEN
+    # Only one probe is let through
+    with pytest.raises(CircuitOpen):
+        breaker.before()
+
+    breaker.record(0.01, failed=False)
+    assert breaker.state == CLOSED
+    breaker.before()
+
+
+def test_failed_probe_reopens() -> None:
+    breaker = get_breaker()
+    for _ in range(4):
+        breaker.record(0.01, failed=True)
+    time.sleep(0.06)
+
+    breaker.before()
+    breaker.record(0.01, failed=True)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpen):
+        breaker.before()
+
+
+def test_metrics_count_transitions() -> None:
+    breaker = get_breaker()
+    for _ in range(4):
+        breaker.record(0.01, failed=True)
+    with pytest.raises(CircuitOpen):
+        breaker.before()
+
+    assert breaker.metrics.count("breaker.open.sns.Publish") == 1
+    assert breaker.metrics.count("breaker.rejected.sns.Publish") == 1
+
+
+class RawResponse:
+    def stream(self, **kwargs: t.Any) -> t.Iterator[bytes]:
+        yield b"<ErrorResponse><Error><Code>Throttling</Code></Error></ErrorResponse>"
+
+
+def test_client_rejects_calls_while_open(make_app: AppFactory) -> None:
+    app = make_app(breaker=BreakerPolicy(min_calls=2, reset_timeout=60))
+    sent: t.List[str] = []
+
+    def send(request: t.Any, **kwargs: t.Any) -> AWSResponse:
+        sent.append(request.url)
+        return AWSResponse(request.url, 400, {}, RawResponse())
+
+    # Clients with a timeout do not retry
+    sns = app.client.client("sns", timeout=1)
+    sns.meta.events.register("before-send", send)
+    for _ in range(2):
+        with pytest.raises(ClientError):
+            sns.publish(TopicArn=TOPIC_ARN, Message="{}")
+    assert app.client.breakers["sns.Publish"].state == OPEN
+
+    with pytest.raises(CircuitOpen):
+        sns.publish(TopicArn=TOPIC_ARN, Message="{}")
+    assert len(sent) == 2
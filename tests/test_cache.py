@@ -0,0 +1,93 @@
+import threading
+import time
+import typing as t
+from pathlib import Path
+
+from seda import Seda, task
+from seda.cache import Cache
+from seda.tasks import CachePolicy
+from seda.workflows import chain
+
+calls: t.List[int] = []
+received: t.List[int] = []
+
+
+@task(cache=CachePolicy(ttl=60))
+def double(value: int) -> int:
+    calls.append(value)
+    return value * 2
+
+
+@task
+def collect(value: int) -> None:
+    received.append(value)
+
+
+def test_cached_submit_fulfils_result(app: Seda) -> None:
+    calls.clear()
+    first = double.submit(2)
+    second = double.submit(2)
+
+    assert first.get(timeout=1) == 4
+    assert second.get(timeout=1) == 4
+    assert calls == [2]
+
+
+def test_cached_chain_continues(app: Seda) -> None:
+    calls.clear()
+    received.clear()
+    double.submit(3).get(timeout=1)
+    chain(t.cast(t.Any, double).s(3), t.cast(t.Any, collect).s())()
+
+    assert calls == [3]
+    assert received == [6]
+
+
+def test_get_or_set_single_flight() -> None:
+    cache = Cache()
+    started = threading.Event()
+    release = threading.Event()
+    results: t.List[int] = []
+    loads: t.List[int] = []
+
+    def load() -> int:
+        loads.append(1)
+        started.set()
+        release.wait(1)
+        return 42
+
+    def worker() -> None:
+        results.append(cache.get_or_set("key", load))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    threads[0].start()
+    started.wait(1)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert loads == [1]
+    assert results == [42] * 4
+
+
+def test_disk_promotion_keeps_expiry(tmp_path: Path) -> None:
+    cache = Cache(path=str(tmp_path))
+    cache.set("key", "value", ttl=0.1)
+    # A new container only has the disk tier
+    cache.local.clear()
+
+    assert cache.get("key") == "value"
+    time.sleep(0.15)
+    assert cache.get("key") is None
+
+
+def test_disk_write_is_best_effort(tmp_path: Path) -> None:
+    cache = Cache(path=str(tmp_path))
+    value = object()
+    cache.set("key", value, ttl=60)
+
+    assert cache.get("key") is value
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,70 @@
+import json
+import typing as t
+
+import pytest
+
+from seda import Seda
+from seda.tasks import BatchPolicy
+from tests.conftest import AppFactory
+
+batches: t.List[t.List[t.Any]] = []
+
+
+def square(value: int) -> int:
+    return value * value
+
+
+def store(rows: t.List[t.Tuple[str]]) -> int:
+    batches.append([row for (row,) in rows])
+    return len(rows)
+
+
+def test_chunked_runs_map_chunks(app: Seda) -> None:
+    task: t.Any = app.task(square)
+
+    assert task.chunked(range(10), max_items=4) == [
+        [0, 1, 4, 9],
+        [16, 25, 36, 49],
+        [64, 81],
+    ]
+
+
+def test_chunked_batch_task(app: Seda) -> None:
+    batches.clear()
+    task = app.task(batch=BatchPolicy(max_items=100))(store)
+
+    assert task.chunked(["a", "b", "c"], max_items=2) == [2, 1]
+    assert batches == [["a", "b"], ["c"]]
+
+
+def test_chunked_messages_fit_target(
+    make_app: AppFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    app = make_app()
+    messages: t.List[str] = []
+    monkeypatch.setattr(
+        app,
+        "publish",
+        lambda task, data: messages.append(app.encode_message(task, data)),
+    )
+    task: t.Any = app.task(square)
+    items = ["x" * (index * 10) for index in range(50)]
+    task.chunked(items, target_bytes=4096)
+
+    chunks = [json.loads(message)["task"]["map"] for message in messages]
+    assert len(chunks) > 1
+    assert all(len(message) <= 4096 for message in messages)
+    assert sorted(item for chunk in chunks for item in chunk) == sorted(items)
+
+
+def test_chunked_checks_every_item(
+    make_app: AppFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    app = make_app()
+    task: t.Any = app.task(validate=True)(square)
+    published: t.List[t.Any] = []
+    monkeypatch.setattr(app, "publish", lambda *args: published.append(args))
+
+    with pytest.raises(TypeError, match="value"):
+        task.chunked([1, 2, "3"], max_items=1)
+    assert published == []
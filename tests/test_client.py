@@ -1,2 +1,30 @@
+from seda.client import Client, get_timeout_bucket
+from seda.session import Session
+
+
 def test_client() -> None:
     assert True
+
+
+def test_timeout_bucket() -> None:
+    assert get_timeout_bucket(0.2) == 1
+    assert get_timeout_bucket(4.99) == 2
+    assert get_timeout_bucket(29.5) == 10
+    assert get_timeout_bucket(3600) == 900
+
+
+def test_client_cache_is_bounded() -> None:
+    client = Client(
+        Session(
+            "us-east-1",
+            access_key_id="testing",
+            secret_access_key="testing",
+        )
+    )
+    clients = {
+        id(client.client("lambda", timeout=remaining / 10))
+        for remaining in range(1, 10000)
+    }
+
+    assert len(clients) == len(client._client_cache) == 9
+    assert client.client("lambda", timeout=7.5).meta.config.read_timeout == 5
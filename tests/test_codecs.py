@@ -0,0 +1,57 @@
+import base64
+import json
+import pickle
+import typing as t
+from datetime import date
+
+from seda import Seda, task, types
+from seda.codecs import Codec, JSONCodec
+
+received: t.List[t.Any] = []
+
+
+class PickleCodec(Codec):
+    def encode(self, obj: t.Any) -> str:
+        return base64.b64encode(pickle.dumps(obj)).decode()
+
+    def decode(self, data: t.Union[str, bytes]) -> t.Any:
+        return pickle.loads(base64.b64decode(data))
+
+
+@task(codec=PickleCodec())
+def pickled(value: t.Any) -> None:
+    received.append(value)
+
+
+@task
+def plain(value: t.Any) -> None:
+    received.append(value)
+
+
+def sns_event(message: str) -> types.LambdaEvent:
+    return {"Records": [{"Sns": {"Message": message, "MessageAttributes": {}}}]}
+
+
+def test_custom_codec_round_trip(lambda_context: types.LambdaContext) -> None:
+    received.clear()
+    app = Seda()
+    definition = pickled.definition  # type: ignore[attr-defined]
+    data = types.EventTask(path=definition.path, args=[date(2024, 1, 2)], kwargs={})
+    message = app.encode_message(definition, data)
+
+    assert json.loads(message)["task"]["path"] == definition.path
+    app.handle(sns_event(message), lambda_context)
+    assert received == [date(2024, 1, 2)]
+
+
+def test_json_envelope_is_unchanged(lambda_context: types.LambdaContext) -> None:
+    received.clear()
+    app = Seda()
+    definition = plain.definition  # type: ignore[attr-defined]
+    data = types.EventTask(path=definition.path, args=[1], kwargs={})
+    message = app.encode_message(definition, data)
+
+    assert json.loads(message) == {"task": data}
+    assert isinstance(definition.codec, JSONCodec)
+    app.handle(sns_event(message), lambda_context)
+    assert received == [1]
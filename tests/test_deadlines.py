@@ -0,0 +1,69 @@
+import typing as t
+
+import anyio
+import pytest
+
+from seda import Seda, current_task, types
+from seda.run import get_task, run_task
+
+PAGES = 10
+pages: t.List[int] = []
+cursors: t.List[t.Any] = []
+
+
+class LambdaContext:
+    def __init__(self, remaining: float) -> None:
+        self.remaining = remaining
+
+    def get_remaining_time_in_millis(self) -> int:
+        return int(self.remaining * 1000)
+
+
+async def export() -> None:
+    ctx = current_task()
+    cursors.append(ctx.cursor)
+    for page in range(ctx.cursor or 0, PAGES):
+        await anyio.sleep(0.03)
+        pages.append(page)
+        ctx.checkpoint(page + 1)
+
+
+async def stall() -> None:
+    await anyio.sleep(1)
+
+
+def report() -> t.Tuple[t.Optional[float], t.Optional[float]]:
+    ctx = current_task()
+    return ctx.remaining, ctx.time_left
+
+
+def run(path: str, app: Seda, remaining: float) -> t.Any:
+    data = types.EventTask(path=path, args=None, kwargs=None)
+    context = t.cast(types.LambdaContext, LambdaContext(remaining))
+    return run_task(data, task=get_task(path), app=app, context=context)
+
+
+def test_checkpointed_task_continues(app: Seda) -> None:
+    pages.clear()
+    cursors.clear()
+    # The task is cancelled 2 seconds before the Lambda timeout
+    run("tests.test_deadlines.export", app, 2.1)
+
+    assert pages == list(range(PAGES))
+    assert len(cursors) == 2 and cursors[0] is None and cursors[1] > 0
+
+
+def test_task_without_checkpoint_times_out(app: Seda) -> None:
+    with pytest.raises(TimeoutError):
+        run("tests.test_deadlines.stall", app, 2.05)
+
+
+def test_time_left_includes_margin(app: Seda) -> None:
+    task = app.task(report)
+    remaining, time_left = run("tests.test_deadlines.report", app, 5)
+    assert remaining is not None and 4.5 < remaining <= 5
+    assert time_left is not None and 2.5 < time_left <= 3
+    assert task() == (None, None)
+
+    with pytest.raises(RuntimeError):
+        current_task()
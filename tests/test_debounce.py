@@ -0,0 +1,137 @@
+import copy
+import threading
+import time
+import typing as t
+
+import pytest
+
+from seda import Seda, types
+from seda.batching import Debouncer
+from seda.stores import DynamoDBStore, MemoryStore
+from tests.conftest import AppFactory
+
+
+def get_debouncers(
+    app: Seda, monkeypatch: pytest.MonkeyPatch, count: int
+) -> t.Tuple[t.List[Debouncer], t.List[types.EventTask]]:
+    @app.task(debounce=0.05, key=lambda doc_id, rev: doc_id)
+    def reindex(doc_id: str, rev: int) -> None:
+        pass
+
+    app._store = MemoryStore()
+    sent: t.List[types.EventTask] = []
+    monkeypatch.setattr(app, "publish", lambda task, data, **kwargs: sent.append(data))
+    monkeypatch.setattr(
+        app,
+        "defer_task",
+        lambda task, data, deadline: sent.append(copy.deepcopy(data)),
+    )
+    return [Debouncer(app, app.tasks[-1]) for _ in range(count)], sent
+
+
+def test_debounce_collapses_local_calls(
+    make_app: AppFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    app = make_app()
+    (debouncer,), sent = get_debouncers(app, monkeypatch, 1)
+    debouncer.add(("a", 1), {})
+    debouncer.add(("a", 2), {})
+    debouncer.flush()
+
+    assert [data["args"] for data in sent] == [("a", 2)]
+
+
+def test_debounce_collapses_across_containers(
+    make_app: AppFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    app = make_app()
+    (first, second), sent = get_debouncers(app, monkeypatch, 2)
+    first.add(("a", 1), {})
+    first.flush()
+    second.add(("a", 2), {})
+    # The trigger of the first call is still armed, no message is sent
+    second.flush()
+    assert len(sent) == 1
+    task = app.tasks[-1]
+
+    # The trigger runs the latest call, deferred to its deadline without sleeping
+    started = time.monotonic()
+    assert app.claim_task(task, sent[0]) == (False, None, None)
+    assert time.monotonic() - started < 0.05
+    assert len(sent) == 2 and sent[1]["args"] == ["a", 2]
+
+    time.sleep(0.06)
+    assert app.claim_task(task, sent[1]) == (True, None, None)
+    # Redeliveries of the last call do not run it again
+    assert app.claim_task(task, sent[1]) == (False, None, None)
+
+
+def test_concurrent_calls_keep_store_and_pending_call_together(
+    make_app: AppFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    app = make_app()
+    (debouncer,), _ = get_debouncers(app, monkeypatch, 1)
+
+    def add(rev: int) -> None:
+        debouncer.add(("a", rev), {})
+
+    for _ in range(20):
+        threads = [threading.Thread(target=add, args=(rev,)) for rev in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        key, (_, _, debounce, _) = next(iter(debouncer._pending.items()))
+        assert app.store.get(key)["token"] == debounce["token"]
+    debouncer.flush()
+
+
+def test_throttle_keeps_sub_second_window() -> None:
+    app = Seda()
+
+    @app.task(throttle=0.1)
+    def refresh(team_id: int) -> None:
+        pass
+
+    task = app.tasks[-1]
+    assert app.admit(task, (1,), {})
+    assert not app.admit(task, (1,), {})
+    time.sleep(0.15)
+    assert app.admit(task, (1,), {})
+
+
+def test_dynamodb_expiry_is_exact() -> None:
+    expires = time.time() + 0.5
+    item = DynamoDBStore._expiry(expires)
+
+    assert float(item["exp"]["N"]) == pytest.approx(expires, abs=0.001)
+    assert int(item["ttl"]["N"]) >= expires
+    assert not DynamoDBStore._expired({"pk": {"S": "key"}, **item})
+
+
+def test_defer_task_schedules_message(
+    make_app: AppFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    app = make_app()
+
+    @app.task(debounce=60)
+    def reindex(doc_id: str) -> None:
+        pass
+
+    schedules: t.List[t.Dict[str, t.Any]] = []
+    monkeypatch.setattr(
+        app.client,
+        "create_schedule",
+        lambda **kwargs: schedules.append(kwargs),
+    )
+    debounce = types.EventDebounce(key="k", token="t", deadline=1704067200.2)
+    data = types.EventTask(
+        path=app.tasks[-1].path, args=["a"], kwargs={}, debounce=debounce
+    )
+    app.defer_task(app.tasks[-1], data, debounce["deadline"])
+
+    assert schedules[0]["expression"] == "at(2024-01-01T00:00:01)"
+    assert schedules[0]["group_name"] == app.config.get_schedule_group_name(
+        onetime=True
+    )
+    assert schedules[0]["target_input"] == {"task": data}
@@ -0,0 +1,157 @@
+import os
+import threading
+import time
+import typing as t
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+
+import pytest
+
+from seda import Seda
+from seda.executors import Gate, ProcessExecutor, ThreadExecutor
+from seda.run import get_task
+
+
+def pid(value: int) -> t.Tuple[int, int]:
+    return value * value, os.getpid()
+
+
+def fail(value: int) -> None:
+    raise LookupError(f"missing {value}")
+
+
+running: t.List[int] = []
+peaks: t.List[int] = []
+lock = threading.Lock()
+
+
+def track(value: int) -> int:
+    with lock:
+        running.append(value)
+        peaks.append(len(running))
+    time.sleep(0.02)
+    with lock:
+        running.remove(value)
+    return value
+
+
+def nap(value: float) -> int:
+    time.sleep(value)
+    return os.getpid()
+
+
+def paged() -> t.Iterator[int]:
+    yield 1
+
+
+@pytest.fixture
+def processes() -> t.Iterator[ProcessExecutor]:
+    executor = ProcessExecutor(2)
+    yield executor
+    executor.shutdown()
+
+
+def test_process_executor_runs_in_workers(processes: ProcessExecutor) -> None:
+    task = get_task("tests.test_executors.pid")
+    value, worker_pid = processes.run(task, (3,), {})
+    results = processes.map(task, range(6))
+
+    assert value == 9 and worker_pid != os.getpid()
+    assert [value for value, _ in results] == [0, 1, 4, 9, 16, 25]
+    # Workers are kept alive between calls
+    assert {worker_pid for _, worker_pid in results} <= {
+        worker.process.pid for worker in processes._idle
+    }
+
+
+def test_process_executor_raises_remote_errors(processes: ProcessExecutor) -> None:
+    task = get_task("tests.test_executors.fail")
+    with pytest.raises(LookupError, match="missing"):
+        processes.map(task, [1, 2])
+
+    # Workers busy with the failed call are replaced
+    assert processes.run(get_task("tests.test_executors.pid"), (2,), {})[0] == 4
+
+
+def test_process_executor_runs_calls_concurrently(
+    processes: ProcessExecutor,
+) -> None:
+    task = get_task("tests.test_executors.nap")
+    processes.map(task, [0, 0])
+    pids: t.List[int] = []
+
+    def run() -> None:
+        pids.append(processes.run(task, (0.3,), {}))
+
+    threads = [threading.Thread(target=run) for _ in range(2)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Each caller checks out its own worker instead of waiting for the other
+    assert time.monotonic() - started < 0.55
+    assert len(set(pids)) == 2
+    assert len(processes._idle) == 2
+
+
+def test_task_runs_on_process_executor(app: Seda) -> None:
+    task = app.task(executor="process", workers=1)(pid)
+    try:
+        value, worker_pid = task(4)
+    finally:
+        app.get_executor("process", 1).shutdown()
+
+    assert value == 16 and worker_pid != os.getpid()
+
+
+def test_thread_executor_limits_concurrency(app: Seda) -> None:
+    peaks.clear()
+    task = app.task(max_concurrency=2)(track)
+    definition = app.tasks[-1]
+    executor = t.cast(ThreadExecutor, app.get_executor("thread"))
+
+    assert definition.executor == "thread"
+    assert executor.map(definition, range(8)) == list(range(8))
+    assert max(peaks) == 2
+    assert task(5) == 5
+
+
+def test_gate_queues_beyond_limit() -> None:
+    executor = ThreadExecutor(8)
+    release = threading.Event()
+    try:
+        futures = [executor.submit(release.wait, key="io", limit=3) for _ in range(5)]
+        time.sleep(0.05)
+
+        assert executor._gates["io"].running == 3
+        assert sum(future.running() for future in futures) == 3
+        release.set()
+        assert all(future.result(timeout=1) for future in futures)
+        assert executor._gates["io"].running == 0
+    finally:
+        executor.shutdown()
+
+
+class CancellingPool:
+    def submit(self, fn: t.Callable) -> Future:
+        future: Future = Future()
+        future.cancel()
+        return future
+
+
+def test_gate_releases_cancelled_calls() -> None:
+    gate = Gate(t.cast(ThreadPoolExecutor, CancellingPool()), 1)
+    futures = [gate.submit(lambda: None) for _ in range(3)]
+
+    assert gate.running == 0
+    for future in futures:
+        with pytest.raises(CancelledError):
+            future.result(timeout=1)
+
+
+def test_executor_options_are_checked(app: Seda) -> None:
+    with pytest.raises(ValueError):
+        app.task(executor="thread")(paged)
+    with pytest.raises(KeyError, match="not registered"):
+        app.get_executor("gpu")
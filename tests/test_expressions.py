@@ -0,0 +1,82 @@
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from seda.exceptions import ExpressionError
+from seda.expressions import parse
+from seda.tasks import Schedule
+
+
+def noop() -> None:
+    pass
+
+
+def test_cron_last_day_of_month() -> None:
+    after = datetime(2024, 1, 31, tzinfo=timezone.utc)
+    times = parse("cron(0 12 L * ? *)").next_n(after, 3)
+
+    assert [value.date().isoformat() for value in times] == [
+        "2024-01-31",
+        "2024-02-29",
+        "2024-03-31",
+    ]
+
+
+def test_cron_nearest_weekday() -> None:
+    # 2024-06-01 is a Saturday, the nearest weekday stays in the month
+    after = datetime(2024, 5, 31, 13, tzinfo=timezone.utc)
+    fire_time = parse("cron(0 12 1W * ? *)").next_after(after)
+
+    assert fire_time == datetime(2024, 6, 3, 12, tzinfo=timezone.utc)
+
+
+def test_cron_impossible_date_stops_at_year_bound() -> None:
+    start = time.monotonic()
+    after = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    assert parse("cron(0 0 30 2 ? *)").next_after(after) is None
+    assert time.monotonic() - start < 1
+
+
+def test_cron_year_list_ends() -> None:
+    after = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+    assert parse("cron(0 0 1 1 ? 2025)").next_after(after) is None
+
+
+def test_validate_rejects_never_firing_cron() -> None:
+    with pytest.raises(ExpressionError):
+        Schedule(noop, "cron(0 0 30 2 ? *)", args=None, kwargs=None).validate()
+
+    Schedule(noop, "cron(0 0 29 2 ? *)", args=None, kwargs=None).validate()
+
+
+def test_rate_ignores_dst_transition() -> None:
+    schedule = Schedule(
+        noop,
+        "rate(1 hour)",
+        args=None,
+        kwargs=None,
+        timezone="America/New_York",
+        start_date=datetime(2024, 11, 3, 4, 30, tzinfo=timezone.utc),
+    )
+    # Clocks fall back at 06:00Z on 2024-11-03
+    after = datetime(2024, 11, 3, 4, 45, tzinfo=timezone.utc)
+    times = [value.hour for value in schedule.next_fire_times(4, after=after)]
+
+    assert times == [5, 6, 7, 8]
+
+
+def test_cron_follows_timezone() -> None:
+    schedule = Schedule(
+        noop,
+        "cron(0 9 * * ? *)",
+        args=None,
+        kwargs=None,
+        timezone="America/New_York",
+    )
+    after = datetime(2024, 11, 2, 12, tzinfo=timezone.utc)
+    times = schedule.next_fire_times(2, after=after)
+
+    assert [value.hour for value in times] == [13, 14]
@@ -0,0 +1,72 @@
+import time
+import typing as t
+
+import pytest
+
+from seda import Seda, task, types
+from seda.idempotency import Idempotency
+from seda.run import get_task, run_task
+
+PATH = "tests.test_idempotency.inc"
+calls: t.List[int] = []
+
+
+def get_event(value: int, result_id: t.Optional[str] = None) -> types.EventTask:
+    data = types.EventTask(path=PATH, args=[value], kwargs={})
+    if result_id is not None:
+        data["result_id"] = result_id
+    return data
+
+
+@task(dedupe=True)
+def inc(value: int) -> int:
+    calls.append(value)
+    return value + 1
+
+
+def test_duplicate_submit_fulfils_result(app: Seda) -> None:
+    calls.clear()
+    first = inc.submit(2)
+    second = inc.submit(2)
+
+    assert first.get(timeout=1) == 3
+    assert second.get(timeout=1) == 3
+
+
+def test_duplicate_delivery_runs_once(app: Seda) -> None:
+    calls.clear()
+    data = get_event(5)
+
+    assert run_task(data, app=app) == 6
+    assert run_task(data, app=app) == 6
+    assert calls == [5]
+
+
+def test_envelope_is_part_of_key() -> None:
+    definition = get_task(PATH)
+    data = get_event(1)
+    plain = Idempotency.get_key(definition, data)
+    first = Idempotency.get_key(definition, get_event(1, result_id="a"))
+    second = Idempotency.get_key(definition, get_event(1, result_id="b"))
+
+    assert len({plain, first, second}) == 3
+
+
+def test_expired_pending_claim_is_taken_over(app: Seda) -> None:
+    calls.clear()
+    data = get_event(7)
+    key = Idempotency.get_key(get_task(PATH), data)
+    # A killed invocation leaves its claim pending until the deadline
+    app.store.add(key, {"status": "pending"}, ttl=0.01)
+    time.sleep(0.02)
+
+    assert run_task(data, app=app) == 8
+    assert calls == [7]
+
+
+def test_key_requires_dedupe(app: Seda) -> None:
+    with pytest.raises(ValueError, match="dedupe=True"):
+
+        @app.task(idempotent=True, key=lambda value: value)
+        def charge(value: int) -> None:
+            pass
@@ -0,0 +1,24 @@
+from seda import Seda
+from seda.config import Lane
+
+
+def test_default_lane_only() -> None:
+    app = Seda()
+
+    assert list(app.get_lanes()) == ["default"]
+
+
+def test_lanes_used_by_tasks_or_config() -> None:
+    app = Seda(lanes={"high": Lane()})
+
+    @app.task(priority="bulk")
+    def bulk() -> None:
+        pass
+
+    @app.task(service="lambda", priority="high")
+    def invoked() -> None:
+        pass
+
+    lanes = app.get_lanes()
+    assert sorted(lanes) == ["bulk", "default", "high"]
+    assert lanes["bulk"].queue
@@ -0,0 +1,42 @@
+import pytest
+
+from seda import Seda
+from seda.exceptions import RateLimitExceeded
+from seda.limits import TokenBucket
+
+
+def test_rate_must_be_positive() -> None:
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+
+def test_reserve_queues_behind_reservations() -> None:
+    bucket = TokenBucket(10, burst=1)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+
+def test_default_max_wait_is_finite() -> None:
+    bucket = TokenBucket(1, burst=1)
+    bucket.reserve(31)
+
+    with pytest.raises(RateLimitExceeded):
+        bucket.reserve()
+
+
+def test_refused_call_refunds_task_bucket() -> None:
+    task_bucket = TokenBucket(1, burst=1)
+    app = Seda(rate_limit=TokenBucket(1, burst=1, max_wait=0))
+
+    @app.task(rate_limit=task_bucket)
+    def limited() -> None:
+        pass
+
+    definition = app.tasks[-1]
+    app.rate_limit.reserve()  # type: ignore[union-attr]
+    with pytest.raises(RateLimitExceeded):
+        app.reserve_limits(definition)
+
+    assert task_bucket.tokens == pytest.approx(1, abs=0.01)
@@ -0,0 +1,87 @@
+import json
+import threading
+import typing as t
+
+import pytest
+
+from seda import types
+from tests.conftest import AppFactory
+
+
+def test_group_id_is_hashed_when_invalid(make_app: AppFactory) -> None:
+    app = make_app()
+
+    @app.task(ordered_by=lambda key: key)
+    def apply(key: str) -> None:
+        pass
+
+    definition = app.tasks[-1]
+
+    def group_id(key: str) -> t.Optional[str]:
+        data = types.EventTask(path=definition.path, args=[key], kwargs={})
+        return definition.get_group_id(data)
+
+    assert group_id("order:42") == "order:42"
+    assert len(t.cast(str, group_id("order 42"))) == 64
+    assert group_id("x" * 200) == group_id("x" * 200)
+    assert len(t.cast(str, group_id("x" * 200))) == 64
+
+
+def test_fifo_queue_name_limit(make_app: AppFactory) -> None:
+    app = make_app(sns_topic_name="t" * 70)
+
+    with pytest.raises(ValueError):
+        app.config.get_fifo_queue_name()
+
+
+def test_chunked_publishes_ordered_tasks_in_order(
+    make_app: AppFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    app = make_app()
+
+    @app.task(ordered_by=lambda item: "all")
+    def apply(item: int) -> None:
+        pass
+
+    published: t.List[t.Tuple[t.Sequence, int]] = []
+
+    def publish(task: t.Any, data: types.EventTask, **kwargs: t.Any) -> None:
+        published.append((data["map"], threading.get_ident()))
+
+    monkeypatch.setattr(app, "publish", publish)
+    app.chunked(app.tasks[-1], range(50), max_items=10)
+
+    assert [list(items) for items, _ in published] == [
+        list(range(idx, idx + 10)) for idx in range(0, 50, 10)
+    ]
+    assert {ident for _, ident in published} == {threading.get_ident()}
+
+
+def test_policy_skips_fifo_without_ordered_tasks(
+    make_app: AppFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Too long for a FIFO queue name, fine while no task is ordered
+    app = make_app(function_name="f" * 60)
+    policies: t.List[types.Policy] = []
+    monkeypatch.setattr(
+        app.client,
+        "get_function",
+        lambda name: {"Configuration": {"Role": "arn:aws:iam::1:role/api"}},
+    )
+    monkeypatch.setattr(
+        app.client,
+        "put_role_policy",
+        lambda role, name, policy: policies.append(policy),
+    )
+    app.put_function_policy()
+
+    resources = json.dumps(policies[0]["Statement"])
+    assert "fifo" not in resources
+    assert "sqs:ReceiveMessage" not in resources
+
+    @app.task(ordered_by=lambda key: key)
+    def apply(key: str) -> None:
+        pass
+
+    with pytest.raises(ValueError):
+        app.put_function_policy()
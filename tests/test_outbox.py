@@ -0,0 +1,78 @@
+import time
+import typing as t
+from pathlib import Path
+
+from botocore.exceptions import ClientError
+
+from seda import Seda
+from seda.outbox import Outbox
+
+TOPIC_ARN = "arn:aws:sns:us-east-1:123456789012:seda.fifo"
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.failing = False
+        self.published: t.List[str] = []
+
+    def _check(self) -> None:
+        if self.failing:
+            error = {"Code": "Throttling", "Message": "Rate exceeded"}
+            raise ClientError({"Error": error}, "Publish")
+
+    def sns_publish(self, topic_arn: str, message: str, **kwargs: t.Any) -> dict:
+        self._check()
+        self.published.append(message)
+        return {}
+
+    def sns_publish_batch(self, topic_arn: str, entries: t.List[dict]) -> dict:
+        self._check()
+        self.published.extend(entry["Message"] for entry in entries)
+        return {"Successful": [{"Id": entry["Id"]} for entry in entries]}
+
+
+def wait_empty(outbox: Outbox) -> None:
+    deadline = time.monotonic() + 2
+    while len(outbox) and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_flush_replays_in_order(tmp_path: Path) -> None:
+    client = FakeClient()
+    client.failing = True
+    outbox = Outbox(client, str(tmp_path / "outbox.db"))  # type: ignore[arg-type]
+    for idx in range(25):
+        outbox.put(TOPIC_ARN, str(idx), group_id="g")
+
+    assert outbox.flush() == 0
+    client.failing = False
+    wait_empty(outbox)
+
+    assert client.published == [str(idx) for idx in range(25)]
+
+
+def test_put_after_drain_restarts_sender(tmp_path: Path) -> None:
+    client = FakeClient()
+    outbox = Outbox(client, str(tmp_path / "outbox.db"))  # type: ignore[arg-type]
+    outbox.put(TOPIC_ARN, "a")
+    wait_empty(outbox)
+    outbox.put(TOPIC_ARN, "b")
+    wait_empty(outbox)
+
+    assert client.published == ["a", "b"]
+
+
+def test_fallback_keeps_group_order(tmp_path: Path) -> None:
+    client = FakeClient()
+    app = Seda(outbox="fallback")
+    app.client = client  # type: ignore[assignment]
+    app._outbox = Outbox(client, str(tmp_path / "outbox.db"))  # type: ignore
+    client.failing = True
+    app.sns_publish(TOPIC_ARN, "first", group_id="g")
+    client.failing = False
+    # The spool is not empty, the second message must queue behind the first
+    app.sns_publish(TOPIC_ARN, "second", group_id="g")
+    app.sns_publish(TOPIC_ARN, "other", group_id="h")
+    app.flush()
+
+    assert client.published.index("first") < client.published.index("second")
@@ -0,0 +1,91 @@
+import json
+import typing as t
+
+from seda import Seda, task, types
+
+PATH = "tests.test_records.record"
+received: t.List[str] = []
+
+
+@task
+def record(value: str) -> None:
+    if value == "fail":
+        raise ValueError(value)
+    received.append(value)
+
+
+def sqs_record(
+    body: str,
+    message_id: str,
+    group_id: t.Optional[str] = None,
+) -> types.SQSRecord:
+    queue_arn = "arn:aws:sqs:us-east-1:123:queue"
+    attributes = {}
+    if group_id is not None:
+        queue_arn += ".fifo"
+        attributes["MessageGroupId"] = group_id
+    return types.SQSRecord(
+        messageId=message_id,
+        receiptHandle=message_id,
+        body=body,
+        attributes=attributes,
+        messageAttributes={},
+        eventSource="aws:sqs",
+        eventSourceARN=queue_arn,
+        awsRegion="us-east-1",
+    )
+
+
+def task_body(value: str) -> str:
+    return json.dumps({"task": {"path": PATH, "args": [value], "kwargs": {}}})
+
+
+def test_sqs_batch_reports_failures(lambda_context: types.LambdaContext) -> None:
+    received.clear()
+    app = Seda()
+    event = {
+        "Records": [
+            sqs_record(task_body("a"), "1"),
+            sqs_record(task_body("fail"), "2"),
+            sqs_record(task_body("b"), "3"),
+        ]
+    }
+
+    assert app.handle(event, lambda_context) == {
+        "batchItemFailures": [{"itemIdentifier": "2"}]
+    }
+    assert received == ["a", "b"]
+
+
+def test_fifo_failure_fails_rest_of_group(
+    lambda_context: types.LambdaContext,
+) -> None:
+    received.clear()
+    app = Seda()
+    event = {
+        "Records": [
+            sqs_record(task_body("fail"), "1", "x"),
+            sqs_record(task_body("a"), "2", "x"),
+            sqs_record(task_body("b"), "3", "y"),
+        ]
+    }
+
+    response = app.handle(event, lambda_context)
+    assert response == {
+        "batchItemFailures": [{"itemIdentifier": "1"}, {"itemIdentifier": "2"}]
+    }
+    assert received == ["b"]
+
+
+def test_foreign_records_go_to_default_handler(
+    lambda_context: types.LambdaContext,
+) -> None:
+    received.clear()
+    events: t.List[types.LambdaEvent] = []
+    app = Seda(default_handler=lambda event, context: events.append(event))
+    for body in ("not json", "[1, 2]", json.dumps({"other": 1})):
+        event = {"Records": [sqs_record(task_body("a"), "1"), sqs_record(body, "2")]}
+        app.handle(event, lambda_context)
+
+    assert len(events) == 3
+    assert received == []
@@ -0,0 +1,70 @@
+from botocore.stub import Stubber
+
+from seda import Seda, types
+from seda.results import ResultBackend
+from seda.run import get_task
+from seda.stores import MemoryStore
+from tests.conftest import AppFactory
+
+PATH = "tests.test_results.echo"
+
+
+def echo(value: str) -> str:
+    return value
+
+
+def test_oversized_result_without_bucket_fails(app: Seda) -> None:
+    app.task(echo)
+    results = ResultBackend(MemoryStore(), max_item_bytes=10)
+    results.save("r1", get_task(PATH), "x" * 100)
+
+    record = results.get_many(["r1"])["r1"]
+    assert record["status"] == "failure"
+    assert record["error"]["errorType"] == "ResultTooLarge"
+    assert "result_bucket" in record["error"]["errorMessage"]
+
+
+def test_failure_recorded_on_last_attempt(make_app: AppFactory) -> None:
+    app = make_app(max_attempts=2)
+    app.task(echo)
+    app._store = MemoryStore()
+    data = types.EventTask(path=PATH, args=["a"], kwargs={}, result_id="r1")
+    definition = get_task(PATH)
+
+    app.fail_task(definition, data, RuntimeError("boom"))
+    assert app.results.get_many(["r1"]) == {}
+
+    app.fail_task(definition, data, RuntimeError("boom"))
+    record = app.results.get_many(["r1"])["r1"]
+    assert record["error"]["errorType"] == "RuntimeError"
+
+
+def test_result_lifecycle_keeps_existing_rules(make_app: AppFactory) -> None:
+    app = make_app(result_bucket="results", result_ttl=36 * 3600)
+    other = {
+        "ID": "logs",
+        "Filter": {"Prefix": "logs/"},
+        "Status": "Enabled",
+        "Expiration": {"Days": 7},
+    }
+    stale = {**other, "ID": "seda-results"}
+    rule = {
+        "ID": "seda-results",
+        "Filter": {"Prefix": "seda/results/"},
+        "Status": "Enabled",
+        "Expiration": {"Days": 2},
+    }
+
+    with Stubber(app.client.client("s3")) as stubber:
+        stubber.add_response(
+            "get_bucket_lifecycle_configuration",
+            {"Rules": [other, stale]},
+            {"Bucket": "results"},
+        )
+        stubber.add_response(
+            "put_bucket_lifecycle_configuration",
+            {},
+            {"Bucket": "results", "LifecycleConfiguration": {"Rules": [other, rule]}},
+        )
+        app.put_result_lifecycle()
+        stubber.assert_no_pending_responses()
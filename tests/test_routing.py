@@ -0,0 +1,79 @@
+import json
+
+from botocore.stub import Stubber
+
+from tests.conftest import AppFactory
+
+TOPIC_ARN = "arn:aws:sns:us-east-1:123456789012:seda-api"
+
+
+def test_main_function_accepts_unrouted_messages(make_app: AppFactory) -> None:
+    app = make_app()
+    policy = app.get_filter_policy("api")
+
+    assert {"function": ["api"]} in policy["$or"]
+    assert {"function": [{"exists": False}]} in policy["$or"]
+    assert app.get_filter_policy("worker") == {"function": ["worker"]}
+
+
+def test_subscribe_updates_existing_subscription(make_app: AppFactory) -> None:
+    app = make_app()
+    topic_arn = app.ARN(f"sns:{app.config.get_sns_topic_name()}")
+    endpoint = app.ARN("lambda:function:worker")
+    subscription_arn = f"{topic_arn}:sub"
+
+    with Stubber(app.client.client("sns")) as stubber:
+        stubber.add_response(
+            "list_subscriptions_by_topic",
+            {
+                "Subscriptions": [
+                    {
+                        "SubscriptionArn": subscription_arn,
+                        "Protocol": "lambda",
+                        "Endpoint": endpoint,
+                        "TopicArn": topic_arn,
+                    }
+                ]
+            },
+            {"TopicArn": topic_arn},
+        )
+        stubber.add_response(
+            "set_subscription_attributes",
+            {"ResponseMetadata": {"HTTPStatusCode": 200}},
+            {
+                "SubscriptionArn": subscription_arn,
+                "AttributeName": "FilterPolicy",
+                "AttributeValue": json.dumps({"function": ["worker"]}),
+            },
+        )
+        response = app.sns_subscribe(function_name="worker")
+        stubber.assert_no_pending_responses()
+
+    assert response["SubscriptionArn"] == subscription_arn
+
+
+def test_subscribe_creates_missing_subscription(make_app: AppFactory) -> None:
+    app = make_app()
+    topic_arn = app.ARN(f"sns:{app.config.get_sns_topic_name()}")
+
+    with Stubber(app.client.client("sns")) as stubber:
+        stubber.add_response(
+            "list_subscriptions_by_topic",
+            {"Subscriptions": []},
+            {"TopicArn": topic_arn},
+        )
+        stubber.add_response(
+            "subscribe",
+            {"SubscriptionArn": f"{topic_arn}:new"},
+            {
+                "TopicArn": topic_arn,
+                "Protocol": "lambda",
+                "Endpoint": app.ARN("lambda:function:api"),
+                "Attributes": {
+                    "FilterPolicy": json.dumps(app.get_filter_policy("api"))
+                },
+            },
+        )
+        response = app.sns_subscribe()
+
+    assert response["SubscriptionArn"] == f"{topic_arn}:new"
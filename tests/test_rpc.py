@@ -0,0 +1,70 @@
+import io
+import json
+import time
+import typing as t
+
+import pytest
+
+from seda.tasks import HedgePolicy
+from tests.conftest import AppFactory
+
+
+def test_latency_is_sampled_per_attempt(make_app: AppFactory) -> None:
+    app = make_app()
+
+    @app.task
+    def echo(value: int) -> int:
+        return value
+
+    def invoke_function(**kwargs: t.Any) -> dict:
+        time.sleep(0.02)
+        return {"Payload": io.BytesIO(json.dumps("1").encode())}
+
+    app.client.invoke_function = invoke_function  # type: ignore[assignment]
+    definition = app.tasks[-1]
+
+    assert app.call_task(definition, (1,), {}) == 1
+    samples = app.metrics.samples(f"rpc.latency.{definition.path}")
+    assert len(samples) == 1
+    assert samples[0] >= 0.02
+
+
+def test_fast_failure_waits_for_hedge(make_app: AppFactory) -> None:
+    app = make_app()
+
+    @app.task(idempotent=True, hedge=HedgePolicy(delay=0.01))
+    def lookup(value: int) -> int:
+        return value
+
+    attempts: t.List[int] = []
+
+    def invoke_rpc(task: t.Any, data: t.Any, timeout: t.Any) -> str:
+        attempts.append(1)
+        if len(attempts) == 1:
+            time.sleep(0.03)
+            raise ConnectionError("first attempt failed")
+        time.sleep(0.06)
+        return "hedged"
+
+    app._invoke_rpc = invoke_rpc  # type: ignore[assignment]
+    definition = app.tasks[-1]
+
+    assert app.call_task(definition, (1,), {}) == "hedged"
+    assert len(attempts) == 2
+
+
+def test_all_attempts_failing_raises(make_app: AppFactory) -> None:
+    app = make_app()
+
+    @app.task(idempotent=True, hedge=HedgePolicy(delay=0.01))
+    def lookup(value: int) -> int:
+        return value
+
+    def invoke_rpc(task: t.Any, data: t.Any, timeout: t.Any) -> str:
+        time.sleep(0.02)
+        raise ConnectionError("failed")
+
+    app._invoke_rpc = invoke_rpc  # type: ignore[assignment]
+
+    with pytest.raises(ConnectionError):
+        app.call_task(app.tasks[-1], (1,), {})
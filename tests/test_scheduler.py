@@ -0,0 +1,87 @@
+import typing as t
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from seda.scheduler import FileLock, Scheduler
+from seda.tasks import Schedule, Task
+from tests.conftest import AppFactory
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+calls: t.List[str] = []
+
+
+def bulk() -> None:
+    calls.append("bulk")
+
+
+def default() -> None:
+    calls.append("default")
+
+
+def high() -> None:
+    calls.append("high")
+
+
+bulk.definition = Task(bulk, priority="bulk")  # type: ignore[attr-defined]
+high.definition = Task(high, priority="high")  # type: ignore[attr-defined]
+
+
+def test_heap_orders_by_fire_time(make_app: AppFactory) -> None:
+    scheduler = Scheduler(make_app())
+    hourly = Schedule(default, "rate(1 hour)", args=[], kwargs={})
+    minutely = Schedule(default, "rate(1 minute)", args=[], kwargs={})
+    scheduler.add(hourly, NOW)
+    scheduler.add(minutely, NOW)
+
+    assert len(scheduler) == 2
+    assert scheduler.timeout(NOW) == scheduler.lock_interval
+    assert scheduler.timeout(NOW + timedelta(seconds=58)) == 2
+    assert scheduler.tick(NOW + timedelta(seconds=59)) == 0
+    assert scheduler.tick(NOW + timedelta(minutes=1)) == 1
+    assert [item[0] for item in sorted(scheduler._heap)] == [
+        NOW + timedelta(minutes=2),
+        NOW + timedelta(hours=1),
+    ]
+    scheduler.executor.shutdown(wait=True)
+
+
+def test_tick_dispatches_due_schedules_by_priority(make_app: AppFactory) -> None:
+    calls.clear()
+    scheduler = Scheduler(make_app(), workers=1)
+    for func in (bulk, default, high):
+        scheduler.add(Schedule(func, "rate(5 minutes)", args=[], kwargs={}), NOW)
+
+    assert scheduler.tick(NOW + timedelta(minutes=5)) == 3
+    scheduler.executor.shutdown(wait=True)
+
+    assert calls == ["high", "default", "bulk"]
+    # Every dispatched schedule is queued again at its next fire time
+    assert len(scheduler) == 3
+    assert {item[0] for item in scheduler._heap} == {NOW + timedelta(minutes=10)}
+
+
+def test_tick_skips_missed_fire_times(make_app: AppFactory) -> None:
+    calls.clear()
+    scheduler = Scheduler(make_app(), workers=1)
+    scheduler.add(Schedule(default, "rate(1 minute)", args=[], kwargs={}), NOW)
+
+    assert scheduler.tick(NOW + timedelta(minutes=30, seconds=5)) == 1
+    scheduler.executor.shutdown(wait=True)
+
+    assert calls == ["default"]
+    assert scheduler._heap[0][0] == NOW + timedelta(minutes=31, seconds=5)
+
+
+def test_file_lock_is_exclusive(tmp_path: Path) -> None:
+    path = str(tmp_path / "scheduler.lock")
+    first, second = FileLock(path), FileLock(path)
+
+    assert first.acquire()
+    assert first.acquire()
+    assert not second.acquire()
+
+    first.release()
+    assert second.acquire()
+    assert not first.acquire()
+    second.release()
@@ -0,0 +1,74 @@
+import time
+import typing as t
+
+import anyio
+
+from seda import Seda, current_task, types
+from seda.run import get_task, run_task
+
+ITEMS = 6
+items: t.List[int] = []
+cursors: t.List[t.Any] = []
+
+
+class LambdaContext:
+    def __init__(self, remaining: float) -> None:
+        self.remaining = remaining
+
+    def get_remaining_time_in_millis(self) -> int:
+        return int(self.remaining * 1000)
+
+
+def sync_items() -> t.Iterator[int]:
+    cursor = current_task().cursor or 0
+    cursors.append(cursor)
+    for item in range(cursor, ITEMS):
+        time.sleep(0.05)
+        items.append(item)
+        yield item + 1
+
+
+async def async_items() -> t.AsyncIterator[int]:
+    cursor = current_task().cursor or 0
+    cursors.append(cursor)
+    for item in range(cursor, ITEMS):
+        await anyio.sleep(0.05)
+        items.append(item)
+        yield item + 1
+
+
+def run(path: str, app: Seda, remaining: t.Optional[float] = None) -> t.Any:
+    data = types.EventTask(path=path, args=None, kwargs=None)
+    context = None
+    if remaining is not None:
+        context = t.cast(types.LambdaContext, LambdaContext(remaining))
+    return run_task(data, task=get_task(path), app=app, context=context)
+
+
+def test_generator_runs_to_completion(app: Seda) -> None:
+    items.clear()
+    cursors.clear()
+    run("tests.test_streaming.sync_items", app)
+
+    assert items == list(range(ITEMS))
+    assert cursors == [0]
+
+
+def test_generator_hands_over_before_deadline(app: Seda) -> None:
+    items.clear()
+    cursors.clear()
+    # 150ms before the 2 seconds margin fit two items of 50ms
+    run("tests.test_streaming.sync_items", app, 2.15)
+
+    assert items == list(range(ITEMS))
+    assert len(cursors) == 2 and 0 < cursors[1] < ITEMS
+
+
+def test_async_generator_hands_over_before_deadline(app: Seda) -> None:
+    items.clear()
+    cursors.clear()
+    run("tests.test_streaming.async_items", app, 2.15)
+
+    assert items == list(range(ITEMS))
+    assert len(cursors) == 2 and 0 < cursors[1] < ITEMS
+    assert app.metrics.samples("task.item.tests.test_streaming.async_items")
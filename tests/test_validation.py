@@ -0,0 +1,75 @@
+import inspect
+import sys
+import typing as t
+
+import pytest
+
+from seda import Seda
+from seda.validation import check_arguments, compile_hint, compile_validators
+
+if sys.version_info < (3, 8):  # pragma: no cover
+    from typing_extensions import Literal
+else:  # pragma: no cover
+    from typing import Literal
+
+UserId = t.NewType("UserId", int)
+calls: t.List[t.Any] = []
+
+
+def notify(user_id: int, channel: Literal["sms", "email"] = "email") -> None:
+    calls.append((user_id, channel))
+
+
+def scale(ratio: float, *tags: str, **options: t.Optional[int]) -> None:
+    pass
+
+
+def test_compile_hint() -> None:
+    number = t.cast(t.Callable, compile_hint(float))
+    optional = t.cast(t.Callable, compile_hint(t.Optional[t.List[int]]))
+    user_id = t.cast(t.Callable, compile_hint(UserId))
+
+    assert compile_hint(t.Any) is None
+    assert compile_hint(t.TypeVar("T")) is None
+    assert compile_hint(t.Union[int, t.Any]) is None
+    assert number(1) and number(1.5) and not number("1")
+    assert optional(None) and optional([1]) and not optional((1,))
+    assert user_id(1) and not user_id("1")
+
+
+def test_check_variadic_arguments() -> None:
+    signature = inspect.signature(scale)
+    validators = compile_validators(scale, signature)
+
+    def check(*args: t.Any, **kwargs: t.Any) -> t.Optional[str]:
+        arguments = signature.bind(*args, **kwargs).arguments
+        return check_arguments(arguments, signature, validators)
+
+    assert check(1, "a", "b", limit=None) is None
+    assert check(1.0, "a", 2) == "argument 'tags' got int"
+    assert check(1.0, limit="2") == "argument 'options' got str"
+
+
+def test_call_is_bound_before_publishing(app: Seda) -> None:
+    calls.clear()
+    task = app.task(notify)
+
+    with pytest.raises(TypeError, match="notify"):
+        task(1, "sms", "extra")
+    with pytest.raises(TypeError):
+        task(channel="sms")
+    # Types are only checked with validate=True
+    task("1")
+    assert calls == [("1", "email")]
+
+
+def test_validate_checks_hints(app: Seda) -> None:
+    calls.clear()
+    task = app.task(validate=True)(notify)
+
+    with pytest.raises(TypeError, match="argument 'user_id' got str"):
+        task("1")
+    with pytest.raises(TypeError, match="argument 'channel' got str"):
+        task(1, "fax")
+    task(1, "sms")
+    assert calls == [(1, "sms")]
@@ -0,0 +1,39 @@
+import gc
+import typing as t
+
+from seda import Seda
+from seda.tasks import CachePolicy
+from tests.conftest import AppFactory
+
+
+def ping() -> None:
+    pass
+
+
+def test_warmup_services(make_app: AppFactory) -> None:
+    app = make_app(result_bucket="results")
+    assert app.get_warmup_services() == ["s3", "sns"]
+
+    app.task(service="lambda")(ping)
+    app.task(ordered_by="key", cache=CachePolicy(ttl=60, shared=True))(ping)
+    assert app.get_warmup_services() == ["dynamodb", "lambda", "s3", "sns", "sqs"]
+
+
+def test_warmup_connects_clients(make_app: AppFactory) -> None:
+    app = make_app()
+    warmed: t.List[bool] = []
+    app.on_warmup(lambda: warmed.append(True))
+    timings = app.warmup(["json"], services=["sns", "sqs"], freeze=False)
+
+    assert list(timings) == ["imports", "clients", "arns", "hooks"]
+    assert warmed == [True]
+    assert {service for service, _ in app.client._client_cache} == {"sns", "sqs"}
+
+
+def test_sync_warmup_freezes_gc(app: Seda) -> None:
+    try:
+        timings = app.warmup()
+        assert list(timings) == ["imports", "hooks", "gc"]
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
@@ -0,0 +1,96 @@
+import typing as t
+
+from seda import Seda, task, types
+from seda.run import run_task
+from seda.stores import SQLiteStore
+from seda.workflows import _join, chord
+
+received: t.List[t.List[int]] = []
+total_step = types.EventStep(path="tests.test_workflows.total", args=[])
+
+
+@task
+def square(value: int) -> int:
+    return value * value
+
+
+@task(dedupe=True)
+def cube(value: int) -> int:
+    return value**3
+
+
+@task
+def total(values: t.List[int]) -> None:
+    received.append(values)
+
+
+def member(path: str, chord_id: str, index: int, value: int) -> types.EventTask:
+    return types.EventTask(
+        path=path,
+        args=[value],
+        kwargs={},
+        chord=get_chord(chord_id, index, [total_step]),
+    )
+
+
+def get_chord(
+    chord_id: str,
+    index: int,
+    chain: t.Optional[t.List[types.EventStep]] = None,
+) -> types.EventChord:
+    return types.EventChord(
+        id=chord_id,
+        index=index,
+        size=2,
+        chain=chain or [],
+        parent=None,
+    )
+
+
+def test_chord_runs_callback_with_results(app: Seda) -> None:
+    received.clear()
+    signature = t.cast(t.Any, square).s
+    chord([signature(1), signature(2), signature(3)], t.cast(t.Any, total).s())()
+
+    assert received == [[1, 4, 9]]
+
+
+def test_chord_join_survives_redelivery(app: Seda) -> None:
+    assert _join(app, get_chord("c1", 0), "a") is None
+    # A redelivered member does not count twice
+    assert _join(app, get_chord("c1", 0), "a") is None
+    assert _join(app, get_chord("c1", 1), "b") == ["a", "b"]
+
+
+def test_chord_join_repairs_interrupted_member(app: Seda) -> None:
+    assert _join(app, get_chord("c2", 0), "a") is None
+    # The last member crashed after joining, before dispatching the callback
+    app.store.set("seda:chord:c2:1", "b")
+    app.store.add_member("seda:chord:c2:members", "1")
+
+    assert _join(app, get_chord("c2", 1), "b") == ["a", "b"]
+
+
+def test_sqlite_store_add_member() -> None:
+    store = SQLiteStore()
+
+    assert store.add_member("key", "a", ttl=60) == 1
+    assert store.add_member("key", "a", ttl=60) == 1
+    assert store.add_member("key", "b", ttl=60) == 2
+
+
+def test_chord_member_redelivered_after_completion(app: Seda) -> None:
+    received.clear()
+    for index in (0, 1, 1, 0):
+        run_task(member("tests.test_workflows.square", "c3", index, index + 2), app=app)
+
+    assert received == [[4, 9]]
+
+
+def test_deduplicated_member_redelivered_after_completion(app: Seda) -> None:
+    received.clear()
+    for index in (0, 1, 1):
+        run_task(member("tests.test_workflows.cube", "c4", index, index + 2), app=app)
+
+    assert received == [[8, 27]]
+    assert app.metrics.count("task.duplicates.tests.test_workflows.cube") == 1